@@ -0,0 +1,43 @@
+-- Migration v12: Store the Discord IDs of tickets as integers and add the guild of each ticket
+-- channel_id becomes an INTEGER PRIMARY KEY, so it is an alias of the rowid
+
+BEGIN TRANSACTION;
+
+-- 1. Create the new tickets table
+CREATE TABLE tickets_new (
+	channel_id INTEGER PRIMARY KEY NOT NULL,
+	guild_id INTEGER,
+	category_id INTEGER,
+	user_id INTEGER NOT NULL,
+	assignee_id INTEGER,
+	archived BOOLEAN DEFAULT FALSE NOT NULL,
+	created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+	close_at TIMESTAMP,
+	FOREIGN KEY (category_id) REFERENCES ticket_categories(id) ON DELETE SET NULL
+);
+
+-- 2. Copy the tickets, converting the IDs
+-- The guild is taken from the ticket's category; tickets without a category keep a NULL guild_id
+INSERT INTO tickets_new (channel_id, guild_id, category_id, user_id, assignee_id, archived, created_at, close_at)
+SELECT
+    CAST(t.channel_id AS INTEGER),
+    tc.guild_id,
+    t.category_id,
+    CAST(t.user_id AS INTEGER),
+    CAST(t.assignee_id AS INTEGER),
+    t.archived,
+    t.created_at,
+    t.close_at
+FROM tickets t
+LEFT JOIN ticket_categories tc ON tc.id = t.category_id;
+
+-- 3. Drop the old tickets table and rename the new one
+DROP TABLE tickets;
+ALTER TABLE tickets_new RENAME TO tickets;
+
+-- 4. Recreate the indexes
+CREATE INDEX IF NOT EXISTS idx_tickets_category_id ON tickets(category_id);
+CREATE INDEX IF NOT EXISTS idx_tickets_assignee ON tickets(assignee_id);
+CREATE INDEX IF NOT EXISTS idx_tickets_guild ON tickets(guild_id);
+
+COMMIT;
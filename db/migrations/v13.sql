@@ -0,0 +1,22 @@
+-- Migration v13: Partial indexes for the queries of the background tasks
+-- Each index only contains the rows its query can match, so it stays small and the queries never scan the table.
+
+BEGIN TRANSACTION;
+
+-- TicketManager.get_overdue: open tickets scheduled to close
+-- channel_id is the rowid, so the index covers the query
+CREATE INDEX IF NOT EXISTS idx_tickets_close_at_open ON tickets(close_at)
+WHERE archived = FALSE AND close_at IS NOT NULL;
+
+-- GiveawayManager.get_active: giveaways that have not been ended yet
+CREATE INDEX IF NOT EXISTS idx_giveaways_ends_at_running ON giveaways(ends_at)
+WHERE ended = FALSE;
+
+-- Replaced by idx_giveaways_ends_at_running; an index on a boolean never narrows a query down
+DROP INDEX IF EXISTS idx_giveaways_ended;
+
+-- ApplicationBanManager.get_expired: bans with an end date, covering the selected columns
+CREATE INDEX IF NOT EXISTS idx_application_bans_ends_at ON application_bans(ends_at, user_id, guild_id)
+WHERE ends_at IS NOT NULL;
+
+COMMIT;
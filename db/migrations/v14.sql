@@ -0,0 +1,15 @@
+-- Migration v14: Giveaway entries
+-- Entries are recorded from reaction events while a giveaway runs, so drawing the winners is a local query
+-- instead of paging through all reaction users of the giveaway message.
+
+BEGIN TRANSACTION;
+
+-- The primary key is the index for GiveawayManager.get_entries
+CREATE TABLE IF NOT EXISTS giveaway_entries (
+	message_id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	PRIMARY KEY (message_id, user_id),
+	FOREIGN KEY (message_id) REFERENCES giveaways(message_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+COMMIT;
@@ -0,0 +1,31 @@
+-- Migration v15: Weighted giveaway entries and recorded draws
+-- Entries carry the weight of the user's best bonus role, and every draw is stored with its seed,
+-- so the winners can be drawn again from the entries to check them.
+
+BEGIN TRANSACTION;
+
+-- Weight of the entry at the time the user entered
+ALTER TABLE giveaway_entries ADD COLUMN weight REAL NOT NULL DEFAULT 1;
+
+-- Roles whose members enter a giveaway with a higher weight
+CREATE TABLE IF NOT EXISTS giveaway_bonus_roles (
+	message_id INTEGER NOT NULL,
+	role_id INTEGER NOT NULL,
+	weight REAL NOT NULL,
+	PRIMARY KEY (message_id, role_id),
+	FOREIGN KEY (message_id) REFERENCES giveaways(message_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Draws of a giveaway; draw 0 is the one at the end, re-rolls count up from there
+CREATE TABLE IF NOT EXISTS giveaway_draws (
+	message_id INTEGER NOT NULL,
+	draw INTEGER NOT NULL,
+	seed INTEGER NOT NULL,
+	winner_count INTEGER NOT NULL,
+	winners TEXT NOT NULL, -- Comma separated user IDs in the order they were drawn
+	drawn_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+	PRIMARY KEY (message_id, draw),
+	FOREIGN KEY (message_id) REFERENCES giveaways(message_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- Migration v16: Retry queue of role changes
+-- Role changes that failed because of rate limits or server errors are retried later, also after a restart.
+
+BEGIN TRANSACTION;
+
+-- One row per member and role; a newer change of the same role replaces the queued one
+CREATE TABLE IF NOT EXISTS role_queue (
+	guild_id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	role_id INTEGER NOT NULL,
+	add_role BOOLEAN NOT NULL, -- TRUE to add the role, FALSE to remove it
+	reason TEXT,
+	attempts INTEGER NOT NULL DEFAULT 1,
+	next_attempt_at TIMESTAMP NOT NULL,
+	PRIMARY KEY (guild_id, user_id, role_id)
+) WITHOUT ROWID;
+
+COMMIT;
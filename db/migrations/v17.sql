@@ -0,0 +1,8 @@
+-- Migration v17: Index of the role retry queue by due time
+-- RoleQueueManager.get_due runs on every retry deadline and only needs the changes that are due.
+
+BEGIN TRANSACTION;
+
+CREATE INDEX IF NOT EXISTS idx_role_queue_next_attempt_at ON role_queue(next_attempt_at);
+
+COMMIT;
@@ -1,11 +1,13 @@
 CREATE TABLE IF NOT EXISTS tickets (
-	channel_id TEXT PRIMARY KEY NOT NULL,
-	category TEXT CHECK(category IN ('application', 'report', 'support')),
-	user_id TEXT NOT NULL,
-	assignee_id TEXT,
+	channel_id INTEGER PRIMARY KEY NOT NULL,
+	guild_id INTEGER,
+	category_id INTEGER,
+	user_id INTEGER NOT NULL,
+	assignee_id INTEGER,
 	archived BOOLEAN DEFAULT FALSE NOT NULL,
 	created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-	close_at TIMESTAMP
+	close_at TIMESTAMP,
+	FOREIGN KEY (category_id) REFERENCES ticket_categories(id) ON DELETE SET NULL
 );
 
 CREATE TABLE IF NOT EXISTS constants (
@@ -28,6 +30,33 @@ CREATE TABLE IF NOT EXISTS giveaways (
 	created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS giveaway_entries (
+	message_id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	weight REAL NOT NULL DEFAULT 1,
+	PRIMARY KEY (message_id, user_id),
+	FOREIGN KEY (message_id) REFERENCES giveaways(message_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS giveaway_bonus_roles (
+	message_id INTEGER NOT NULL,
+	role_id INTEGER NOT NULL,
+	weight REAL NOT NULL,
+	PRIMARY KEY (message_id, role_id),
+	FOREIGN KEY (message_id) REFERENCES giveaways(message_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS giveaway_draws (
+	message_id INTEGER NOT NULL,
+	draw INTEGER NOT NULL,
+	seed INTEGER NOT NULL,
+	winner_count INTEGER NOT NULL,
+	winners TEXT NOT NULL,
+	drawn_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+	PRIMARY KEY (message_id, draw),
+	FOREIGN KEY (message_id) REFERENCES giveaways(message_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
 CREATE TABLE IF NOT EXISTS application_bans (
 	user_id INTEGER NOT NULL,
 	guild_id INTEGER NOT NULL,
@@ -58,13 +87,16 @@ CREATE TABLE IF NOT EXISTS ticket_category_questions (
 );
 
 -- Indexes for faster lookups
-CREATE INDEX IF NOT EXISTS idx_tickets_category ON tickets(category);
+CREATE INDEX IF NOT EXISTS idx_tickets_category_id ON tickets(category_id);
+CREATE INDEX IF NOT EXISTS idx_tickets_guild ON tickets(guild_id);
 CREATE INDEX IF NOT EXISTS idx_tickets_assignee ON tickets(assignee_id);
+CREATE INDEX IF NOT EXISTS idx_tickets_close_at_open ON tickets(close_at) WHERE archived = FALSE AND close_at IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_constants_guild ON constants(guild_id);
 CREATE INDEX IF NOT EXISTS idx_giveaways_ends_at ON giveaways(ends_at);
-CREATE INDEX IF NOT EXISTS idx_giveaways_ended ON giveaways(ended);
+CREATE INDEX IF NOT EXISTS idx_giveaways_ends_at_running ON giveaways(ends_at) WHERE ended = FALSE;
 CREATE INDEX IF NOT EXISTS idx_giveaways_guild ON giveaways(guild_id);
 CREATE INDEX IF NOT EXISTS idx_application_bans_guild ON application_bans(guild_id);
+CREATE INDEX IF NOT EXISTS idx_application_bans_ends_at ON application_bans(ends_at, user_id, guild_id) WHERE ends_at IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_ticket_categories_id ON ticket_categories(id);
 CREATE INDEX IF NOT EXISTS idx_ticket_category_questions_category ON ticket_category_questions(category_id);
 
@@ -80,5 +112,15 @@ CREATE TABLE IF NOT EXISTS banlist_bans (
 
 CREATE INDEX IF NOT EXISTS idx_banlist_bans_guild_id ON banlist_bans(guild_id);
 
+CREATE TABLE IF NOT EXISTS role_queue (
+	guild_id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	role_id INTEGER NOT NULL,
+	add_role BOOLEAN NOT NULL,
+	reason TEXT,
+	attempts INTEGER NOT NULL DEFAULT 1,
+	next_attempt_at TIMESTAMP NOT NULL,
+	PRIMARY KEY (guild_id, user_id, role_id)
+) WITHOUT ROWID;
 
-
+CREATE INDEX IF NOT EXISTS idx_role_queue_next_attempt_at ON role_queue(next_attempt_at);
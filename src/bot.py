@@ -25,6 +25,10 @@ from .features.giveaway.command import setup_giveaway_command
 from .features.timeout.command import setup_timeout_command
 from .features.setup.command import setup_setup_command
 from .features.category.command import setup_category_command
+from .features.stats.command import setup_stats_command
+from .features.backup import setup_backup_task
+from .features.scheduler import setup_scheduler
+from .features.roles import setup_role_assigner
 import traceback
 
 intents = discord.Intents.default()
@@ -92,6 +96,10 @@ setup_category_command(bot)
 setup_team_command(bot)
 setup_banlist_command(bot)
 setup_help_command(bot)
+setup_stats_command(bot)
+setup_backup_task(bot)
+setup_role_assigner(bot)
+setup_scheduler(bot)
 
 try:
     if TOKEN is None:
@@ -100,6 +108,7 @@ try:
     logger.info("Starting bot...")
 
     db.connect()
+    R.load_guild_locales()
     bot.run(TOKEN)
 except KeyboardInterrupt:
     logger.info("Bot has been stopped by user.")
@@ -109,4 +118,5 @@ finally:
     db.close()
     logger.info("Bot has been shut down.")
     logger.info("------")
+    logger.flush()
     logger.close()
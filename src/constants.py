@@ -28,6 +28,29 @@ class Constants:
     # Key for the timeout log channel in DB
     db_file: str = "db/tickets.db"
     db_schema_file: str = "db/schema.sql"
+    db_reader_pool_size: int = 4  # Read-only connections used for get/is_ queries
+    db_wal_autocheckpoint: int = 1000  # WAL size in pages after which SQLite checkpoints
+    db_shutdown_checkpoint: str | None = "TRUNCATE"  # Checkpoint mode run when the database is closed
+    db_commit_window_ms: int = 10  # Writes arriving within this window are committed together
+    db_max_batch_size: int = 256  # Max number of writes committed together
+    db_ticket_cache_size: int = 1024  # Max number of open tickets kept in memory
+    db_ticket_cache_ttl: float = 600  # Seconds after which a cached ticket is reloaded
+    db_backup_dir: str = "db/backups"
+    db_backup_interval: int = 24  # Hours between two backups
+    db_backup_keep: int = 7  # Number of backups to keep
+    db_backup_pages: int = 256  # Pages copied per backup step
+    db_backup_sleep: float = 0.05  # Seconds to wait between two backup steps
+
+    res_command_table_file: str = "src/res/command_table.json"  # Cache of the generated command localization table
+
+    log_queue_size: int = 10000  # Max number of log lines waiting to be written
+    log_overflow_policy: str = "drop-debug-first"  # "block", "drop-debug-first" or "sample"
+    log_sample_rate: int = 10  # With "sample", one of this many overflowing lines is kept
+    log_batch_size: int = 256  # Max number of log lines written at once
+    log_json: bool = False  # Write the log file as JSON lines instead of text
+    log_max_bytes: int = 50 * 1024 * 1024  # Log files are rotated when they reach this size
+    log_retention_days: int = 30  # Rotated log files are deleted after this many days
+    log_compress: bool = True  # Gzip rotated log files
 
     embed_desc_max_length: int = 4096  # Max length for embed descriptions
     max_embeds: int = 10  # Max number of embeds per message
@@ -44,9 +67,20 @@ class Constants:
     ticket_close_time: int = 12  # Hours after which noch fragen-tickets are closed
 
     # Giveaway settings
-    giveaway_check_interval: int = 30  # Seconds between giveaway checks
     giveaway_reaction: str = "🎉"
-    application_ban_check_interval: int = 30
+    giveaway_finalize_concurrency: int = 8  # Max number of giveaways finalized at once
+    giveaway_finalize_guild_concurrency: int = 2  # Max number of giveaways of one guild finalized at once
+    giveaway_entry_flush_interval: float = 1  # Seconds giveaway reactions are collected before they are written
+    giveaway_entry_batch_size: int = 500  # Pending giveaway reactions after which they are written right away
+
+    # Role assignment
+    role_assign_concurrency: int = 4  # Max number of role changes sent to Discord at once
+    role_retry_backoff: float = 30  # Seconds before a failed role change is retried, doubled with every attempt
+    role_retry_max_attempts: int = 6  # Attempts after which a role change is given up
+
+    # Deadline scheduler
+    scheduler_reload_interval: int = 3600  # Seconds between full reloads of the deadlines from the database
+    scheduler_retry_backoff: int = 30  # Seconds before a failed deadline handler is run again
 
     # Embed colors
     embed_color: discord.Color = discord.Color.blue()
@@ -15,7 +15,7 @@ class CustomBot(discord.Bot):
             @functools.wraps(func)
             async def wrapper(ctx: discord.ApplicationContext, *args, **kwargs):
                 """The same as the decorated function, but with additional initialization."""
-                await R.init(ctx.guild_id)
+                R.init(ctx.guild_id)
                 return await func(ctx, *args, **kwargs)
             return parent_slash_command(*cmd_args, **cmd_kwargs)(wrapper)
         return function_receiver
@@ -32,7 +32,7 @@ class CustomSlashCommandGroup(discord.SlashCommandGroup):
             @functools.wraps(func)
             async def wrapper(ctx: discord.ApplicationContext, *args, **kwargs):
                 """The same as the decorated function, but with additional initialization."""
-                await R.init(ctx.guild_id)
+                R.init(ctx.guild_id)
                 return await func(ctx, *args, **kwargs)
             return parent_command(*cmd_args, **cmd_kwargs)(wrapper)
         return function_receiver
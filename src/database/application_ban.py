@@ -26,7 +26,6 @@ class ApplicationBanManager:
             "INSERT INTO application_bans (user_id, guild_id, ends_at) VALUES (?, ?, ?)",
             (user_id, guild_id, ends_at)
         )
-        self.connection.commit()
         logger.info(
             f"User {user_id} banned from applications in guild {guild_id} until {ends_at}.")
 
@@ -41,7 +40,6 @@ class ApplicationBanManager:
             "DELETE FROM application_bans WHERE user_id = ? AND guild_id = ?",
             (user_id, guild_id)
         )
-        self.connection.commit()
         logger.info(
             f"User {user_id} unbanned from applications in guild {guild_id}.")
 
@@ -73,3 +71,13 @@ class ApplicationBanManager:
             (current_time,)
         )
         return self.cursor.fetchall()
+
+    def get_ban_deadlines(self) -> list[tuple[int, int, datetime.datetime]]:
+        """
+        Get the end time of all application bans that have one.
+        Returns:
+            list[tuple[int, int, datetime.datetime]]: (user_id, guild_id, ends_at) of the bans.
+        """
+        self.cursor.execute(
+            "SELECT user_id, guild_id, ends_at FROM application_bans WHERE ends_at IS NOT NULL")
+        return self.cursor.fetchall()
@@ -0,0 +1,144 @@
+"""
+Online backups of the database.
+Snapshots are copied page by page from a read-only connection, so the bot keeps serving reads and writes
+while a backup is running.
+"""
+import asyncio
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+from src.utils import logger
+
+
+class BackupResult:
+    """
+    Outcome of a finished backup.
+
+    Args:
+        path (str): Path of the written snapshot.
+        pages (int): Number of pages copied.
+        duration (float): Duration of the backup in seconds.
+        finished_at (datetime.datetime): When the backup finished.
+    """
+
+    def __init__(self, path: str, pages: int, duration: float, finished_at: datetime.datetime):
+        self.path = path
+        self.pages = pages
+        self.duration = duration
+        self.finished_at = finished_at
+
+
+class DatabaseBackup:
+    """
+    Writes timestamped snapshots of the database and keeps the newest `keep` of them.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], directory: str, prefix: str,
+                 keep: int, pages: int, sleep: float):
+        """
+        Args:
+            connect (Callable[[], sqlite3.Connection]): Opens a read-only connection to the database.
+            directory (str): Directory the snapshots are written to.
+            prefix (str): File name prefix of the snapshots.
+            keep (int): Number of snapshots to keep.
+            pages (int): Number of pages copied per step.
+            sleep (float): Seconds to wait between two steps and before retrying a busy step.
+        """
+        self.connect = connect
+        self.directory = directory
+        self.prefix = prefix
+        self.keep = keep
+        self.pages = pages
+        self.sleep = sleep
+        self.last_result: BackupResult | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether a backup is running right now."""
+        return self._lock.locked()
+
+    def run(self) -> BackupResult | None:
+        """
+        Write a new snapshot and delete the old ones. Blocks until the backup is done.
+        Returns:
+            BackupResult | None: The result, or None if another backup is already running.
+        """
+        if not self._lock.acquire(blocking=False):
+            logger.warning("Database backup skipped, another backup is running.")
+            return None
+        try:
+            result = self._write_snapshot()
+            self.last_result = result
+            self._rotate()
+            return result
+        finally:
+            self._lock.release()
+
+    async def run_async(self) -> BackupResult | None:
+        """
+        Write a new snapshot on a separate thread.
+        Returns:
+            BackupResult | None: The result, or None if another backup is already running.
+        """
+        return await asyncio.to_thread(self.run)
+
+    def _write_snapshot(self) -> BackupResult:
+        """Copy the database into a new timestamped file."""
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"{self.prefix}-{timestamp}.db")
+        # Written under a temporary name, so an interrupted backup never looks like a snapshot
+        partial_path = path + ".part"
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+        logged_percent = 0
+
+        def progress(status: int, remaining: int, total: int):
+            nonlocal logged_percent
+            percent = (total - remaining) * 100 // total if total else 100
+            if percent >= logged_percent + 25:
+                logged_percent = percent
+                logger.debug(
+                    f"Database backup {percent}% ({total - remaining}/{total} pages)")
+            # `sleep` of Connection.backup only applies when the database is busy,
+            # so pause between steps here to leave I/O to the bot
+            if remaining and self.sleep > 0:
+                time.sleep(self.sleep)
+
+        start = time.perf_counter()
+        source = self.connect()
+        target = sqlite3.connect(partial_path)
+        try:
+            # Keep one read transaction open for the whole backup, so all steps copy the same
+            # snapshot and writes of the bot don't restart the backup
+            source.isolation_level = None
+            source.execute("BEGIN")
+            source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            source.backup(target, pages=self.pages,
+                          sleep=self.sleep, progress=progress)
+            pages = target.execute("PRAGMA page_count").fetchone()[0]
+            source.execute("COMMIT")
+        finally:
+            target.close()
+            source.close()
+        os.replace(partial_path, path)
+        duration = time.perf_counter() - start
+
+        logger.info(
+            f"Database backup written to {path} ({pages} pages in {duration:.2f}s).")
+        return BackupResult(path, pages, duration, datetime.datetime.now())
+
+    def _rotate(self):
+        """Delete all but the newest `keep` snapshots. The newest one is always kept."""
+        snapshots = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(self.prefix + "-") and name.endswith(".db")
+        )
+        for name in snapshots[:-max(self.keep, 1)]:
+            os.remove(os.path.join(self.directory, name))
+            logger.info(f"Old database backup {name} deleted.")
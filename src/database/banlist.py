@@ -36,7 +36,6 @@ class BanlistManager:
             "INSERT INTO banlist_bans (name, guild_id, reason, banned_by, length, image_url) VALUES (?, ?, ?, ?, ?, ?)",
             (name, guild_id, reason, banned_by, length, image_url)
         )
-        self.connection.commit()
 
     def remove_ban(self, name: str, guild_id: int):
         """
@@ -50,7 +49,6 @@ class BanlistManager:
             "DELETE FROM banlist_bans WHERE name = ? AND guild_id = ?",
             (name, guild_id)
         )
-        self.connection.commit()
 
     def is_banned(self, name: str, guild_id: int) -> bool:
         """
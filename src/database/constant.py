@@ -1,36 +1,139 @@
+import threading
+from typing import Callable
 from src.utils import logger
 
 
+class ConstantCache:
+    """
+    In-memory snapshot of all constants of a guild, shared by all ConstantManager instances.
+    Snapshots are loaded lazily on the first lookup for a guild and kept up to date by `ConstantManager.set`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: dict[int, dict[str, str | None]] = {}
+        # Bumped on every write to a guild, so that a snapshot loaded
+        # concurrently with a write is not stored
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, guild: int) -> tuple[dict[str, str | None] | None, int]:
+        """
+        Look up the snapshot of a guild.
+        Args:
+            guild (int): Guild ID.
+        Returns:
+            tuple[dict[str, str | None] | None, int]: The snapshot, or None if it isn't loaded,
+            and the generation to pass to `store` after loading it.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(guild)
+            if snapshot is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return snapshot, self._generations.get(guild, 0)
+
+    def store(self, guild: int, snapshot: dict[str, str | None], generation: int):
+        """
+        Store a freshly loaded snapshot, unless the guild was written to since `lookup`.
+        Args:
+            guild (int): Guild ID.
+            snapshot (dict[str, str | None]): The constants of the guild.
+            generation (int): The generation returned by `lookup`.
+        """
+        with self._lock:
+            if self._generations.get(guild, 0) == generation:
+                self._snapshots[guild] = snapshot
+
+    def update(self, guild: int, key: str, value: str | None):
+        """
+        Write a committed value through to the snapshot of a guild, if it is loaded.
+        Args:
+            guild (int): Guild ID.
+            key (str): Key of the constant.
+            value (str | None): The new value.
+        """
+        with self._lock:
+            self._generations[guild] = self._generations.get(guild, 0) + 1
+            snapshot = self._snapshots.get(guild)
+            if snapshot is not None:
+                snapshot[key] = value
+
+    def invalidate(self, guild: int | None = None):
+        """
+        Drop the snapshot of a guild, or of all guilds.
+        Args:
+            guild (int | None): Guild ID, or None to drop everything.
+        """
+        with self._lock:
+            if guild is None:
+                for g in self._snapshots:
+                    self._generations[g] = self._generations.get(g, 0) + 1
+                self._snapshots.clear()
+            else:
+                self._generations[guild] = self._generations.get(guild, 0) + 1
+                self._snapshots.pop(guild, None)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the cache counters.
+        Returns:
+            dict[str, int]: Number of hits, misses and loaded guilds.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "guilds": len(self._snapshots)}
+
+
 class ConstantManager:
-    def __init__(self, connection):
+    def __init__(self, connection, cache: ConstantCache, after_commit: Callable[[Callable[[], None]], None]):
         """
         Initialize the ConstantManager with a database connection.
         Args:
             connection: SQLite database connection object.
+            cache (ConstantCache): The per-guild snapshot cache shared by all ConstantManager instances.
+            after_commit (Callable): Schedules a callback to run once the current write is committed.
         """
         self.connection = connection
         self.cursor = connection.cursor()
+        self.cache = cache
+        self.after_commit = after_commit
 
     def get(self, key: str, guild: int) -> str | None:
         """
-        Get a constant value from the database.
+        Get a constant value.
+        Served from the guild's snapshot; the snapshot is loaded with one query on the first lookup.
         Args:
             key (str): Key of the constant.
             guild (int): Guild ID for the constant.
         Returns:
             str | None: Constant value if found, else None.
         """
+        snapshot, generation = self.cache.lookup(guild)
+        if snapshot is None:
+            self.cursor.execute(
+                "SELECT key, value FROM constants WHERE guild_id = ?", (guild,))
+            snapshot = dict(self.cursor.fetchall())
+            self.cache.store(guild, snapshot, generation)
+        return snapshot.get(key)
+
+    def get_all(self, key: str) -> dict[int, str]:
+        """
+        Get the value of a constant for all guilds that have it set.
+        Args:
+            key (str): Key of the constant.
+        Returns:
+            dict[int, str]: Constant value by guild ID.
+        """
         self.cursor.execute(
-            "SELECT value FROM constants WHERE key = ? AND guild_id = ?", (key, guild))
-        constant = self.cursor.fetchone()
-        if constant:
-            return constant[0]
-        else:
-            return None
+            "SELECT guild_id, value FROM constants WHERE key = ? AND value IS NOT NULL", (key,))
+        return dict(self.cursor.fetchall())
 
     def set(self, key: str, value: str, guild: int):
         """
         Set a constant value in the database.
+        The guild's snapshot is updated once the change is committed.
         Args:
             key (str): Key of the constant.
             value (str): Value to set.
@@ -40,5 +143,7 @@ class ConstantManager:
             "INSERT OR REPLACE INTO constants (key, guild_id, value) VALUES (?, ?, ?)",
             (key, guild, value)
         )
-        self.connection.commit()
+        # The column has TEXT affinity, so SQLite stores non-null values as text
+        stored = None if value is None else str(value)
+        self.after_commit(lambda: self.cache.update(guild, key, stored))
         logger.info(f"Constant {key} set to {value} for guild {guild}.")
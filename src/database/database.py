@@ -6,17 +6,20 @@ import sqlite3
 import os
 import datetime
 from .application_ban import ApplicationBanManager
-from .constant import ConstantManager
+from .constant import ConstantCache, ConstantManager
 from .giveaway import GiveawayManager
-from .ticket import TicketManager
-from .ticket_category import TicketCategoryManager
+from .ticket import TicketCache, TicketManager
+from .ticket_category import CategoryGraphCache, TicketCategoryManager
 from .banlist import BanlistManager
+from .role_queue import RoleQueueManager
+from .backup import DatabaseBackup
+from .executor import AsyncManager, DatabaseExecutor, SyncManager, Transaction
 from src.utils import logger
 from src.constants import C
 import re
 
 
-USER_VERSION = 11
+USER_VERSION = 17
 
 # Register adapter and converter for datetime
 
@@ -61,17 +64,37 @@ def replace_migration_placeholders(migration_script: str) -> str:
     return migration_script
 
 
+class SyncDatabase:
+    """
+    Blocking access to the database managers.
+    Kept as a thin shim for code that has not been migrated to the async API yet.
+    Every call still runs on the database thread, but blocks the caller until it is done.
+    """
+
+    giveaway: SyncManager[GiveawayManager] | None = None
+    ticket: SyncManager[TicketManager] | None = None
+    constant: SyncManager[ConstantManager] | None = None
+    ab: SyncManager[ApplicationBanManager] | None = None
+    tc: SyncManager[TicketCategoryManager] | None = None
+    banlist: SyncManager[BanlistManager] | None = None
+    role_queue: SyncManager[RoleQueueManager] | None = None
+
+
 class Database:
     """
     Handles SQLite database operations for ticket management.
+    All database work runs on a dedicated thread, so the manager
+    methods exposed here are coroutines and must be awaited.
+    Use `db.sync` for blocking access.
     """
 
-    giveaway: GiveawayManager | None = None
-    ticket: TicketManager | None = None
-    constant: ConstantManager | None = None
-    ab: ApplicationBanManager | None = None
-    tc: TicketCategoryManager | None = None
-    banlist: BanlistManager | None = None
+    giveaway: AsyncManager[GiveawayManager] | None = None
+    ticket: AsyncManager[TicketManager] | None = None
+    constant: AsyncManager[ConstantManager] | None = None
+    ab: AsyncManager[ApplicationBanManager] | None = None
+    tc: AsyncManager[TicketCategoryManager] | None = None
+    banlist: AsyncManager[BanlistManager] | None = None
+    role_queue: AsyncManager[RoleQueueManager] | None = None
 
     def _migrate(self, backup: bool, from_version: int = None):
         """
@@ -116,19 +139,58 @@ class Database:
         self.connection.commit()
         logger.info(f"Database migrated to version {USER_VERSION}.")
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, reader_pool_size: int = C.db_reader_pool_size,
+                 wal_autocheckpoint: int = C.db_wal_autocheckpoint, shutdown_checkpoint: str | None = C.db_shutdown_checkpoint,
+                 commit_window_ms: int = C.db_commit_window_ms, max_batch_size: int = C.db_max_batch_size,
+                 ticket_cache_size: int = C.db_ticket_cache_size, ticket_cache_ttl: float = C.db_ticket_cache_ttl):
         """
         Initialize the Database object.
         Args:
             filename (str): Path to the SQLite database file.
+            reader_pool_size (int): Number of read-only connections for `get`/`is_` methods. 0 runs reads on the writer.
+            wal_autocheckpoint (int): WAL size in pages after which SQLite checkpoints automatically. 0 disables automatic checkpoints.
+            shutdown_checkpoint (str | None): Checkpoint mode (PASSIVE, FULL, RESTART or TRUNCATE) to run on close, or None to skip it.
+            commit_window_ms (int): Writes arriving within this many milliseconds are committed in one transaction.
+            max_batch_size (int): Maximum number of writes committed in one transaction.
+            ticket_cache_size (int): Maximum number of open tickets kept in memory. 0 disables the cache.
+            ticket_cache_ttl (float): Seconds after which a cached ticket is reloaded.
         """
         self.filename = filename
+        self.reader_pool_size = reader_pool_size
+        self.wal_autocheckpoint = wal_autocheckpoint
+        self.shutdown_checkpoint = shutdown_checkpoint
+        self.commit_window_ms = commit_window_ms
+        self.max_batch_size = max_batch_size
         self.connection = None
+        self.executor: DatabaseExecutor | None = None
+        self.sync = SyncDatabase()
+        # In-memory caches shared by the managers of all connections
+        self.constant_cache = ConstantCache()
+        self.ticket_cache = TicketCache(ticket_cache_size, ticket_cache_ttl)
+        self.category_cache = CategoryGraphCache()
+        self.backup = DatabaseBackup(
+            self._connect_reader, C.db_backup_dir, os.path.splitext(
+                os.path.basename(filename))[0],
+            C.db_backup_keep, C.db_backup_pages, C.db_backup_sleep)
 
     def connect(self):
         """
         Connect to the database. If it doesn't exist, create it.
         Apply migrations if necessary.
+        The writer connection is opened on the writer thread and the reader pool is started afterwards.
+        """
+        self.executor = DatabaseExecutor(
+            self.commit_window_ms / 1000, self.max_batch_size)
+        self.executor.run_sync(self._connect)
+        self.executor.start_readers(
+            self.reader_pool_size, self._connect_reader, self._create_managers)
+        logger.info(
+            f"Database reader pool started with {self.reader_pool_size} connections.")
+
+    def _connect(self):
+        """
+        Open the writer connection and initialize the managers.
+        Must be run on the writer thread.
         """
         if not os.path.exists(self.filename):
             self._create_database(self.filename)
@@ -138,8 +200,38 @@ class Database:
         self.cursor = self.connection.cursor()
         logger.info(f"Database {self.filename} opened.")
         self._migrate(True)
+        self._enable_wal()
+        # Only after the migrations, so a table rebuilt by a migration doesn't cascade
+        self.connection.execute("PRAGMA foreign_keys=ON")
         self._init_components()
 
+    def _enable_wal(self):
+        """
+        Switch the database to WAL mode, so that readers don't block the writer and vice versa.
+        The journal mode is persistent, but setting it again is a no-op.
+        """
+        mode = self.connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if mode.lower() != "wal":
+            logger.warning(
+                f"Could not enable WAL mode, journal mode is {mode}.")
+        self.connection.execute(
+            f"PRAGMA wal_autocheckpoint={int(self.wal_autocheckpoint)}")
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection for the reader pool.
+        The connection is only ever used by one reader thread at a time,
+        but it is closed from the thread that shuts down the pool.
+        Returns:
+            sqlite3.Connection: The read-only connection.
+        """
+        uri = f"file:{os.path.abspath(self.filename)}?mode=ro"
+        connection = sqlite3.connect(
+            uri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+        )
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
     def _create_database(self, filename: str):
         """
         Create the database file and tables using the schema file.
@@ -162,20 +254,68 @@ class Database:
 
     def close(self):
         """
-        Close the database connection.
+        Wait for pending database calls, close the connection and stop the database thread.
         """
+        if self.executor is None:
+            return
         if self.connection is not None:
-            self.connection.close()
+            self.executor.run_sync(self._close_writer)
+        self.executor.shutdown()
+        self.executor = None
         logger.info("Database connection closed.")
 
+    def _close_writer(self):
+        """
+        Checkpoint the WAL if configured and close the writer connection.
+        Must be run on the writer thread.
+        """
+        if self.shutdown_checkpoint:
+            self.connection.execute(
+                f"PRAGMA wal_checkpoint({self.shutdown_checkpoint})")
+        self.connection.close()
+
+    def _create_managers(self, connection: sqlite3.Connection) -> dict[str, object]:
+        """
+        Create one instance of every manager bound to the given connection.
+        All instances share the same caches.
+        Args:
+            connection (sqlite3.Connection): The connection to use.
+        Returns:
+            dict[str, object]: The managers by their attribute name on the database.
+        """
+        return {
+            "giveaway": GiveawayManager(connection),
+            "ticket": TicketManager(connection, self.ticket_cache, self.executor.after_commit),
+            "constant": ConstantManager(connection, self.constant_cache, self.executor.after_commit),
+            "ab": ApplicationBanManager(connection),
+            "tc": TicketCategoryManager(connection, self.category_cache, self.executor.after_commit),
+            "banlist": BanlistManager(connection),
+            "role_queue": RoleQueueManager(connection),
+        }
+
+    def transaction(self) -> Transaction:
+        """
+        Start a unit of work. All manager calls recorded on it are committed atomically
+        when the `async with` block exits.
+
+        Usage:
+        ```
+        async with db.transaction() as tx:
+            tx.tc.set_questions(category_id, [])
+            tx.tc.delete_category(category_id)
+        ```
+        Returns:
+            Transaction: The unit of work.
+        """
+        return Transaction(self.executor)
+
     def _init_components(self):
         """
         Initialize the components of the database.
         This should be called after connecting to the database.
         """
-        self.giveaway = GiveawayManager(self.connection)
-        self.ticket = TicketManager(self.connection)
-        self.constant = ConstantManager(self.connection)
-        self.ab = ApplicationBanManager(self.connection)
-        self.tc = TicketCategoryManager(self.connection)
-        self.banlist = BanlistManager(self.connection)
+        managers = self._create_managers(self.connection)
+        self.executor.set_writer(self.connection, managers)
+        for name, manager in managers.items():
+            setattr(self, name, AsyncManager(name, manager, self.executor))
+            setattr(self.sync, name, SyncManager(name, manager, self.executor))
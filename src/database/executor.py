@@ -0,0 +1,452 @@
+"""
+Runs database work off the event loop.
+Provides the DatabaseExecutor, which owns a group-committing writer thread and a pool of reader threads,
+proxies that expose the manager methods as coroutines or as blocking calls,
+and the Transaction unit of work.
+"""
+import asyncio
+import functools
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Generic, TypeVar
+from src.utils import logger
+
+T = TypeVar("T")
+
+# Manager methods starting with one of these prefixes only read from the database
+# and are dispatched to the reader pool. All other methods run on the writer thread.
+READ_PREFIXES = ("get", "is_", "user_can_")
+
+ManagerFactory = Callable[[sqlite3.Connection], dict[str, object]]
+
+
+def is_read_method(name: str) -> bool:
+    """
+    Check whether a manager method only reads from the database.
+    Args:
+        name (str): The name of the method.
+    Returns:
+        bool: True if the method can run on a read-only connection.
+    """
+    return name.startswith(READ_PREFIXES)
+
+
+class WriteJob:
+    """
+    A unit of work queued for the writer thread.
+
+    Args:
+        func (Callable[[], Any]): The work to run on the writer thread.
+        transactional (bool): Whether the job runs inside a group-committed transaction.
+            Maintenance jobs (opening, migrating, closing) run outside of any transaction.
+    """
+
+    __slots__ = ("func", "transactional", "future")
+
+    def __init__(self, func: Callable[[], Any], transactional: bool):
+        self.func = func
+        self.transactional = transactional
+        self.future: Future = Future()
+
+
+class DatabaseExecutor:
+    """
+    Executes database calls off the event loop.
+
+    All mutations run on a single writer thread that owns the writer connection,
+    so writes are serialized. Jobs that arrive within `commit_window` seconds of each other
+    are run in one transaction and committed together (group commit).
+    Each job gets its own savepoint, so a failing job only rolls back its own changes.
+    A job's future is resolved after the commit, which makes awaiting it a durability acknowledgement.
+
+    Reads run on a pool of reader threads, each with its own read-only connection.
+    In WAL mode readers never wait on the writer.
+    If the pool is not started, reads are queued on the writer thread as well.
+    """
+
+    def __init__(self, commit_window: float = 0.0, max_batch_size: int = 1):
+        """
+        Start the writer thread.
+        Args:
+            commit_window (float): Seconds to wait for more jobs before committing a batch.
+            max_batch_size (int): Maximum number of jobs committed together.
+        """
+        self.commit_window = commit_window
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue: queue.Queue[WriteJob | None] = queue.Queue()
+        self._commit_callbacks: list[Callable[[], None]] | None = None
+        self._connection: sqlite3.Connection | None = None
+        self._writer_managers: dict[str, object] = {}
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="database-writer", daemon=True)
+        self._writer.start()
+
+        self._readers: ThreadPoolExecutor | None = None
+        self._reader_local = threading.local()
+        self._reader_connections: list[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+
+    def _on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._writer
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Run a callback once the changes of the current job are committed.
+        If the job is rolled back, the callback is dropped.
+        Use this to update in-memory caches, so they never show uncommitted data.
+        Must be called on the writer thread.
+        Args:
+            callback (Callable[[], None]): The callback to run.
+        """
+        if self._commit_callbacks is None:
+            # Not inside a transaction, so there is nothing to wait for
+            callback()
+        else:
+            self._commit_callbacks.append(callback)
+
+    @staticmethod
+    def _run_callbacks(callbacks: list[Callable[[], None]]):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Database commit callback failed: {e}")
+
+    @property
+    def manager_names(self) -> list[str]:
+        """The names of the available managers, e.g. "ticket"."""
+        return list(self._writer_managers)
+
+    def set_writer(self, connection: sqlite3.Connection, managers: dict[str, object]):
+        """
+        Set the writer connection and the managers bound to it.
+        Must be called on the writer thread after the connection is opened and migrated.
+        The connection is switched to manual transaction control, as the writer thread
+        begins and commits the transactions itself.
+        Args:
+            connection (sqlite3.Connection): The writer connection.
+            managers (dict[str, object]): The managers by name.
+        """
+        connection.isolation_level = None
+        self._connection = connection
+        self._writer_managers = managers
+
+    def start_readers(self, size: int, connect: Callable[[], sqlite3.Connection], create_managers: ManagerFactory):
+        """
+        Start the reader pool.
+        Args:
+            size (int): Number of reader threads/connections. 0 disables the pool.
+            connect (Callable): Opens a new read-only connection.
+            create_managers (ManagerFactory): Creates the managers for a connection.
+        """
+        if size <= 0:
+            return
+
+        def init_reader():
+            connection = connect()
+            with self._reader_lock:
+                self._reader_connections.append(connection)
+            self._reader_local.managers = create_managers(connection)
+
+        self._readers = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="database-reader", initializer=init_reader)
+
+    def _writer_loop(self):
+        """
+        Main loop of the writer thread.
+        Collects jobs into batches and commits each batch once.
+        """
+        pending: list[WriteJob | None] = []
+        while True:
+            job = pending.pop() if pending else self._queue.get()
+            if job is None:
+                return
+            # A job whose caller was cancelled before it started is dropped,
+            # once it runs it can't be cancelled anymore
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            if not job.transactional:
+                self._run_job(job)
+                continue
+
+            batch = [job]
+            deadline = time.monotonic() + self.commit_window
+            while len(batch) < self.max_batch_size:
+                try:
+                    timeout = deadline - time.monotonic()
+                    if timeout > 0:
+                        nxt = self._queue.get(timeout=timeout)
+                    else:
+                        nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None or not nxt.transactional:
+                    # Commit what we have first, then handle this job
+                    pending.append(nxt)
+                    break
+                if nxt.future.set_running_or_notify_cancel():
+                    batch.append(nxt)
+            self._run_batch(batch)
+
+    @staticmethod
+    def _run_job(job: WriteJob):
+        try:
+            job.future.set_result(job.func())
+        except BaseException as e:
+            job.future.set_exception(e)
+
+    def _run_batch(self, batch: list[WriteJob]):
+        """
+        Run a batch of jobs in one transaction and commit it.
+        Must be run on the writer thread.
+        """
+        connection = self._connection
+        outcomes: list[tuple[Any, BaseException | None]] = []
+        callbacks: list[Callable[[], None]] = []
+        try:
+            connection.execute("BEGIN")
+            for job in batch:
+                connection.execute("SAVEPOINT job")
+                self._commit_callbacks = []
+                try:
+                    result = job.func()
+                except Exception as e:
+                    connection.execute("ROLLBACK TO job")
+                    connection.execute("RELEASE job")
+                    outcomes.append((None, e))
+                else:
+                    connection.execute("RELEASE job")
+                    outcomes.append((result, None))
+                    callbacks.extend(self._commit_callbacks)
+                finally:
+                    self._commit_callbacks = None
+            connection.execute("COMMIT")
+        except Exception as e:
+            # The transaction itself failed, so nothing in this batch is durable
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            logger.warning(
+                f"Database batch of {len(batch)} jobs failed to commit: {e}")
+            for job in batch:
+                job.future.set_exception(e)
+            return
+
+        self._run_callbacks(callbacks)
+        for job, (result, err) in zip(batch, outcomes):
+            if err is None:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(err)
+
+    def _submit(self, func: Callable[[], Any], transactional: bool = True) -> Future:
+        job = WriteJob(func, transactional)
+        self._queue.put(job)
+        return job.future
+
+    def _route(self, manager: str, method: str) -> tuple[str, Callable]:
+        """
+        Find where a manager call runs and the function that performs it.
+        Returns "here" if the call can run on the current thread,
+        "reader" for the reader pool and "writer" for the writer queue.
+        """
+        if self._on_writer_thread():
+            return "here", getattr(self._writer_managers[manager], method)
+        if self._readers is not None and is_read_method(method):
+            def call(*args, **kwargs):
+                return getattr(self._reader_local.managers[manager], method)(*args, **kwargs)
+            return "reader", call
+        return "writer", getattr(self._writer_managers[manager], method)
+
+    async def call(self, manager: str, method: str, *args, **kwargs) -> Any:
+        """
+        Call a manager method off the event loop and await its result.
+        For mutations, the result is only returned once the change is committed.
+        Args:
+            manager (str): The name of the manager, e.g. "ticket".
+            method (str): The name of the method, e.g. "get".
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+        Returns:
+            The return value of the method.
+        """
+        where, func = self._route(manager, method)
+        if where == "here":
+            return func(*args, **kwargs)
+        if where == "reader":
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._readers, functools.partial(func, *args, **kwargs))
+        return await asyncio.wrap_future(self._submit(functools.partial(func, *args, **kwargs)))
+
+    def call_sync(self, manager: str, method: str, *args, **kwargs) -> Any:
+        """
+        Call a manager method off the current thread and block until it is done.
+        Args:
+            manager (str): The name of the manager, e.g. "ticket".
+            method (str): The name of the method, e.g. "get".
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+        Returns:
+            The return value of the method.
+        """
+        where, func = self._route(manager, method)
+        if where == "here":
+            return func(*args, **kwargs)
+        if where == "reader":
+            return self._readers.submit(func, *args, **kwargs).result()
+        return self._submit(functools.partial(func, *args, **kwargs)).result()
+
+    async def run_transaction(self, func: Callable[[dict[str, object]], T]) -> T:
+        """
+        Run a function with the writer managers as one atomic job.
+        All changes made by the function are committed together or not at all.
+        Args:
+            func (Callable): Receives the managers by name.
+        Returns:
+            The return value of the function.
+        """
+        if self._on_writer_thread():
+            return func(self._writer_managers)
+        return await asyncio.wrap_future(self._submit(lambda: func(self._writer_managers)))
+
+    def run_sync(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a function on the writer thread outside of any transaction and block until it is done.
+        Should only be used during startup/shutdown, as it blocks the calling thread.
+        Args:
+            func (Callable): The function to run.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+        Returns:
+            The return value of the function.
+        """
+        if self._on_writer_thread():
+            return func(*args, **kwargs)
+        return self._submit(functools.partial(func, *args, **kwargs), transactional=False).result()
+
+    def shutdown(self):
+        """
+        Wait for all pending database calls, close the reader connections
+        and stop all database threads.
+        """
+        if self._readers is not None:
+            self._readers.shutdown(wait=True)
+            for connection in self._reader_connections:
+                connection.close()
+            self._reader_connections.clear()
+            self._readers = None
+        self._queue.put(None)
+        self._writer.join()
+
+
+class AsyncManager(Generic[T]):
+    """
+    Exposes each public method of a manager as a coroutine
+    that runs off the event loop.
+
+    Usage:
+    ```
+    ticket = await db.ticket.get(channel_id)
+    ```
+    """
+
+    def __init__(self, name: str, manager: T, executor: DatabaseExecutor):
+        self._name = name
+        self._manager = manager
+        self._executor = executor
+
+    def __getattr__(self, item: str) -> Any:
+        attr = getattr(self._manager, item)
+        if item.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self._executor.call(self._name, item, *args, **kwargs)
+        return method
+
+
+class SyncManager(Generic[T]):
+    """
+    Exposes each public method of a manager as a blocking call
+    that runs on the database threads.
+    This is a thin shim for code that can't await yet.
+    """
+
+    def __init__(self, name: str, manager: T, executor: DatabaseExecutor):
+        self._name = name
+        self._manager = manager
+        self._executor = executor
+
+    def __getattr__(self, item: str) -> Any:
+        attr = getattr(self._manager, item)
+        if item.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def method(*args, **kwargs):
+            return self._executor.call_sync(self._name, item, *args, **kwargs)
+        return method
+
+
+class RecordingManager:
+    """
+    Records calls to a manager's methods for a Transaction instead of running them.
+    """
+
+    def __init__(self, name: str, calls: list[tuple[str, str, tuple, dict]]):
+        self._name = name
+        self._calls = calls
+
+    def __getattr__(self, item: str) -> Callable[..., None]:
+        if item.startswith("_"):
+            raise AttributeError(item)
+
+        def method(*args, **kwargs):
+            self._calls.append((self._name, item, args, kwargs))
+        return method
+
+
+class Transaction:
+    """
+    A unit of work: every manager call recorded inside the `async with` block
+    is run on the writer thread in one savepoint when the block exits,
+    so either all of them are committed or none of them are.
+    If the block raises, nothing is run.
+
+    The calls are not run when they are made, so they return None.
+    Their return values are available in `results` after the block.
+
+    Usage:
+    ```
+    async with db.transaction() as tx:
+        tx.tc.set_questions(category_id, [])
+        tx.tc.delete_category(category_id)
+    ```
+    """
+
+    def __init__(self, executor: DatabaseExecutor):
+        self._executor = executor
+        self._calls: list[tuple[str, str, tuple, dict]] = []
+        self.results: list[Any] = []
+
+    def __getattr__(self, item: str) -> RecordingManager:
+        if item in self._executor.manager_names:
+            return RecordingManager(item, self._calls)
+        raise AttributeError(item)
+
+    async def __aenter__(self) -> "Transaction":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None or not self._calls:
+            return
+        calls = list(self._calls)
+
+        def run(managers: dict[str, object]) -> list[Any]:
+            return [getattr(managers[manager], method)(*args, **kwargs)
+                    for manager, method, args, kwargs in calls]
+        self.results = await self._executor.run_transaction(run)
@@ -1,11 +1,15 @@
+from typing import Callable, Iterator, TypeVar
 from src.utils import logger
 from .other import DatabaseError
 import datetime
 
+T = TypeVar("T")
+
 
 class Giveaway:
     """
-    Represents a giveaway with validation for all fields.
+    Represents a giveaway.
+    The constructor validates all fields; rows read from the database are created with `from_row` instead.
 
     Args:
         message_id (int): The Discord message ID for the giveaway.
@@ -23,6 +27,9 @@ class Giveaway:
         DatabaseError: If any field has an invalid format.
     """
 
+    __slots__ = ("message_id", "channel_id", "guild_id", "host_id", "prize",
+                 "winner_count", "role_id", "ends_at", "ended", "created_at")
+
     def __init__(self, message_id: int, channel_id: int, guild_id: int, host_id: int, prize: str,
                  winner_count: int, role_id: int | None, ends_at: datetime.datetime,
                  ended: bool, created_at: datetime.datetime):
@@ -58,6 +65,21 @@ class Giveaway:
         self.ended = ended
         self.created_at = created_at
 
+    @classmethod
+    def from_row(cls, row: tuple) -> "Giveaway":
+        """
+        Create a giveaway from a row of the giveaways table without validating it.
+        The schema already guarantees the types, so this is only for trusted database reads.
+        Args:
+            row (tuple): (message_id, channel_id, guild_id, host_id, prize, winner_count, role_id, ends_at, ended, created_at)
+        Returns:
+            Giveaway: The giveaway.
+        """
+        giveaway = object.__new__(cls)
+        (giveaway.message_id, giveaway.channel_id, giveaway.guild_id, giveaway.host_id, giveaway.prize,
+         giveaway.winner_count, giveaway.role_id, giveaway.ends_at, giveaway.ended, giveaway.created_at) = row
+        return giveaway
+
 
 class GiveawayManager:
     def __init__(self, connection):
@@ -70,7 +92,8 @@ class GiveawayManager:
         self.cursor = connection.cursor()
 
     def create(self, message_id: int, channel_id: int, guild_id: int, host_id: int,
-               prize: str, winner_count: int, role_id: int | None, ends_at: datetime.datetime) -> int:
+               prize: str, winner_count: int, role_id: int | None, ends_at: datetime.datetime,
+               bonus_roles: dict[int, float] | None = None) -> int:
         """
         Create a new giveaway record in the database.
         Args:
@@ -82,6 +105,7 @@ class GiveawayManager:
             winner_count (int): Number of winners to select.
             role_id (int | None): Discord role ID to assign to winners.
             ends_at (datetime.datetime): When the giveaway ends.
+            bonus_roles (dict[int, float] | None): Entry weight of the members of a role, by role ID.
         Returns:
             int: The message_id of the created giveaway.
         """
@@ -90,7 +114,10 @@ class GiveawayManager:
             (message_id, channel_id, guild_id, host_id,
              prize, winner_count, role_id, ends_at)
         )
-        self.connection.commit()
+        if bonus_roles:
+            self.cursor.executemany(
+                "INSERT INTO giveaway_bonus_roles (message_id, role_id, weight) VALUES (?, ?, ?)",
+                [(message_id, role, weight) for role, weight in bonus_roles.items()])
         logger.info(
             f"Giveaway {message_id} created for prize '{prize}' in channel {channel_id}.")
         return message_id
@@ -109,7 +136,7 @@ class GiveawayManager:
         )
         giveaway_data = self.cursor.fetchone()
         if giveaway_data:
-            return Giveaway(*giveaway_data)
+            return Giveaway.from_row(giveaway_data)
         else:
             return None
 
@@ -138,12 +165,24 @@ class GiveawayManager:
 
         query = f"UPDATE giveaways SET {', '.join(set_clauses)} WHERE message_id = ?"
         self.cursor.execute(query, values)
-        self.connection.commit()
 
         # Log the update
         field_updates = ", ".join([f"{k}={v}" for k, v in fields.items()])
         logger.info(f"Giveaway {message_id} updated: {field_updates}")
 
+    def claim(self, message_id: int) -> bool:
+        """
+        Mark a giveaway as ended, unless it already is.
+        Used to make sure each giveaway is finalized only once.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+        Returns:
+            bool: True if this call ended the giveaway, False if it was already ended.
+        """
+        self.cursor.execute(
+            "UPDATE giveaways SET ended = TRUE WHERE message_id = ? AND ended = FALSE", (message_id,))
+        return self.cursor.rowcount == 1
+
     def get_active(self, current_time: datetime.datetime) -> list[Giveaway]:
         """
         Get all giveaways that have ended but haven't been processed yet.
@@ -159,4 +198,112 @@ class GiveawayManager:
         """
         self.cursor.execute(query, (current_time,))
         giveaways_data = self.cursor.fetchall()
-        return [Giveaway(*giveaway_data) for giveaway_data in giveaways_data]
+        return [Giveaway.from_row(giveaway_data) for giveaway_data in giveaways_data]
+
+    def add_entries(self, entries: list[tuple[int, int, float]]):
+        """
+        Enter users into giveaways. The weight of users that already entered is updated.
+        Args:
+            entries (list[tuple[int, int, float]]): (message_id, user_id, weight) of the entries.
+        """
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO giveaway_entries (message_id, user_id, weight) VALUES (?, ?, ?)", entries)
+
+    def remove_entries(self, entries: list[tuple[int, int]]):
+        """
+        Remove users from giveaways.
+        Args:
+            entries (list[tuple[int, int]]): (message_id, user_id) of the entries.
+        """
+        self.cursor.executemany(
+            "DELETE FROM giveaway_entries WHERE message_id = ? AND user_id = ?", entries)
+
+    def replace_entries(self, message_id: int, entries: list[tuple[int, float]]):
+        """
+        Replace all entries of a giveaway.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+            entries (list[tuple[int, float]]): (user_id, weight) of the users who entered.
+        """
+        self.cursor.execute(
+            "DELETE FROM giveaway_entries WHERE message_id = ?", (message_id,))
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO giveaway_entries (message_id, user_id, weight) VALUES (?, ?, ?)",
+            [(message_id, user_id, weight) for user_id, weight in entries])
+        logger.info(
+            f"Giveaway {message_id} entries replaced with {len(entries)} users.")
+
+    def get_weighted_entries(self, message_id: int, consume: Callable[[Iterator[tuple[int, float]]], T]) -> T:
+        """
+        Stream the entries of a giveaway to `consume`, ordered by user ID.
+        The rows are read one by one while `consume` iterates them, so they are never all in memory.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+            consume (Callable[[Iterator[tuple[int, float]]], T]): Receives the (user_id, weight) of the entries.
+        Returns:
+            T: The result of `consume`.
+        """
+        # A cursor of its own, since `consume` runs while the rows are fetched
+        cursor = self.connection.execute(
+            "SELECT user_id, weight FROM giveaway_entries WHERE message_id = ? ORDER BY user_id", (message_id,))
+        try:
+            return consume(cursor)
+        finally:
+            cursor.close()
+
+    def get_bonus_roles(self, message_id: int) -> dict[int, float]:
+        """
+        Get the bonus roles of a giveaway.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+        Returns:
+            dict[int, float]: Entry weight of the members of a role, by role ID.
+        """
+        self.cursor.execute(
+            "SELECT role_id, weight FROM giveaway_bonus_roles WHERE message_id = ?", (message_id,))
+        return dict(self.cursor.fetchall())
+
+    def add_draw(self, message_id: int, seed: int, winner_count: int, winners: list[int]) -> int:
+        """
+        Record a draw of a giveaway.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+            seed (int): Seed the winners were drawn with.
+            winner_count (int): Number of winners that were requested.
+            winners (list[int]): IDs of the winners in the order they were drawn.
+        Returns:
+            int: Number of the draw, 0 for the first draw of the giveaway.
+        """
+        self.cursor.execute(
+            "SELECT COALESCE(MAX(draw) + 1, 0) FROM giveaway_draws WHERE message_id = ?", (message_id,))
+        draw = self.cursor.fetchone()[0]
+        self.cursor.execute(
+            "INSERT INTO giveaway_draws (message_id, draw, seed, winner_count, winners) VALUES (?, ?, ?, ?, ?)",
+            (message_id, draw, seed, winner_count, ",".join(map(str, winners))))
+        logger.info(
+            f"Giveaway {message_id} draw {draw} recorded with seed {seed}: {winners}")
+        return draw
+
+    def get_draws(self, message_id: int) -> list[tuple[int, int, int, list[int]]]:
+        """
+        Get the recorded draws of a giveaway.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+        Returns:
+            list[tuple[int, int, int, list[int]]]: (draw, seed, winner_count, winners) of the draws, oldest first.
+        """
+        self.cursor.execute(
+            "SELECT draw, seed, winner_count, winners FROM giveaway_draws WHERE message_id = ? ORDER BY draw",
+            (message_id,))
+        return [(draw, seed, winner_count, [int(user_id) for user_id in winners.split(",") if user_id])
+                for draw, seed, winner_count, winners in self.cursor.fetchall()]
+
+    def get_end_deadlines(self) -> list[tuple[int, datetime.datetime]]:
+        """
+        Get the end time of all giveaways that haven't been processed yet.
+        Returns:
+            list[tuple[int, datetime.datetime]]: (message_id, ends_at) of the giveaways.
+        """
+        self.cursor.execute(
+            "SELECT message_id, ends_at FROM giveaways WHERE ended = FALSE")
+        return self.cursor.fetchall()
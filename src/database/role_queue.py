@@ -0,0 +1,71 @@
+import datetime
+from src.utils import logger
+
+
+class RoleQueueManager:
+    def __init__(self, connection):
+        """
+        Initialize the RoleQueueManager with a database connection.
+        Args:
+            connection: SQLite database connection object.
+        """
+        self.connection = connection
+        self.cursor = connection.cursor()
+
+    def push(self, guild_id: int, user_id: int, role_id: int, add: bool, reason: str | None,
+             attempts: int, next_attempt_at: datetime.datetime):
+        """
+        Queue a role change for a later retry, replacing a queued change of the same member and role.
+        Args:
+            guild_id (int): Guild ID of the role.
+            user_id (int): Discord user ID of the member.
+            role_id (int): Discord role ID.
+            add (bool): True to add the role, False to remove it.
+            reason (str | None): Reason shown in the audit log.
+            attempts (int): Number of failed attempts so far.
+            next_attempt_at (datetime.datetime): When to try again.
+        """
+        self.cursor.execute(
+            "INSERT OR REPLACE INTO role_queue (guild_id, user_id, role_id, add_role, reason, attempts, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (guild_id, user_id, role_id, add, reason, attempts, next_attempt_at)
+        )
+        logger.info(
+            f"Role change of role {role_id} for user {user_id} in guild {guild_id} queued until {next_attempt_at} (attempt {attempts}).")
+
+    def remove(self, guild_id: int, user_id: int, role_id: int):
+        """
+        Remove a role change from the queue.
+        Args:
+            guild_id (int): Guild ID of the role.
+            user_id (int): Discord user ID of the member.
+            role_id (int): Discord role ID.
+        """
+        self.cursor.execute(
+            "DELETE FROM role_queue WHERE guild_id = ? AND user_id = ? AND role_id = ?",
+            (guild_id, user_id, role_id)
+        )
+
+    def get_due(self, current_time: datetime.datetime) -> list[tuple[int, int, int, bool, str | None, int]]:
+        """
+        Get all queued role changes that are due.
+        Args:
+            current_time (datetime.datetime): The current time to compare against.
+        Returns:
+            list[tuple[int, int, int, bool, str | None, int]]: (guild_id, user_id, role_id, add, reason, attempts) of the changes.
+        """
+        self.cursor.execute(
+            "SELECT guild_id, user_id, role_id, add_role, reason, attempts FROM role_queue WHERE next_attempt_at <= ?",
+            (current_time,)
+        )
+        return self.cursor.fetchall()
+
+    def get_retry_deadlines(self) -> list[tuple[tuple[int, int, int], datetime.datetime]]:
+        """
+        Get the next attempt of all queued role changes.
+        Returns:
+            list[tuple[tuple[int, int, int], datetime.datetime]]: ((guild_id, user_id, role_id), next_attempt_at) of the changes.
+        """
+        self.cursor.execute(
+            "SELECT guild_id, user_id, role_id, next_attempt_at FROM role_queue")
+        return [((guild_id, user_id, role_id), next_attempt_at)
+                for guild_id, user_id, role_id, next_attempt_at in self.cursor.fetchall()]
@@ -1,17 +1,23 @@
 import datetime
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
 from .other import DatabaseError
 from src.utils import logger
 
 
 class Ticket:
     """
-    Represents a support ticket with validation for all fields.
+    Represents a support ticket.
+    The constructor validates all fields; rows read from the database are created with `from_row` instead.
 
     Args:
-        channel_id (str): The Discord channel ID for the ticket (must be a valid integer string).
+        channel_id (int): The Discord channel ID for the ticket.
+        guild_id (int | None): The Discord guild ID of the ticket, or None for tickets created before it was recorded.
         category_id (int | None): The ticket category ID, or None for tickets without categories.
-        user_id (str): The Discord user ID who created the ticket (must be a valid integer string).
-        assignee_id (str | None): The Discord user ID of the assigned moderator, or None if unassigned.
+        user_id (int): The Discord user ID who created the ticket.
+        assignee_id (int | None): The Discord user ID of the assigned moderator, or None if unassigned.
         archived (bool): Whether the ticket is archived/closed.
         created_at (datetime.datetime): When the ticket was created.
         close_at (datetime.datetime | None): When the ticket is scheduled to close, or None if not scheduled.
@@ -20,18 +26,20 @@ class Ticket:
         DatabaseError: If any field has an invalid format.
     """
 
-    def __init__(self, channel_id: str, category_id: int | None, user_id: str, assignee_id: str | None, archived: bool, created_at: datetime.datetime, close_at: datetime.datetime | None):
-        def is_string_digit(s: str) -> bool:
-            """Check if a string is a digit."""
-            return isinstance(s, str) and s.isdigit()
+    __slots__ = ("channel_id", "guild_id", "category_id", "user_id", "assignee_id",
+                 "archived", "created_at", "close_at")
 
-        if not is_string_digit(channel_id):
+    def __init__(self, channel_id: int, guild_id: int | None, category_id: int | None, user_id: int, assignee_id: int | None,
+                 archived: bool, created_at: datetime.datetime, close_at: datetime.datetime | None):
+        if not isinstance(channel_id, int):
             raise DatabaseError(f"Invalid channel_id: {channel_id}")
+        if guild_id is not None and not isinstance(guild_id, int):
+            raise DatabaseError(f"Invalid guild_id: {guild_id}")
         if category_id is not None and not isinstance(category_id, int):
             raise DatabaseError(f"Invalid category_id: {category_id}")
-        if not is_string_digit(user_id):
+        if not isinstance(user_id, int):
             raise DatabaseError(f"Invalid user_id: {user_id}")
-        if not is_string_digit(assignee_id) and assignee_id is not None:
+        if assignee_id is not None and not isinstance(assignee_id, int):
             raise DatabaseError(f"Invalid assignee_id: {assignee_id}")
         if not isinstance(archived, bool):
             raise DatabaseError(f"Invalid archived status: {archived}")
@@ -40,6 +48,7 @@ class Ticket:
         if not (isinstance(close_at, datetime.datetime) or close_at is None):
             raise DatabaseError(f"Invalid close_at: {close_at}")
         self.channel_id = channel_id
+        self.guild_id = guild_id
         self.category_id = category_id
         self.user_id = user_id
         self.assignee_id = assignee_id
@@ -47,61 +56,228 @@ class Ticket:
         self.created_at = created_at
         self.close_at = close_at
 
+    @classmethod
+    def from_row(cls, row: tuple) -> "Ticket":
+        """
+        Create a ticket from a row of the tickets table without validating it.
+        The schema already guarantees the types, so this is only for trusted database reads.
+        Args:
+            row (tuple): (channel_id, guild_id, category_id, user_id, assignee_id, archived, created_at, close_at)
+        Returns:
+            Ticket: The ticket.
+        """
+        ticket = object.__new__(cls)
+        (ticket.channel_id, ticket.guild_id, ticket.category_id, ticket.user_id, ticket.assignee_id,
+         ticket.archived, ticket.created_at, ticket.close_at) = row
+        return ticket
+
+
+class TicketCache:
+    """
+    Bounded LRU cache of open tickets keyed by channel id, shared by all TicketManager instances.
+    Archived tickets are never cached. Entries expire after `ttl` seconds,
+    so changes made outside of the TicketManager are picked up eventually.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Args:
+            max_size (int): Maximum number of cached tickets. 0 disables the cache.
+            ttl (float): Seconds after which an entry expires.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # channel_id -> (ticket, expiry time)
+        self._entries: OrderedDict[int, tuple[Ticket, float]] = OrderedDict()
+        # Number of loads in flight by channel_id
+        self._loads: dict[int, int] = {}
+        # Bumped on every write to a ticket while it is being loaded, so that a ticket loaded
+        # concurrently with a write is not stored. Dropped once no load of the ticket is in flight.
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, channel_id: int) -> tuple[Ticket | None, int]:
+        """
+        Look up a cached ticket.
+        Args:
+            channel_id (int): Discord channel ID of the ticket.
+        Returns:
+            tuple[Ticket | None, int]: The ticket, or None if it isn't cached,
+            and the generation to pass to `store` after loading it. `store` must be called after every miss.
+        """
+        with self._lock:
+            entry = self._entries.get(channel_id)
+            if entry is not None and entry[1] < time.monotonic():
+                del self._entries[channel_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                self._loads[channel_id] = self._loads.get(channel_id, 0) + 1
+                return None, self._generations.get(channel_id, 0)
+            self._entries.move_to_end(channel_id)
+            self.hits += 1
+            return entry[0], 0
+
+    def store(self, channel_id: int, ticket: Ticket | None, generation: int):
+        """
+        Finish a load started by a missed `lookup`.
+        The ticket is stored unless it is archived or was written to since `lookup`.
+        Args:
+            channel_id (int): Discord channel ID of the ticket.
+            ticket (Ticket | None): The loaded ticket, or None if it doesn't exist or the load failed.
+            generation (int): The generation returned by `lookup`.
+        """
+        with self._lock:
+            current = self._generations.get(channel_id, 0)
+            loads = self._loads.get(channel_id, 0) - 1
+            if loads > 0:
+                self._loads[channel_id] = loads
+            else:
+                self._loads.pop(channel_id, None)
+                self._generations.pop(channel_id, None)
+            if ticket is None or ticket.archived or self.max_size <= 0:
+                return
+            if current == generation:
+                self._put(ticket)
+
+    def update(self, channel_id: int, fields: dict):
+        """
+        Write committed field changes through to a cached ticket.
+        The ticket is evicted if it was archived.
+        Args:
+            channel_id (int): Discord channel ID of the ticket.
+            fields (dict): The updated fields and their new values.
+        """
+        with self._lock:
+            self._bump(channel_id)
+            entry = self._entries.pop(channel_id, None)
+            if entry is None:
+                return
+            old = entry[0]
+            values = {
+                "assignee_id": old.assignee_id,
+                "archived": old.archived,
+                "close_at": old.close_at,
+            }
+            values.update(fields)
+            if values["archived"]:
+                return
+            try:
+                ticket = Ticket(old.channel_id, old.guild_id, old.category_id, old.user_id, values["assignee_id"],
+                                bool(values["archived"]), old.created_at, values["close_at"])
+            except DatabaseError:
+                # Not what a reload would return, so load it again on the next lookup
+                return
+            self._put(ticket)
+
+    def invalidate(self, channel_id: int | None = None):
+        """
+        Drop a cached ticket, or all of them.
+        Args:
+            channel_id (int | None): Discord channel ID of the ticket, or None to drop everything.
+        """
+        with self._lock:
+            if channel_id is None:
+                for cid in self._loads:
+                    self._bump(cid)
+                self._entries.clear()
+            else:
+                self._bump(channel_id)
+                self._entries.pop(channel_id, None)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the cache counters.
+        Returns:
+            dict[str, int]: Number of hits, misses, evictions and cached tickets.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "size": len(self._entries)}
+
+    def _put(self, ticket: Ticket):
+        """Insert a ticket as most recently used and evict the least recently used ones. Lock must be held."""
+        self._entries[ticket.channel_id] = (ticket, time.monotonic() + self.ttl)
+        self._entries.move_to_end(ticket.channel_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _bump(self, channel_id: int):
+        """Advance the generation of a ticket if it is being loaded. Lock must be held."""
+        if channel_id in self._loads:
+            self._generations[channel_id] = self._generations.get(channel_id, 0) + 1
+
 
 class TicketManager:
 
-    def __init__(self, connection):
+    def __init__(self, connection, cache: TicketCache, after_commit: Callable[[Callable[[], None]], None]):
         """
         Initialize the TicketManager with a database connection.
         Args:
             connection: SQLite database connection object.
+            cache (TicketCache): The open ticket cache shared by all TicketManager instances.
+            after_commit (Callable): Schedules a callback to run once the current write is committed.
         """
         self.connection = connection
         self.cursor = connection.cursor()
+        self.cache = cache
+        self.after_commit = after_commit
 
-    def create(self, channel_id: str, category_id: int | None, user_id: str, assignee_id: str | None, archived: bool = False, close_at: datetime.datetime | None = None) -> str:
+    def create(self, channel_id: int, guild_id: int, category_id: int | None, user_id: int, assignee_id: int | None, archived: bool = False, close_at: datetime.datetime | None = None) -> int:
         """
         Create a new ticket record in the database.
         Args:
-            channel_id (str): Discord channel ID for the ticket.
+            channel_id (int): Discord channel ID for the ticket.
+            guild_id (int): Discord guild ID of the ticket.
             category_id (int | None): Ticket category ID, or None for tickets without categories.
-            user_id (str): ID of the user who created the ticket.
-            assignee_id (str | None): ID of the user assigned to the ticket.
+            user_id (int): ID of the user who created the ticket.
+            assignee_id (int | None): ID of the user assigned to the ticket.
             archived (bool): Whether the ticket is archived or not. Defaults to False.
             close_at (datetime.datetime | None): When the ticket should be closed. Defaults to None.
         Returns:
-            str: The channel_id of the created ticket.
+            int: The channel_id of the created ticket.
         """
         self.cursor.execute(
-            "INSERT INTO tickets (channel_id, category_id, user_id, assignee_id, archived, close_at) VALUES (?, ?, ?, ?, ?, ?)",
-            (channel_id, category_id, user_id, assignee_id, archived, close_at)
+            "INSERT INTO tickets (channel_id, guild_id, category_id, user_id, assignee_id, archived, close_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (channel_id, guild_id, category_id, user_id,
+             assignee_id, archived, close_at)
         )
-        self.connection.commit()
+        self.after_commit(lambda: self.cache.invalidate(channel_id))
         logger.info(
-            f"Ticket {channel_id} created with category_id {category_id}, user {user_id}, assignee {assignee_id}, archived status {archived}, and close_at {close_at}.")
+            f"Ticket {channel_id} created in guild {guild_id} with category_id {category_id}, user {user_id}, assignee {assignee_id}, archived status {archived}, and close_at {close_at}.")
         return channel_id
 
-    def get(self, channel_id: str) -> Ticket | None:
+    def get(self, channel_id: int) -> Ticket | None:
         """
         Retrieve a ticket by its channel_id.
+        Open tickets are served from the ticket cache when possible.
         Args:
-            channel_id (str): Discord channel ID for the ticket.
+            channel_id (int): Discord channel ID for the ticket.
         Returns:
             Ticket | None: Ticket data if found, else None.
         """
-        self.cursor.execute(
-            "SELECT channel_id, category_id, user_id, assignee_id, archived, created_at, close_at FROM tickets WHERE channel_id = ?", (channel_id,))
-        ticket_data = self.cursor.fetchone()
-        if ticket_data:
-            return Ticket(*ticket_data)
-        else:
-            return None
+        ticket, generation = self.cache.lookup(channel_id)
+        if ticket is not None:
+            return ticket
+        try:
+            self.cursor.execute(
+                "SELECT channel_id, guild_id, category_id, user_id, assignee_id, archived, created_at, close_at FROM tickets WHERE channel_id = ?", (channel_id,))
+            ticket_data = self.cursor.fetchone()
+            if ticket_data:
+                ticket = Ticket.from_row(ticket_data)
+        finally:
+            self.cache.store(channel_id, ticket, generation)
+        return ticket
 
-    def update(self, channel_id: str, **fields):
+    def update(self, channel_id: int, **fields):
         """
         Update one or more fields of a ticket.
         Args:
-            channel_id (str): Discord channel ID for the ticket.
+            channel_id (int): Discord channel ID for the ticket.
             **fields: Keyword arguments for fields to update.
                      Supported fields: assignee_id, archived, close_at
         """
@@ -121,32 +297,32 @@ class TicketManager:
 
         query = f"UPDATE tickets SET {', '.join(set_clauses)} WHERE channel_id = ?"
         self.cursor.execute(query, values)
-        self.connection.commit()
+        self.after_commit(lambda: self.cache.update(channel_id, fields))
 
         # Log the update
         field_updates = ", ".join([f"{k}={v}" for k, v in fields.items()])
         logger.info(f"Ticket {channel_id} updated: {field_updates}")
 
-    def delete(self, channel_id: str):
+    def delete(self, channel_id: int):
         """
         Delete a ticket by its channel_id.
         Args:
-            channel_id (str): Discord channel ID for the ticket.
+            channel_id (int): Discord channel ID for the ticket.
         """
         self.cursor.execute(
             "DELETE FROM tickets WHERE channel_id = ?", (channel_id,)
         )
-        self.connection.commit()
+        self.after_commit(lambda: self.cache.invalidate(channel_id))
         logger.info(f"Ticket {channel_id} deleted.")
 
-    def get_overdue(self, time: datetime.datetime) -> list[str]:
+    def get_overdue(self, time: datetime.datetime) -> list[int]:
         """
         Finds tickets where `close_at` is less than `now` and `archived` is `FALSE`,
         and returns their channel_ids.
         Args:
             time (datetime.datetime): The time to compare against ticket `close_at` times.
         Returns:
-            list[str]: A list of channel_ids for the overdue tickets.
+            list[int]: A list of channel_ids for the overdue tickets.
 
         """
         query = """
@@ -157,3 +333,13 @@ class TicketManager:
         self.cursor.execute(query, (time,))
         overdue_ticket_ids = [row[0] for row in self.cursor.fetchall()]
         return overdue_ticket_ids
+
+    def get_close_deadlines(self) -> list[tuple[int, datetime.datetime]]:
+        """
+        Get the `close_at` time of all open tickets that have one.
+        Returns:
+            list[tuple[int, datetime.datetime]]: (channel_id, close_at) of the tickets.
+        """
+        self.cursor.execute(
+            "SELECT channel_id, close_at FROM tickets WHERE archived = FALSE AND close_at IS NOT NULL")
+        return self.cursor.fetchall()
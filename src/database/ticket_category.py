@@ -3,7 +3,8 @@ Database manager for ticket categories.
 Handles CRUD operations for custom ticket categories, their permissions, and questions.
 """
 import datetime
-from typing import List, Dict, Optional, Tuple
+import threading
+from typing import Callable, List, Dict, Optional, Tuple
 from .other import DatabaseError
 from src.utils import logger
 
@@ -28,19 +29,213 @@ class TicketCategory:
         self.guild_id = guild_id
 
 
+class CategoryGraph:
+    """
+    All categories of a guild together with their role permissions and questions.
+
+    Args:
+        categories (List[TicketCategory]): The categories of the guild, ordered by name.
+        role_ids (Dict[int, List[int]]): Role IDs with permission, by category ID.
+        questions (Dict[int, List[Tuple[int, str]]]): (question_id, question_text) tuples ordered by ID, by category ID.
+    """
+
+    def __init__(self, categories: List[TicketCategory], role_ids: Dict[int, List[int]], questions: Dict[int, List[Tuple[int, str]]]):
+        self.categories = categories
+        self.by_id = {category.id: category for category in categories}
+        self.role_ids = role_ids
+        self.questions = questions
+
+    def user_can_use_category(self, category_id: int, user_role_ids: List[int]) -> bool:
+        """
+        Check if a user can use a category based on their roles.
+        A category without required roles can be used by anyone.
+        """
+        required_role_ids = self.role_ids.get(category_id)
+        if not required_role_ids:
+            return True
+        return any(role_id in required_role_ids for role_id in user_role_ids)
+
+
+class CategoryGraphCache:
+    """
+    Per-guild cache of category graphs, shared by all TicketCategoryManager instances.
+    Graphs are loaded lazily and dropped by every write to a category of the guild.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._graphs: dict[int, CategoryGraph] = {}
+        # Guild of every category seen in a loaded graph
+        self._category_guilds: dict[int, int] = {}
+        # Bumped on every write to a guild, so that a graph loaded
+        # concurrently with a write is not stored
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, guild_id: int) -> tuple[CategoryGraph | None, int]:
+        """
+        Look up the graph of a guild.
+        Args:
+            guild_id (int): Guild ID.
+        Returns:
+            tuple[CategoryGraph | None, int]: The graph, or None if it isn't loaded,
+            and the generation to pass to `store` after loading it.
+        """
+        with self._lock:
+            graph = self._graphs.get(guild_id)
+            if graph is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return graph, self._generations.get(guild_id, 0)
+
+    def guild_of(self, category_id: int) -> int | None:
+        """
+        Get the guild of a category, if it is known from a loaded graph.
+        Args:
+            category_id (int): The category ID.
+        Returns:
+            int | None: The guild ID, or None if it isn't known.
+        """
+        with self._lock:
+            return self._category_guilds.get(category_id)
+
+    def store(self, guild_id: int, graph: CategoryGraph, generation: int):
+        """
+        Store a freshly loaded graph, unless the guild was written to since `lookup`.
+        Args:
+            guild_id (int): Guild ID.
+            graph (CategoryGraph): The loaded graph.
+            generation (int): The generation returned by `lookup`.
+        """
+        with self._lock:
+            for category_id in graph.by_id:
+                self._category_guilds[category_id] = guild_id
+            if self._generations.get(guild_id, 0) == generation:
+                self._graphs[guild_id] = graph
+
+    def invalidate(self, guild_id: int | None = None):
+        """
+        Drop the graph of a guild, or of all guilds.
+        Args:
+            guild_id (int | None): Guild ID, or None to drop everything.
+        """
+        with self._lock:
+            if guild_id is None:
+                for g in self._graphs:
+                    self._generations[g] = self._generations.get(g, 0) + 1
+                self._graphs.clear()
+            else:
+                self._generations[guild_id] = self._generations.get(
+                    guild_id, 0) + 1
+                self._graphs.pop(guild_id, None)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the cache counters.
+        Returns:
+            dict[str, int]: Number of hits, misses and loaded guilds.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "guilds": len(self._graphs)}
+
+
 class TicketCategoryManager:
     """
     Manages ticket categories in the database.
+    Reads are served from the per-guild category graph, which is loaded with a fixed number of queries.
     """
 
-    def __init__(self, connection):
+    def __init__(self, connection, cache: CategoryGraphCache, after_commit: Callable[[Callable[[], None]], None]):
         """
         Initialize the TicketCategoryManager with a database connection.
         Args:
             connection: SQLite database connection object.
+            cache (CategoryGraphCache): The category graph cache shared by all TicketCategoryManager instances.
+            after_commit (Callable): Schedules a callback to run once the current write is committed.
         """
         self.connection = connection
         self.cursor = connection.cursor()
+        self.cache = cache
+        self.after_commit = after_commit
+
+    def get_category_graph(self, guild_id: int) -> CategoryGraph:
+        """
+        Get all categories of a guild with their role permissions and questions.
+        The graph is loaded with three queries and cached until a category of the guild changes.
+
+        Args:
+            guild_id (int): The Discord guild ID.
+
+        Returns:
+            CategoryGraph: The category graph of the guild.
+        """
+        graph, generation = self.cache.lookup(guild_id)
+        if graph is not None:
+            return graph
+
+        self.cursor.execute(
+            "SELECT id, name, emoji, description, guild_id FROM ticket_categories WHERE guild_id = ? ORDER BY name",
+            (guild_id,)
+        )
+        categories = [TicketCategory(*row) for row in self.cursor.fetchall()]
+
+        role_ids: Dict[int, List[int]] = {}
+        self.cursor.execute(
+            """SELECT r.category_id, r.role_id FROM ticket_category_roles r
+            JOIN ticket_categories c ON c.id = r.category_id WHERE c.guild_id = ?""",
+            (guild_id,)
+        )
+        for category_id, role_id in self.cursor.fetchall():
+            role_ids.setdefault(category_id, []).append(role_id)
+
+        questions: Dict[int, List[Tuple[int, str]]] = {}
+        self.cursor.execute(
+            """SELECT q.category_id, q.id, q.question FROM ticket_category_questions q
+            JOIN ticket_categories c ON c.id = q.category_id WHERE c.guild_id = ? ORDER BY q.id""",
+            (guild_id,)
+        )
+        for category_id, question_id, question in self.cursor.fetchall():
+            questions.setdefault(category_id, []).append(
+                (question_id, question))
+
+        graph = CategoryGraph(categories, role_ids, questions)
+        self.cache.store(guild_id, graph, generation)
+        return graph
+
+    def get_category_graph_of(self, category_id: int) -> Optional[CategoryGraph]:
+        """
+        Get the category graph of the guild a category belongs to.
+        Costs no query if the graph is cached and the category was seen before.
+
+        Args:
+            category_id (int): The category ID.
+
+        Returns:
+            Optional[CategoryGraph]: The graph, or None if the category doesn't exist.
+        """
+        guild_id = self.cache.guild_of(category_id)
+        if guild_id is None:
+            guild_id = self._query_guild_of(category_id)
+            if guild_id is None:
+                return None
+        return self.get_category_graph(guild_id)
+
+    def _query_guild_of(self, category_id: int) -> Optional[int]:
+        """Get the guild ID of a category from the database."""
+        self.cursor.execute(
+            "SELECT guild_id FROM ticket_categories WHERE id = ?", (category_id,))
+        result = self.cursor.fetchone()
+        return result[0] if result else None
+
+    def _invalidate_category(self, category_id: int):
+        """Drop the cached graph of the guild of a category once the current write is committed."""
+        guild_id = self._query_guild_of(category_id)
+        if guild_id is None:
+            guild_id = self.cache.guild_of(category_id)
+        if guild_id is not None:
+            self.after_commit(lambda: self.cache.invalidate(guild_id))
 
     def create_category(self, name: str, emoji: str, description: str, guild_id: int) -> int:
         """
@@ -59,8 +254,8 @@ class TicketCategoryManager:
             "INSERT INTO ticket_categories (name, emoji, description, guild_id) VALUES (?, ?, ?, ?)",
             (name, emoji, description, guild_id)
         )
-        self.connection.commit()
         category_id = self.cursor.lastrowid
+        self.after_commit(lambda: self.cache.invalidate(guild_id))
 
         logger.info(
             f"Ticket category '{name}' created with ID {category_id} for guild {guild_id}")
@@ -76,14 +271,10 @@ class TicketCategoryManager:
         Returns:
             TicketCategory: The category data if found, else None.
         """
-        self.cursor.execute(
-            "SELECT id, name, emoji, description, guild_id FROM ticket_categories WHERE id = ?",
-            (category_id,)
-        )
-        result = self.cursor.fetchone()
-        if result:
-            return TicketCategory(*result)
-        return None
+        graph = self.get_category_graph_of(category_id)
+        if graph is None:
+            return None
+        return graph.by_id.get(category_id)
 
     def get_categories_for_guild(self, guild_id: int) -> List[TicketCategory]:
         """
@@ -95,12 +286,7 @@ class TicketCategoryManager:
         Returns:
             List[TicketCategory]: List of categories for the guild.
         """
-        self.cursor.execute(
-            "SELECT id, name, emoji, description, guild_id FROM ticket_categories WHERE guild_id = ? ORDER BY name",
-            (guild_id,)
-        )
-        results = self.cursor.fetchall()
-        return [TicketCategory(*result) for result in results]
+        return list(self.get_category_graph(guild_id).categories)
 
     def update_category(self, category_id: int, **fields):
         """
@@ -129,7 +315,7 @@ class TicketCategoryManager:
 
         query = f"UPDATE ticket_categories SET {', '.join(set_clauses)} WHERE id = ?"
         self.cursor.execute(query, values)
-        self.connection.commit()
+        self._invalidate_category(category_id)
 
         field_updates = ", ".join([f"{k}={v}" for k, v in fields.items()])
         logger.info(f"Ticket category {category_id} updated: {field_updates}")
@@ -145,13 +331,14 @@ class TicketCategoryManager:
             bool: True if the category was deleted, False if it didn't exist.
         """
         # Check if category exists
-        if not self.get_category(category_id):
+        guild_id = self._query_guild_of(category_id)
+        if guild_id is None:
             return False
 
         # Delete the category (CASCADE will handle roles and questions)
         self.cursor.execute(
             "DELETE FROM ticket_categories WHERE id = ?", (category_id,))
-        self.connection.commit()
+        self.after_commit(lambda: self.cache.invalidate(guild_id))
 
         logger.info(f"Ticket category {category_id} deleted")
         return True
@@ -176,7 +363,7 @@ class TicketCategoryManager:
             "INSERT INTO ticket_category_roles (category_id, role_id) VALUES (?, ?)",
             (category_id, role_id)
         )
-        self.connection.commit()
+        self._invalidate_category(category_id)
 
         logger.info(f"Role {role_id} added to category {category_id}")
 
@@ -192,7 +379,7 @@ class TicketCategoryManager:
             "DELETE FROM ticket_category_roles WHERE category_id = ? AND role_id = ?",
             (category_id, role_id)
         )
-        self.connection.commit()
+        self._invalidate_category(category_id)
 
         logger.info(f"Role {role_id} removed from category {category_id}")
 
@@ -206,11 +393,10 @@ class TicketCategoryManager:
         Returns:
             List[int]: List of role IDs.
         """
-        self.cursor.execute(
-            "SELECT role_id FROM ticket_category_roles WHERE category_id = ?",
-            (category_id,)
-        )
-        return [row[0] for row in self.cursor.fetchall()]
+        graph = self.get_category_graph_of(category_id)
+        if graph is None:
+            return []
+        return list(graph.role_ids.get(category_id, []))
 
     def set_category_roles(self, category_id: int, role_ids: List[int]):
         """
@@ -227,13 +413,12 @@ class TicketCategoryManager:
         )
 
         # Add new permissions
-        for role_id in role_ids:
-            self.cursor.execute(
-                "INSERT INTO ticket_category_roles (category_id, role_id) VALUES (?, ?)",
-                (category_id, role_id)
-            )
+        self.cursor.executemany(
+            "INSERT INTO ticket_category_roles (category_id, role_id) VALUES (?, ?)",
+            [(category_id, role_id) for role_id in role_ids]
+        )
+        self._invalidate_category(category_id)
 
-        self.connection.commit()
         logger.info(
             f"Category {category_id} role permissions set to: {role_ids}")
 
@@ -252,8 +437,8 @@ class TicketCategoryManager:
             "INSERT INTO ticket_category_questions (category_id, question) VALUES (?, ?)",
             (category_id, question)
         )
-        self.connection.commit()
         question_id = self.cursor.lastrowid
+        self._invalidate_category(category_id)
 
         logger.info(f"Question added to category {category_id}: {question}")
         return question_id
@@ -265,11 +450,17 @@ class TicketCategoryManager:
         Args:
             question_id (int): The question ID.
         """
+        self.cursor.execute(
+            "SELECT category_id FROM ticket_category_questions WHERE id = ?",
+            (question_id,)
+        )
+        result = self.cursor.fetchone()
         self.cursor.execute(
             "DELETE FROM ticket_category_questions WHERE id = ?",
             (question_id,)
         )
-        self.connection.commit()
+        if result:
+            self._invalidate_category(result[0])
 
         logger.info(f"Question {question_id} removed")
 
@@ -283,11 +474,10 @@ class TicketCategoryManager:
         Returns:
             List[Tuple[int, str]]: List of (question_id, question_text) tuples.
         """
-        self.cursor.execute(
-            "SELECT id, question FROM ticket_category_questions WHERE category_id = ? ORDER BY id",
-            (category_id,)
-        )
-        return self.cursor.fetchall()
+        graph = self.get_category_graph_of(category_id)
+        if graph is None:
+            return []
+        return list(graph.questions.get(category_id, []))
 
     def set_questions(self, category_id: int, questions: List[str]):
         """
@@ -304,13 +494,12 @@ class TicketCategoryManager:
         )
 
         # Add new questions
-        for question in questions:
-            self.cursor.execute(
-                "INSERT INTO ticket_category_questions (category_id, question) VALUES (?, ?)",
-                (category_id, question)
-            )
+        self.cursor.executemany(
+            "INSERT INTO ticket_category_questions (category_id, question) VALUES (?, ?)",
+            [(category_id, question) for question in questions]
+        )
+        self._invalidate_category(category_id)
 
-        self.connection.commit()
         logger.info(f"Category {category_id} questions updated")
 
     def user_can_use_category(self, category_id: int, user_role_ids: List[int]) -> bool:
@@ -324,15 +513,10 @@ class TicketCategoryManager:
         Returns:
             bool: True if the user can use the category, False otherwise.
         """
-        # Get required role IDs for this category
-        required_role_ids = self.get_role_permissions(category_id)
-
-        # If no roles are required, anyone can use it
-        if not required_role_ids:
+        graph = self.get_category_graph_of(category_id)
+        if graph is None:
             return True
-
-        # Check if user has any of the required roles
-        return any(role_id in required_role_ids for role_id in user_role_ids)
+        return graph.user_can_use_category(category_id, user_role_ids)
 
     def get_categories_for_user(self, guild_id: int, user_role_ids: List[int]) -> List[TicketCategory]:
         """
@@ -345,10 +529,10 @@ class TicketCategoryManager:
         Returns:
             List[TicketCategory]: List of categories the user can access.
         """
-        all_categories = self.get_categories_for_guild(guild_id)
+        graph = self.get_category_graph(guild_id)
         return [
-            category for category in all_categories
-            if self.user_can_use_category(category.id, user_role_ids)
+            category for category in graph.categories
+            if graph.user_can_use_category(category.id, user_role_ids)
         ]
 
     def get_ticket_count(self, category_id: int) -> int:
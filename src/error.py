@@ -1,7 +1,11 @@
 from typing import Type
 from src.res import R
+import sys
 import traceback
 
+# Max number of frames of the creating stack an error keeps
+STACK_LIMIT = 32
+
 
 class Error:
     """Base class for errors."""
@@ -12,7 +16,35 @@ class Error:
         self.message = message
         self.title = title
         self.show_traceback = show_traceback
-        self.stack = traceback.extract_stack()
+        # Only the locations of the creating frames are kept, not the frames, so their locals
+        # are freed when the creating call returns and the error is not part of a reference cycle.
+        self._locations: list[tuple[str, int, str]] = []
+        frame = sys._getframe(1)
+        while frame is not None and len(self._locations) < STACK_LIMIT:
+            code = frame.f_code
+            self._locations.append(
+                (code.co_filename, frame.f_lineno, code.co_name))
+            frame = frame.f_back
+        self._stack: traceback.StackSummary | None = None
+
+    @property
+    def frames(self) -> list[tuple[str, int, str]]:
+        """
+        (filename, line number, function name) of the frames the error was created in, innermost first.
+        At most `STACK_LIMIT` frames.
+        """
+        return self._locations
+
+    @property
+    def stack(self) -> traceback.StackSummary:
+        """
+        The stack at the time the error was created, oldest frame first.
+        Built from the frame locations on first access; source lines are read when it is formatted.
+        """
+        if self._stack is None:
+            self._stack = traceback.StackSummary.from_list(
+                [(filename, lineno, name, None) for filename, lineno, name in reversed(self._locations)])
+        return self._stack
 
     def iserr(self, error_type: Type['Error']) -> bool:
         """
@@ -0,0 +1,27 @@
+"""
+Scheduled database backups.
+"""
+from discord.ext import tasks
+from src.constants import C
+from src.database import db
+from src.error import We
+from src.utils import logger
+from src.custom_bot import CustomBot
+
+
+def setup_backup_task(bot: CustomBot):
+    """
+    Setup the background task that writes a database backup every `C.db_backup_interval` hours.
+    The backup runs on a separate thread, so it doesn't block the event loop.
+    Args:
+        bot (CustomBot): The Discord bot instance.
+    """
+    @tasks.loop(hours=C.db_backup_interval)
+    async def backup_database():
+        """Write a database snapshot and delete the oldest ones."""
+        try:
+            await db.backup.run_async()
+        except Exception as e:
+            logger.error(We(f"Error in database backup task: {e}"))
+
+    backup_database.start()
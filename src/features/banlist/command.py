@@ -11,11 +11,11 @@ from src.utils import handle_error, create_embed, logger, is_valid_url
 from src.features.shared.list_display import ListDisplayView, create_list_embeds
 
 
-def get_banlist_items(guild_id: int) -> list[tuple[str, str]]:
+async def get_banlist_items(guild_id: int) -> list[tuple[str, str]]:
     """
     Retrieves and formats the banlist for a given guild.
     """
-    bans = db.banlist.get_bans(guild_id)
+    bans = await db.banlist.get_bans(guild_id)
     items = []
     for name, reason, banned_by, length, image_url in bans:
         title = f"**{name}**"
@@ -30,7 +30,7 @@ async def update_banlist(interaction: discord.Interaction):
     """
     Callback to update the banlist message.
     """
-    items = get_banlist_items(interaction.guild.id)
+    items = await get_banlist_items(interaction.guild.id)
     embeds_or_err = create_list_embeds(
         R.banlist_embed_title, items, R.banlist_no_bans)
     if isinstance(embeds_or_err, Error):
@@ -62,7 +62,7 @@ def setup_banlist_command(bot: CustomBot):
         """
         Displays the banlist.
         """
-        items = get_banlist_items(ctx.guild.id)
+        items = await get_banlist_items(ctx.guild.id)
         embeds_or_err = create_list_embeds(
             R.banlist_embed_title, items, R.banlist_no_bans)
         if isinstance(embeds_or_err, Error):
@@ -123,7 +123,7 @@ def setup_banlist_command(bot: CustomBot):
         """
         Adds a user to the banlist.
         """
-        if db.banlist.is_banned(name, ctx.guild.id):
+        if await db.banlist.is_banned(name, ctx.guild.id):
             await handle_error(ctx.interaction, We(R.banlist_already_banned % name))
             return
 
@@ -132,7 +132,7 @@ def setup_banlist_command(bot: CustomBot):
             await handle_error(ctx.interaction, We(R.banlist_invalid_url))
             return
 
-        db.banlist.add_ban(name, ctx.guild.id, reason,
+        await db.banlist.add_ban(name, ctx.guild.id, reason,
                            banned_by, length, image_url)
         await ctx.respond(embed=create_embed(R.banlist_add_success % name, color=C.success_color), ephemeral=True)
         logger.info(f"Added {name} to banlist", ctx.interaction)
@@ -155,11 +155,11 @@ def setup_banlist_command(bot: CustomBot):
         """
         Removes a user from the banlist.
         """
-        if not db.banlist.is_banned(name, ctx.guild.id):
+        if not await db.banlist.is_banned(name, ctx.guild.id):
             await handle_error(ctx.interaction, We(R.banlist_not_banned % name))
             return
 
-        db.banlist.remove_ban(name, ctx.guild.id)
+        await db.banlist.remove_ban(name, ctx.guild.id)
         await ctx.respond(embed=create_embed(R.banlist_remove_success % name, color=C.success_color), ephemeral=True)
         logger.info(f"Removed {name} from banlist", ctx.interaction)
 
@@ -181,11 +181,11 @@ def setup_banlist_command(bot: CustomBot):
         """
         Shows the image of a banned user.
         """
-        if not db.banlist.is_banned(name, ctx.guild.id):
+        if not await db.banlist.is_banned(name, ctx.guild.id):
             await handle_error(ctx.interaction, We(R.banlist_not_banned % name))
             return
 
-        ban_data = db.banlist.get_ban(name, ctx.guild.id)
+        ban_data = await db.banlist.get_ban(name, ctx.guild.id)
         image_url = ban_data[4]
 
         if not image_url:
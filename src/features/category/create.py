@@ -44,7 +44,7 @@ class CategoryCreateModal(discord.ui.Modal):
 
     async def callback(self, interaction: discord.Interaction):
         """Handle the modal submission."""
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await interaction.response.defer()
 
 
@@ -57,7 +57,7 @@ async def handle_create_category(interaction: discord.Interaction) -> None:
     if not (modal.category_name and modal.category_emoji and modal.category_description):
         return  # User cancelled or incomplete data
 
-    category_id = db.tc.create_category(
+    category_id = await db.tc.create_category(
         name=modal.category_name.value,
         emoji=modal.category_emoji.value,
         description=modal.category_description.value,
@@ -52,7 +52,7 @@ class CategoryEditModal(discord.ui.Modal):
 
     async def callback(self, interaction: discord.Interaction):
         """Handle the modal submission."""
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await interaction.response.defer()
 
 
@@ -67,7 +67,7 @@ class CategoryEditSelectView(CategorySelectView):
     async def select_callback(self, interaction: discord.Interaction):
         await super().select_callback(interaction)
         category_id = int(interaction.data["values"][0])
-        category = db.tc.get_category(category_id)
+        category = await db.tc.get_category(category_id)
 
         if not category:
             await interaction.response.send_message(R.feature.category.edit.not_found, ephemeral=True)
@@ -98,7 +98,7 @@ class CategoryEditOptionsView(LateView):
         await modal.wait()
 
         if modal.category_name and modal.category_emoji and modal.category_description:
-            db.tc.update_category(
+            await db.tc.update_category(
                 self.category.id,
                 name=modal.category_name.value,
                 emoji=modal.category_emoji.value,
@@ -123,7 +123,7 @@ class CategoryEditOptionsView(LateView):
             title=R.feature.category.edit.roles.title
         )
 
-        role_ids = db.tc.get_role_permissions(self.category.id)
+        role_ids = await db.tc.get_role_permissions(self.category.id)
         if role_ids:
             roles = [interaction.guild.get_role(rid) for rid in role_ids]
             roles = [r for r in roles if r]  # Filter out None roles
@@ -153,7 +153,7 @@ class CategoryEditOptionsView(LateView):
             title=R.feature.category.edit.questions.title
         )
 
-        questions = db.tc.get_questions(self.category.id)
+        questions = await db.tc.get_questions(self.category.id)
         if questions:
             question_list = "\n".join(
                 [f"{i+1}. {q[1]}" for i, q in enumerate(questions)])
@@ -174,7 +174,7 @@ class CategoryEditOptionsView(LateView):
 
 async def handle_edit_categories(interaction: discord.Interaction) -> None:
     """Handle showing category edit selection."""
-    categories = db.tc.get_categories_for_guild(interaction.guild.id)
+    categories = await db.tc.get_categories_for_guild(interaction.guild.id)
 
     if not categories:
         embed = create_embed(
@@ -47,7 +47,7 @@ class CategoryQuestionsModal(discord.ui.Modal):
 
     async def callback(self, interaction: discord.Interaction):
         """Handle the modal submission."""
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         # Collect answers from all input fields
         for item in self.children:
             if isinstance(item, discord.ui.InputText) and item.custom_id.startswith("question_"):
@@ -110,20 +110,19 @@ class QuestionAddModal(discord.ui.Modal):
 
     async def callback(self, interaction: discord.Interaction):
         """Handle the modal submission."""
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await interaction.response.defer()
 
 
 class QuestionsReplaceModal(discord.ui.Modal):
     """Modal for replacing all questions for a category."""
 
-    def __init__(self, category):
+    def __init__(self, category, current_questions: list[tuple[int, str]]):
         super().__init__(
             title=R.feature.category.questions.replace_modal.title % category.name)
         self.category = category
 
-        # Get current questions to pre-fill
-        current_questions = db.tc.get_questions(category.id)
+        # Pre-fill with the current questions
         current_text = "\n".join(
             [q[1] for q in current_questions]) if current_questions else ""
 
@@ -140,7 +139,7 @@ class QuestionsReplaceModal(discord.ui.Modal):
 
     async def callback(self, interaction: discord.Interaction):
         """Handle the modal submission."""
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await interaction.response.defer()
 
 
@@ -158,7 +157,7 @@ class CategoryQuestionEditView(LateView):
         await modal.wait()
 
         if modal.question and modal.question.value.strip():
-            db.tc.add_question(self.category.id, modal.question.value)
+            await db.tc.add_question(self.category.id, modal.question.value)
 
             embed = create_embed(
                 R.feature.category.questions.edit_view.add_success_desc % (
@@ -170,7 +169,8 @@ class CategoryQuestionEditView(LateView):
 
     @late(lambda: button(label=R.category_questions_replace_all, style=discord.ButtonStyle.secondary, emoji="🔄"))
     async def replace_questions(self, button: discord.ui.Button, interaction: discord.Interaction):
-        modal = QuestionsReplaceModal(self.category)
+        current_questions = await db.tc.get_questions(self.category.id)
+        modal = QuestionsReplaceModal(self.category, current_questions)
         await interaction.response.send_modal(modal)
         await modal.wait()
 
@@ -181,7 +181,7 @@ class CategoryQuestionEditView(LateView):
                 question_list = [
                     q.strip() for q in modal.questions.value.split('\n') if q.strip()]
 
-            db.tc.set_questions(self.category.id, question_list)
+            await db.tc.set_questions(self.category.id, question_list)
 
             embed = create_embed(
                 R.feature.category.questions.edit_view.replace_success_desc % (
@@ -193,7 +193,7 @@ class CategoryQuestionEditView(LateView):
 
     @late(lambda: button(label=R.category_questions_delete_all, style=discord.ButtonStyle.danger, emoji="🗑️"))
     async def clear_questions(self, button: discord.ui.Button, interaction: discord.Interaction):
-        db.tc.set_questions(self.category.id, [])
+        await db.tc.set_questions(self.category.id, [])
 
         embed = create_embed(
             R.feature.category.questions.edit_view.clear_success_desc % self.category.name,
@@ -27,12 +27,18 @@ async def perform_category_removal(category, interaction: discord.Interaction) -
         bool: True if successful, False otherwise.
     """
     # Check if category can be removed
-    can_remove, reason = can_remove_category(category.id)
+    can_remove, reason = await can_remove_category(category.id)
 
     if not can_remove:
         await handle_error(interaction, We(reason))
+        return False
 
-    db.tc.delete_category(category.id)
+    # Remove the category together with its roles and questions
+    async with db.transaction() as tx:
+        tx.tc.set_questions(category.id, [])
+        tx.tc.set_category_roles(category.id, [])
+        tx.tc.delete_category(category.id)
+    return True
 
 
 class CategoryRemoveConfirmView(LateView):
@@ -47,7 +53,8 @@ class CategoryRemoveConfirmView(LateView):
         """Confirm category removal."""
 
         # Use the extracted removal function
-        await perform_category_removal(self.category, interaction)
+        if not await perform_category_removal(self.category, interaction):
+            return
 
         embed = create_embed(
             R.feature.category.remove.delete_success % self.category.name,
@@ -81,7 +88,7 @@ class CategoryRemoveSelectView(CategorySelectView):
         """Handle category selection for removal."""
         await super().select_callback(interaction)
         selected_category_id = int(self.children[0].values[0])
-        category = db.tc.get_category(selected_category_id)
+        category = await db.tc.get_category(selected_category_id)
 
         if not category:
             await handle_error(interaction, Ce(R.feature.category.remove.not_found))
@@ -104,7 +111,7 @@ class CategoryRemoveSelectView(CategorySelectView):
 
 async def handle_remove_category(interaction: discord.Interaction) -> None:
     """Handle showing category removal selection."""
-    categories = db.tc.get_categories_for_guild(interaction.guild.id)
+    categories = await db.tc.get_categories_for_guild(interaction.guild.id)
 
     if not categories:
         embed = create_embed(
@@ -124,7 +131,7 @@ async def handle_remove_category(interaction: discord.Interaction) -> None:
     await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 
-def can_remove_category(category_id: int) -> tuple[bool, str]:
+async def can_remove_category(category_id: int) -> tuple[bool, str]:
     """
     Check if a category can be removed.
 
@@ -135,12 +142,12 @@ def can_remove_category(category_id: int) -> tuple[bool, str]:
         tuple[bool, str]: (can_remove, reason_if_not)
     """
     # Check if category exists
-    category = db.tc.get_category(category_id)
+    category = await db.tc.get_category(category_id)
     if not category:
         return False, R.feature.category.remove.not_found
 
     # Check for active tickets
-    ticket_count = db.tc.get_ticket_count(category_id)
+    ticket_count = await db.tc.get_ticket_count(category_id)
     if ticket_count > 0:
         return False, R.feature.category.remove.still_active_tickets % ticket_count
 
@@ -32,7 +32,7 @@ class CategoryRoleEditView(LateView):
     @late(lambda: button(label=R.category_save, style=discord.ButtonStyle.success, emoji="💾"))
     async def save_roles(self, button: discord.ui.Button, interaction: discord.Interaction):
         role_ids = [role.id for role in self.selected_roles]
-        db.tc.set_category_roles(self.category.id, role_ids)
+        await db.tc.set_category_roles(self.category.id, role_ids)
 
         if role_ids:
             role_mentions = ", ".join(
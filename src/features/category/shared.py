@@ -10,7 +10,7 @@ from src.utils import create_embed
 from src.database import db
 
 
-def get_category_details(category_id: int) -> Optional[dict]:
+async def get_category_details(category_id: int) -> Optional[dict]:
     """
     Get detailed information about a category.
 
@@ -20,17 +20,14 @@ def get_category_details(category_id: int) -> Optional[dict]:
     Returns:
         Dict: Category details including roles and questions, or None if not found.
     """
-    category = db.tc.get_category(category_id)
-    if not category:
+    graph = await db.tc.get_category_graph_of(category_id)
+    if graph is None or category_id not in graph.by_id:
         return None
 
-    role_ids = db.tc.get_role_permissions(category_id)
-    questions = db.tc.get_questions(category_id)
-
     return {
-        'category': category,
-        'role_ids': role_ids,
-        'questions': questions
+        'category': graph.by_id[category_id],
+        'role_ids': list(graph.role_ids.get(category_id, [])),
+        'questions': list(graph.questions.get(category_id, []))
     }
 
 
@@ -123,4 +120,4 @@ class CategorySelectView(discord.ui.View):
 
     async def select_callback(self, interaction: discord.Interaction):
         """Override this method in subclasses."""
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
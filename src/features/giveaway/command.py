@@ -3,7 +3,7 @@ Giveaway slash command - separated from functionality.
 """
 import discord
 from src.res import R, RD, RL
-from src.features.giveaway.giveaway import create_giveaway, setup_giveaway_background_task
+from src.features.giveaway.giveaway import create_giveaway, handle_reroll_giveaway, setup_giveaway_background_task
 
 from src.custom_bot import CustomBot
 
@@ -59,12 +59,35 @@ def setup_giveaway_command(bot: CustomBot):
         default=None,
         type=discord.SlashCommandOptionType.role
     )
+    @discord.option(
+        parameter_name="bonusrolle",
+        name=RD.command.giveaway.option.bonus_role,
+        name_localizations=RL.command.giveaway.option.bonus_role,
+        description=RD.command.giveaway.option.bonus_role_desc,
+        description_localizations=RL.command.giveaway.option.bonus_role_desc,
+        required=False,
+        default=None,
+        type=discord.SlashCommandOptionType.role
+    )
+    @discord.option(
+        parameter_name="bonus",
+        name=RD.command.giveaway.option.bonus,
+        name_localizations=RL.command.giveaway.option.bonus,
+        description=RD.command.giveaway.option.bonus_desc,
+        description_localizations=RL.command.giveaway.option.bonus_desc,
+        required=False,
+        default=2,
+        min_value=2,
+        max_value=10
+    )
     async def giveaway_command(
         interaction: discord.Interaction,
         dauer: str,
         preis: str,
         gewinner: int = 1,
-        rolle: discord.Role = None
+        rolle: discord.Role = None,
+        bonusrolle: discord.Role = None,
+        bonus: int = 2
     ):
         """
         Start a giveaway with automatic winner selection.
@@ -74,8 +97,46 @@ def setup_giveaway_command(bot: CustomBot):
             preis (str): What is being given away.
             gewinner (int): Number of winners to select.
             rolle (discord.Role): Role to award to winners (optional).
+            bonusrolle (discord.Role): Role whose members have a higher chance to win (optional).
+            bonus (int): How many times higher the chance of the bonus role is.
+        """
+        await create_giveaway(interaction, dauer, preis, gewinner, rolle, bonusrolle, bonus)
+
+    @bot.slash_command(
+        name=RD.command.giveaway_reroll.name,
+        name_localizations=RL.command.giveaway_reroll.name,
+        description=RD.command.giveaway_reroll.desc,
+        description_localizations=RL.command.giveaway_reroll.desc,
+    )
+    @discord.default_permissions(administrator=True)
+    @discord.option(
+        parameter_name="nachricht",
+        name=RD.command.giveaway_reroll.option.message_id,
+        name_localizations=RL.command.giveaway_reroll.option.message_id,
+        description=RD.command.giveaway_reroll.option.message_id_desc,
+        description_localizations=RL.command.giveaway_reroll.option.message_id_desc,
+        required=True
+    )
+    @discord.option(
+        parameter_name="gewinner",
+        name=RD.command.giveaway_reroll.option.winner_count,
+        name_localizations=RL.command.giveaway_reroll.option.winner_count,
+        description=RD.command.giveaway_reroll.option.winner_count_desc,
+        description_localizations=RL.command.giveaway_reroll.option.winner_count_desc,
+        required=False,
+        default=1,
+        min_value=1,
+        max_value=20
+    )
+    async def giveaway_reroll_command(interaction: discord.Interaction, nachricht: str, gewinner: int = 1):
+        """
+        Draw new winners of an ended giveaway.
+        Args:
+            interaction (discord.Interaction): The interaction context.
+            nachricht (str): Discord message ID of the giveaway.
+            gewinner (int): Number of winners to draw.
         """
-        await create_giveaway(interaction, dauer, preis, gewinner, rolle)
+        await handle_reroll_giveaway(interaction, nachricht, gewinner)
 
     # Setup background task
     setup_giveaway_background_task(bot)
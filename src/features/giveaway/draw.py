@@ -0,0 +1,112 @@
+"""
+Winner selection of giveaways.
+Winners are drawn with weighted reservoir sampling while the entries are streamed from the database,
+so a draw only keeps the winners in memory, no matter how many users entered.
+Every draw is recorded with its seed, so it can be replayed and checked later.
+"""
+import heapq
+import math
+import random
+import secrets
+from typing import Iterable
+from src.database import db
+
+
+def _uniform(rng: random.Random) -> float:
+    """Draw a number from the open interval (0, 1), so its logarithm is defined and negative."""
+    while True:
+        u = rng.random()
+        if u:
+            return u
+
+
+def weighted_sample(entries: Iterable[tuple[int, float]], count: int, seed: int,
+                    exclude: set[int] = frozenset()) -> list[int]:
+    """
+    Draw users without replacement, each with a probability proportional to its weight.
+    Weighted reservoir sampling with exponential jumps (Efraimidis & Spirakis, A-ExpJ): every entry gets the
+    key u^(1/weight), the `count` largest keys win. Once the reservoir is full, only the entries that make it
+    into the reservoir need a random number, the others are skipped by subtracting their weight.
+    Keys are kept as log(u) / weight, which keeps their order and doesn't underflow for small weights.
+    The result only depends on the seed and the order of `entries`.
+    Args:
+        entries (Iterable[tuple[int, float]]): (user_id, weight) of the entries, in a stable order.
+        count (int): Number of users to draw.
+        seed (int): Seed of the random number generator.
+        exclude (set[int]): Users that can't be drawn, eg. the winners of earlier draws.
+    Returns:
+        list[int]: IDs of the drawn users, in the order they were drawn. Fewer than `count` if not enough users entered.
+    """
+    if count < 1:
+        return []
+    rng = random.Random(seed)
+    # Min-heap of (key, user_id), so the smallest key is the one to replace
+    reservoir: list[tuple[float, int]] = []
+    entries = iter(entries)
+
+    for user_id, weight in entries:
+        if weight <= 0 or user_id in exclude:
+            continue
+        heapq.heappush(reservoir, (math.log(_uniform(rng)) / weight, user_id))
+        if len(reservoir) == count:
+            break
+
+    if len(reservoir) == count:
+        threshold = reservoir[0][0]
+        skip = math.log(_uniform(rng)) / threshold
+        for user_id, weight in entries:
+            if weight <= 0 or user_id in exclude:
+                continue
+            skip -= weight
+            if skip > 0:
+                continue
+            # The key of the new entry is drawn from the range that beats the current threshold
+            low = math.exp(threshold * weight)
+            key = math.log(low + (1 - low) * _uniform(rng)) / weight
+            heapq.heapreplace(reservoir, (key, user_id))
+            threshold = reservoir[0][0]
+            skip = math.log(_uniform(rng)) / threshold
+
+    return [user_id for _, user_id in sorted(reservoir, reverse=True)]
+
+
+async def draw_winners(message_id: int, count: int) -> tuple[int, list[int]]:
+    """
+    Draw winners of a giveaway and record the draw.
+    Users who won an earlier draw of the giveaway can't win again, so this is also used to re-roll.
+    Args:
+        message_id (int): Discord message ID for the giveaway.
+        count (int): Number of winners to draw.
+    Returns:
+        tuple[int, list[int]]: Number of the draw (0 for the first one) and IDs of the winners.
+    """
+    draws = await db.giveaway.get_draws(message_id)
+    exclude = {user_id for _, _, _, winners in draws for user_id in winners}
+    seed = secrets.randbits(63)
+    winners = await db.giveaway.get_weighted_entries(
+        message_id, lambda entries: weighted_sample(entries, count, seed, exclude))
+    draw = await db.giveaway.add_draw(message_id, seed, count, winners)
+    return draw, winners
+
+
+async def replay_draw(message_id: int, draw: int) -> bool:
+    """
+    Check a recorded draw by drawing again with its seed.
+    Only meaningful once the giveaway has ended, since the entries can't change anymore.
+    Args:
+        message_id (int): Discord message ID for the giveaway.
+        draw (int): Number of the draw.
+    Returns:
+        bool: True if drawing again gives the recorded winners.
+    Raises:
+        ValueError: If the draw was not recorded.
+    """
+    draws = await db.giveaway.get_draws(message_id)
+    recorded = next((d for d in draws if d[0] == draw), None)
+    if recorded is None:
+        raise ValueError(f"Giveaway {message_id} has no draw {draw}")
+    _, seed, count, winners = recorded
+    exclude = {user_id for number, _, _, earlier in draws if number < draw for user_id in earlier}
+    replayed = await db.giveaway.get_weighted_entries(
+        message_id, lambda entries: weighted_sample(entries, count, seed, exclude))
+    return replayed == winners
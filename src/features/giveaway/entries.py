@@ -0,0 +1,228 @@
+"""
+Giveaway entries, recorded from reaction events while a giveaway runs.
+"""
+import asyncio
+from typing import Iterable
+import discord
+from src.constants import C
+from src.database import db
+from src.error import We
+from src.utils import logger
+from src.custom_bot import CustomBot
+
+
+def entry_weight(bonus_roles: dict[int, float], role_ids: Iterable[int]) -> float:
+    """
+    Get the weight a member enters a giveaway with.
+    Args:
+        bonus_roles (dict[int, float]): Entry weight of the members of a role, by role ID.
+        role_ids (Iterable[int]): IDs of the roles of the member.
+    Returns:
+        float: The weight of the member's best bonus role, or 1 without one.
+    """
+    return max((bonus_roles[role_id] for role_id in role_ids if role_id in bonus_roles), default=1)
+
+
+class GiveawayEntryRecorder:
+    """
+    Collects giveaway reactions and writes them to the database in batches.
+    Only the last event of a user on a giveaway within a batch is written.
+    """
+
+    def __init__(self, flush_interval: float, batch_size: int):
+        """
+        Args:
+            flush_interval (float): Seconds events are collected before they are written.
+            batch_size (int): Number of pending events after which they are written right away.
+        """
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        # Bonus roles of the running giveaways by message ID; reactions on other messages are ignored
+        self.running: dict[int, dict[int, float]] = {}
+        # Running giveaways whose entries may be missing reactions from while the bot was offline
+        self.unsynced: set[int] = set()
+        # Giveaways that ended while `reconcile` runs, so it doesn't track them again
+        self.ended: set[int] = set()
+        self._reconcile_lock = asyncio.Lock()
+        # Weight the user entered with, or None if the user left, by (message_id, user_id)
+        self._pending: dict[tuple[int, int], float | None] = {}
+        self._timer: asyncio.Task | None = None
+        # Set once `batch_size` events are pending, to write them before the interval is over
+        self._full = asyncio.Event()
+        # Held while events are written, so `flush` returns only after all earlier events are written
+        self._flush_lock = asyncio.Lock()
+        self._backfills: dict[int, asyncio.Task] = {}
+
+    def track(self, message_id: int, bonus_roles: dict[int, float]):
+        """
+        Start recording the reactions on a giveaway message. Reactions on untracked messages are ignored.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+            bonus_roles (dict[int, float]): Entry weight of the members of a role, by role ID.
+        """
+        self.running[message_id] = bonus_roles
+
+    def record(self, message_id: int, user_id: int, role_ids: Iterable[int] | None):
+        """
+        Record that a user entered or left a giveaway.
+        Args:
+            message_id (int): Discord message ID for the giveaway.
+            user_id (int): ID of the user.
+            role_ids (Iterable[int] | None): IDs of the roles of the user if the user reacted,
+                None if the reaction was removed.
+        """
+        bonus_roles = self.running.get(message_id)
+        if bonus_roles is None:
+            return
+        self._pending[(message_id, user_id)] = None if role_ids is None else entry_weight(bonus_roles, role_ids)
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+
+    async def _flush_later(self):
+        """Write the pending events after `flush_interval` seconds, or once `batch_size` events are pending."""
+        try:
+            await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._full.clear()
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Write all pending events in one transaction."""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            added = [(message_id, user_id, weight)
+                     for (message_id, user_id), weight in pending.items() if weight is not None]
+            removed = [entry for entry, weight in pending.items() if weight is None]
+            try:
+                async with db.transaction() as tx:
+                    if added:
+                        tx.giveaway.add_entries(added)
+                    if removed:
+                        tx.giveaway.remove_entries(removed)
+            except Exception as e:
+                logger.error(We(f"Error writing {len(pending)} giveaway entries: {e}"))
+
+    async def reconcile(self, bot: CustomBot):
+        """
+        Load the running giveaways that aren't tracked yet and backfill the entries of all running giveaways
+        from the reaction lists, since reactions added or removed while the bot was offline were missed.
+        Run on every `on_ready`: events missed in a resumed session are replayed, but not those missed before
+        a new session was identified.
+        Args:
+            bot (CustomBot): The bot instance.
+        """
+        async with self._reconcile_lock:
+            try:
+                # Write the events of the old session first, so they don't overwrite the backfilled entries
+                await self.flush()
+                deadlines = await db.giveaway.get_end_deadlines()
+                for message_id, _ in deadlines:
+                    if message_id in self.running:
+                        continue
+                    bonus_roles = await db.giveaway.get_bonus_roles(message_id)
+                    if message_id not in self.ended:
+                        self.track(message_id, bonus_roles)
+                message_ids = list(self.running)
+                self.unsynced.update(message_ids)
+                for message_id in message_ids:
+                    if message_id not in self.unsynced:
+                        # Already backfilled because the giveaway ended in the meantime
+                        continue
+                    giveaway = await db.giveaway.get(message_id)
+                    channel = bot.get_channel(giveaway.channel_id) if giveaway else None
+                    if channel is None:
+                        continue
+                    try:
+                        message = await channel.fetch_message(message_id)
+                    except discord.NotFound:
+                        continue
+                    bonus_roles = self.running.get(message_id)
+                    if bonus_roles is not None:
+                        await self.backfill(message, bonus_roles)
+                logger.info(f"Entries of {len(message_ids)} giveaways reconciled.")
+            finally:
+                self.ended.clear()
+
+    async def finish(self, message: discord.Message):
+        """
+        Stop recording a giveaway and make sure all of its entries are written.
+        Args:
+            message (discord.Message): The giveaway message.
+        """
+        if self._reconcile_lock.locked():
+            self.ended.add(message.id)
+        bonus_roles = self.running.pop(message.id, None)
+        if bonus_roles is None or message.id in self.unsynced:
+            # Not tracked since it was created, eg. it ended before `reconcile` got to it
+            await self.backfill(message, await db.giveaway.get_bonus_roles(message.id))
+        await self.flush()
+
+    async def backfill(self, message: discord.Message, bonus_roles: dict[int, float]):
+        """
+        Replace the entries of a giveaway with the users who reacted to its message.
+        If the giveaway is already being backfilled, waits for that instead.
+        Args:
+            message (discord.Message): The giveaway message.
+            bonus_roles (dict[int, float]): Entry weight of the members of a role, by role ID.
+        """
+        task = self._backfills.get(message.id)
+        if task is None:
+            task = asyncio.create_task(self._read_reactions(message, bonus_roles))
+            self._backfills[message.id] = task
+        await task
+
+    async def _read_reactions(self, message: discord.Message, bonus_roles: dict[int, float]):
+        """Write the users who reacted to a giveaway message as its entries."""
+        try:
+            entries = []
+            for reaction in message.reactions:
+                if str(reaction.emoji) == C.giveaway_reaction:
+                    async for user in reaction.users():
+                        if not user.bot:
+                            # Users who left the guild have no roles and enter without bonus
+                            role_ids = [role.id for role in getattr(user, "roles", ())]
+                            entries.append((user.id, entry_weight(bonus_roles, role_ids)))
+                    break
+            await db.giveaway.replace_entries(message.id, entries)
+            self.unsynced.discard(message.id)
+        finally:
+            del self._backfills[message.id]
+
+
+recorder = GiveawayEntryRecorder(
+    C.giveaway_entry_flush_interval, C.giveaway_entry_batch_size)
+
+
+def setup_giveaway_entries(bot: CustomBot):
+    """
+    Record giveaway entries from reaction events.
+    Args:
+        bot (CustomBot): The Discord bot instance.
+    """
+    @bot.listen("on_raw_reaction_add")
+    async def giveaway_reaction_add(payload: discord.RawReactionActionEvent):
+        if str(payload.emoji) != C.giveaway_reaction:
+            return
+        if payload.member is None or payload.member.bot:
+            return
+        recorder.record(payload.message_id, payload.user_id,
+                        [role.id for role in payload.member.roles])
+
+    @bot.listen("on_raw_reaction_remove")
+    async def giveaway_reaction_remove(payload: discord.RawReactionActionEvent):
+        if str(payload.emoji) != C.giveaway_reaction:
+            return
+        recorder.record(payload.message_id, payload.user_id, None)
+
+    @bot.listen("on_ready")
+    async def reconcile_giveaway_entries():
+        try:
+            await recorder.reconcile(bot)
+        except Exception as e:
+            logger.error(We(f"Error reconciling giveaway entries: {e}"))
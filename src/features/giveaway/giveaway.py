@@ -1,15 +1,18 @@
 """
 Giveaway functionality module - core logic separated from command interface.
 """
+import asyncio
 import discord
 import datetime
-import random
 from src.res import R
 from src.constants import C
-from src.utils import create_embed, parse_duration, handle_error, logger, error_embed
+from src.utils import create_embed, parse_duration, handle_error, logger
 from src.database import db
-from src.error import Ce, We
-from discord.ext import tasks
+from src.error import Ce, We, Error
+from src.features.scheduler import scheduler, GIVEAWAY_END
+from src.features.giveaway.entries import recorder, setup_giveaway_entries
+from src.features.giveaway.draw import draw_winners
+from src.features.roles import RoleChange, role_assigner
 
 from src.custom_bot import CustomBot
 
@@ -45,6 +48,14 @@ async def create_giveaway_embed(giveaway_data):
             inline=False
         )
 
+    if giveaway_data.get('bonus_role_id'):
+        embed.add_field(
+            name=R.giveaway_bonus_role,
+            value=R.giveaway_bonus_role_value % (
+                giveaway_data['bonus_role_id'], giveaway_data['bonus_weight']),
+            inline=False
+        )
+
     embed.add_field(
         name=R.giveaway_participation,
         value=R.giveaway_react_to_participate % C.giveaway_reaction,
@@ -55,7 +66,8 @@ async def create_giveaway_embed(giveaway_data):
     return embed
 
 
-async def create_giveaway(interaction: discord.Interaction, dauer: str, preis: str, gewinner: int = 1, rolle: discord.Role = None):
+async def create_giveaway(interaction: discord.Interaction, dauer: str, preis: str, gewinner: int = 1, rolle: discord.Role = None,
+                          bonusrolle: discord.Role = None, bonus: int = 2):
     """
     Create a giveaway with the specified parameters.
     Args:
@@ -64,6 +76,8 @@ async def create_giveaway(interaction: discord.Interaction, dauer: str, preis: s
         preis (str): What is being given away.
         gewinner (int): Number of winners to select.
         rolle (discord.Role): Role to award to winners (optional).
+        bonusrolle (discord.Role): Role whose members enter with a higher chance (optional).
+        bonus (int): How many times the chance of a normal entry the members of `bonusrolle` have.
     """
     # Parse duration
     seconds, error = parse_duration(dauer)
@@ -85,8 +99,11 @@ async def create_giveaway(interaction: discord.Interaction, dauer: str, preis: s
         'duration': seconds,
         'role_id': str(rolle.id) if rolle else None,
         'host_id': str(interaction.user.id),
-        'winner_count': gewinner
+        'winner_count': gewinner,
+        'bonus_role_id': str(bonusrolle.id) if bonusrolle else None,
+        'bonus_weight': bonus
     }
+    bonus_roles = {bonusrolle.id: float(bonus)} if bonusrolle else {}
 
     embed = await create_giveaway_embed(giveaway_data)
 
@@ -94,14 +111,11 @@ async def create_giveaway(interaction: discord.Interaction, dauer: str, preis: s
     await interaction.response.defer(ephemeral=True)
     message = await interaction.channel.send(embed=embed,)
 
-    # Add reaction for participation
-    await message.add_reaction(discord.PartialEmoji(name=C.giveaway_reaction))
-
     # Calculate end time
     end_time = datetime.datetime.now() + datetime.timedelta(seconds=seconds)
 
     # Store in database
-    db.giveaway.create(
+    await db.giveaway.create(
         message_id=message.id,
         channel_id=interaction.channel.id,
         guild_id=interaction.guild.id,
@@ -109,8 +123,14 @@ async def create_giveaway(interaction: discord.Interaction, dauer: str, preis: s
         prize=preis,
         winner_count=gewinner,
         role_id=rolle.id if rolle else None,
-        ends_at=end_time
+        ends_at=end_time,
+        bonus_roles=bonus_roles
     )
+    recorder.track(message.id, bonus_roles)
+    scheduler.schedule(GIVEAWAY_END, message.id, end_time)
+
+    # Add reaction for participation, once reactions on the message are recorded
+    await message.add_reaction(discord.PartialEmoji(name=C.giveaway_reaction))
 
     # Send confirmation
     await interaction.followup.send(R.giveaway_started, ephemeral=True)
@@ -120,6 +140,7 @@ async def create_giveaway(interaction: discord.Interaction, dauer: str, preis: s
 async def end_giveaway(bot: CustomBot, giveaway):
     """
     End a giveaway and select winners.
+    The giveaway must already be marked as ended with `db.giveaway.claim`.
     Args:
         bot (CustomBot): The bot instance.
         giveaway: The giveaway object from database.
@@ -130,7 +151,6 @@ async def end_giveaway(bot: CustomBot, giveaway):
         if not channel:
             logger.error(
                 We(f"Channel {giveaway.channel_id} not found for giveaway {giveaway.message_id}"))
-            db.giveaway.update(giveaway.message_id, ended=True)
             return
 
         try:
@@ -138,84 +158,197 @@ async def end_giveaway(bot: CustomBot, giveaway):
         except discord.NotFound:
             logger.error(
                 We(f"Message {giveaway.message_id} not found for giveaway"))
-            db.giveaway.update(giveaway.message_id, ended=True)
             return
 
-        # Get participants who reacted with the giveaway emoji
-        participants = set()
-        for reaction in message.reactions:
-            if str(reaction.emoji) == C.giveaway_reaction:
-                async for user in reaction.users():
-                    if not user.bot:
-                        participants.add(user)
-                break
+        # Draw the winners from the entries recorded from the reactions
+        await recorder.finish(message)
+        _, winners = await draw_winners(giveaway.message_id, giveaway.winner_count)
 
-        if not participants:
+        if not winners:
             await channel.send(
                 embed=create_embed(
                     R.giveaway_no_participants,
                     title=R.giveaway_ended_title,
                 )
             )
-            db.giveaway.update(giveaway.message_id, ended=True)
             return
 
-        # Select winners
-        winner_count = min(giveaway.winner_count, len(participants))
-        winners = random.sample(list(participants), winner_count)
-
         # Announce winners
-        winners_mention = ", ".join(user.mention for user in winners)
+        winners_mention = ", ".join(f"<@{user_id}>" for user_id in winners)
         await channel.send(R.giveaway_winners_announcement % (winners_mention, giveaway.prize))
+        await award_giveaway_role(channel, giveaway, winners)
 
-        # Award role if specified
-        if giveaway.role_id:
-            guild = channel.guild
-            role = guild.get_role(giveaway.role_id)
-            if role:
-                for winner in winners:
-                    member = guild.get_member(winner.id)
-                    if member:
-                        try:
-                            await member.add_roles(role, reason=R.feature.giveaway.role_award_reason)
-                        except discord.Forbidden:
-                            msg = R.giveaway_role_perms_error % (
-                                role.mention, winner.mention)
-                            await channel.send(embed=error_embed(msg))
-                            logger.error(We(msg))
-
-        # Mark as ended
-        db.giveaway.update(giveaway.message_id, ended=True)
         logger.info(
             f"Giveaway {giveaway.message_id} ended with {len(winners)} winners")
 
     except Exception as e:
+        # The giveaway stays ended to prevent infinite retries
         logger.error(Ce(f"Error ending giveaway {giveaway.message_id}: {e}"))
-        # Still mark as ended to prevent infinite retries
-        db.giveaway.update(giveaway.message_id, ended=True)
 
 
-def setup_giveaway_background_task(bot: CustomBot):
+async def award_giveaway_role(channel: discord.TextChannel, giveaway, winners: list[int]):
     """
-    Setup the background task that checks for ended giveaways.
+    Give the prize role of a giveaway to its winners, if it has one, and post a summary in its channel.
     Args:
-        bot (CustomBot): The Discord bot instance.
+        channel (discord.TextChannel): The channel of the giveaway.
+        giveaway: The giveaway object from database.
+        winners (list[int]): IDs of the winners.
     """
-    @tasks.loop(seconds=C.giveaway_check_interval)
-    async def check_ended_giveaways():
-        """Check for ended giveaways and process them."""
+    if not giveaway.role_id:
+        return
+    role = channel.guild.get_role(giveaway.role_id)
+    if not role:
+        return
+    result = await role_assigner.apply([
+        RoleChange(channel.guild, winner_id, role, True, R.feature.giveaway.role_award_reason)
+        for winner_id in winners
+    ])
+    await channel.send(embed=result.summary_embed(R.role_batch_title))
+    if result.forbidden:
+        logger.error(We(
+            f"Missing permissions to award role {role.id} to {len(result.forbidden)} winners of giveaway {giveaway.message_id}"))
+
+
+async def reroll_giveaway(guild: discord.Guild, message_id: int, count: int = 1) -> tuple[list[int], Error | None]:
+    """
+    Draw new winners of an ended giveaway, eg. if a winner didn't claim the prize.
+    Earlier winners can't win again. The draw is recorded like the first one, so it can be replayed.
+    Args:
+        guild (discord.Guild): The guild of the giveaway.
+        message_id (int): Discord message ID for the giveaway.
+        count (int): Number of winners to draw.
+    Returns:
+        tuple[list[int], Error | None]: (winners, error). Returns ([], error) if the giveaway can't be re-rolled.
+    """
+    giveaway = await db.giveaway.get(message_id)
+    if giveaway is None or giveaway.guild_id != guild.id:
+        return [], We(R.giveaway_not_found)
+    if not giveaway.ended or message_id in recorder.running:
+        return [], We(R.giveaway_not_ended)
+    channel = guild.get_channel(giveaway.channel_id)
+    if not channel:
+        return [], We(R.giveaway_channel_not_found)
+
+    draw, winners = await draw_winners(message_id, count)
+    if not winners:
+        await channel.send(embed=create_embed(R.giveaway_reroll_no_participants, title=R.giveaway_ended_title))
+        return [], None
+
+    winners_mention = ", ".join(f"<@{user_id}>" for user_id in winners)
+    await channel.send(R.giveaway_reroll_announcement % (winners_mention, giveaway.prize))
+    await award_giveaway_role(channel, giveaway, winners)
+    logger.info(f"Giveaway {message_id} re-rolled (draw {draw}) with {len(winners)} winners")
+    return winners, None
+
+
+async def handle_reroll_giveaway(interaction: discord.Interaction, nachricht: str, gewinner: int = 1):
+    """
+    Draw new winners of an ended giveaway and confirm it to the user.
+    Args:
+        interaction (discord.Interaction): The interaction context.
+        nachricht (str): Discord message ID of the giveaway. Snowflakes don't fit into integer options.
+        gewinner (int): Number of winners to draw.
+    """
+    if not nachricht.strip().isdigit():
+        await handle_error(interaction, We(R.giveaway_invalid_message_id))
+        return
+    await interaction.response.defer(ephemeral=True)
+    _, err = await reroll_giveaway(interaction.guild, int(nachricht), gewinner)
+    if err:
+        await handle_error(interaction, err)
+        return
+    await interaction.followup.send(R.giveaway_rerolled, ephemeral=True)
+    logger.info(f"Giveaway {nachricht} re-rolled", interaction)
+
+
+class GiveawayFinalizer:
+    """
+    Finalizes ended giveaways on background tasks.
+    At most `limit` giveaways are finalized at once, and at most `guild_limit` of them per guild,
+    so a guild ending many giveaways at once can't hold up the others.
+    """
+
+    def __init__(self, bot: CustomBot, limit: int, guild_limit: int):
+        """
+        Args:
+            bot (CustomBot): The bot instance.
+            limit (int): Max number of giveaways finalized at once.
+            guild_limit (int): Max number of giveaways of one guild finalized at once.
+        """
+        self.bot = bot
+        self.guild_limit = guild_limit
+        self._semaphore = asyncio.Semaphore(limit)
+        # Semaphore of every guild with giveaways in progress, and the number of its giveaways in progress
+        self._guild_semaphores: dict[int, tuple[asyncio.Semaphore, int]] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def submit(self, giveaway) -> asyncio.Task | None:
+        """
+        Start finalizing a giveaway, unless it is already being finalized.
+        Args:
+            giveaway: The giveaway object from database.
+        Returns:
+            asyncio.Task | None: The task finalizing the giveaway, or None if it is already being finalized.
+        """
+        message_id = giveaway.message_id
+        if message_id in self._tasks:
+            return None
+        task = asyncio.create_task(self._finalize(giveaway))
+        self._tasks[message_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(message_id, None))
+        return task
+
+    def pending(self) -> int:
+        """
+        Returns:
+            int: Number of giveaways being finalized or waiting for it.
+        """
+        return len(self._tasks)
+
+    async def _finalize(self, giveaway):
+        """End a giveaway once a slot of its guild and a global slot are free."""
+        guild_id = giveaway.guild_id
+        semaphore, users = self._guild_semaphores.get(
+            guild_id, (asyncio.Semaphore(self.guild_limit), 0))
+        self._guild_semaphores[guild_id] = (semaphore, users + 1)
         try:
-            now = datetime.datetime.now()
-            ended_giveaways = db.giveaway.get_active(now)
-            if ended_giveaways:
-                logger.info(f"Found {len(ended_giveaways)} ended giveaways.")
+            # The guild slot is taken first, so giveaways waiting for their guild don't hold global slots
+            async with semaphore, self._semaphore:
+                # Claiming marks the giveaway as ended, so no other run picks it up again.
+                # It is only claimed once it runs, so giveaways still waiting stay active if the bot stops.
+                if not await db.giveaway.claim(giveaway.message_id):
+                    return
+                R.init(guild_id)
+                await end_giveaway(self.bot, giveaway)
+        finally:
+            semaphore, users = self._guild_semaphores[guild_id]
+            if users == 1:
+                del self._guild_semaphores[guild_id]
+            else:
+                self._guild_semaphores[guild_id] = (semaphore, users - 1)
 
-            for giveaway in ended_giveaways:
-                await R.init(giveaway.guild_id)
-                await end_giveaway(bot, giveaway)
 
-        except Exception as e:
-            logger.error(We(f"Error in giveaway check task: {e}"))
+def setup_giveaway_background_task(bot: CustomBot):
+    """
+    Setup the processing of ended giveaways.
+    Args:
+        bot (CustomBot): The Discord bot instance.
+    """
+    finalizer = GiveawayFinalizer(
+        bot, C.giveaway_finalize_concurrency, C.giveaway_finalize_guild_concurrency)
 
-    # Start the background task
-    check_ended_giveaways.start()
+    async def check_ended_giveaways():
+        """
+        Start finalizing all ended giveaways. Run by the deadline scheduler when a giveaway ends.
+        """
+        now = datetime.datetime.now()
+        ended_giveaways = await db.giveaway.get_active(now)
+        if ended_giveaways:
+            logger.info(f"Found {len(ended_giveaways)} ended giveaways.")
+
+        for giveaway in ended_giveaways:
+            finalizer.submit(giveaway)
+
+    scheduler.register(
+        GIVEAWAY_END, lambda: db.giveaway.get_end_deadlines(), check_ended_giveaways)
+    setup_giveaway_entries(bot)
@@ -0,0 +1,256 @@
+"""
+Bulk role assignment.
+Role changes are sent concurrently up to `C.role_assign_concurrency` at once. Changes that fail because of
+a rate limit or a Discord outage are queued in the database and retried by the deadline scheduler,
+so they are not lost when the bot restarts.
+"""
+import asyncio
+import datetime
+import time
+import aiohttp
+import discord
+from src.res import R
+from src.constants import C
+from src.database import db
+from src.error import We
+from src.utils import create_embed, logger
+from src.features.scheduler import scheduler, ROLE_RETRY
+from src.custom_bot import CustomBot
+
+# Outcomes of a role change
+DONE = "done"
+QUEUED = "queued"
+FORBIDDEN = "forbidden"
+NOT_FOUND = "not_found"
+FAILED = "failed"
+
+
+class RoleChange:
+    """
+    A role to add to or remove from a member.
+
+    Args:
+        guild (discord.Guild): The guild of the member.
+        user_id (int): Discord user ID of the member.
+        role (discord.Role): The role.
+        add (bool): True to add the role, False to remove it.
+        reason (str | None): Reason shown in the audit log.
+    """
+
+    __slots__ = ("guild", "user_id", "role", "add", "reason")
+
+    def __init__(self, guild: discord.Guild, user_id: int, role: discord.Role, add: bool = True, reason: str | None = None):
+        self.guild = guild
+        self.user_id = user_id
+        self.role = role
+        self.add = add
+        self.reason = reason
+
+    def __str__(self):
+        return (R.role_change_add if self.add else R.role_change_remove) % (f"<@{self.user_id}>", self.role.mention)
+
+
+class RoleBatchResult:
+    """
+    Outcome of a batch of role changes, the changes grouped by their outcome.
+    """
+
+    def __init__(self):
+        self.changes: dict[str, list[RoleChange]] = {
+            DONE: [], QUEUED: [], FORBIDDEN: [], NOT_FOUND: [], FAILED: []}
+
+    @property
+    def done(self) -> list[RoleChange]:
+        """The changes that were applied."""
+        return self.changes[DONE]
+
+    @property
+    def queued(self) -> list[RoleChange]:
+        """The changes that were queued for a retry."""
+        return self.changes[QUEUED]
+
+    @property
+    def forbidden(self) -> list[RoleChange]:
+        """The changes the bot lacks permissions for."""
+        return self.changes[FORBIDDEN]
+
+    @property
+    def ok(self) -> bool:
+        """Whether all changes were applied."""
+        return len(self.done) == sum(len(changes) for changes in self.changes.values())
+
+    @property
+    def pending(self) -> bool:
+        """Whether all changes were applied or queued for a retry, so none of them failed."""
+        return len(self.done) + len(self.queued) == sum(len(changes) for changes in self.changes.values())
+
+    def summary_embed(self, title: str) -> discord.Embed:
+        """
+        Create an embed that lists the changes by outcome.
+        Args:
+            title (str): Title of the embed.
+        Returns:
+            discord.Embed: The summary.
+        """
+        lines = [
+            template % ", ".join(str(change) for change in self.changes[outcome])
+            for outcome, template in (
+                (DONE, R.role_batch_done),
+                (QUEUED, R.role_batch_queued),
+                (FORBIDDEN, R.role_batch_forbidden),
+                (NOT_FOUND, R.role_batch_not_found),
+                (FAILED, R.role_batch_failed),
+            )
+            if self.changes[outcome]
+        ]
+        if self.ok:
+            color = C.success_color
+        elif self.forbidden or self.changes[FAILED]:
+            color = C.error_color
+        else:
+            color = C.warning_color
+        return create_embed("\n".join(lines), color=color, title=title)
+
+
+class RoleAssigner:
+    """
+    Applies role changes with bounded concurrency.
+    discord.py already waits out short rate limits of a request. If a request still ends with a 429,
+    the guild is cooled down for its retry-after: the remaining changes of the guild are queued right away
+    instead of being sent into the rate limit.
+    """
+
+    def __init__(self, concurrency: int, backoff: float, max_attempts: int):
+        """
+        Args:
+            concurrency (int): Max number of role changes sent at once.
+            backoff (float): Seconds before a failed change is retried, doubled with every attempt.
+            max_attempts (int): Attempts after which a change is given up.
+        """
+        self.backoff = backoff
+        self.max_attempts = max_attempts
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Monotonic time until which changes of a guild are not sent, by guild ID
+        self._cooldowns: dict[int, float] = {}
+
+    async def apply(self, changes: list[RoleChange], queue: bool = True) -> RoleBatchResult:
+        """
+        Apply a batch of role changes.
+        Args:
+            changes (list[RoleChange]): The changes.
+            queue (bool): False to fail changes that would be queued, for changes that must be applied
+                before the caller goes on.
+        Returns:
+            RoleBatchResult: The changes grouped by outcome.
+        """
+        result = RoleBatchResult()
+        outcomes = await asyncio.gather(*(self._attempt(change, 0, queue) for change in changes))
+        for change, outcome in zip(changes, outcomes):
+            result.changes[outcome].append(change)
+        return result
+
+    async def retry_due(self, bot: CustomBot):
+        """
+        Retry all queued role changes that are due. Run by the deadline scheduler.
+        Args:
+            bot (CustomBot): The bot instance.
+        """
+        due = await db.role_queue.get_due(datetime.datetime.now())
+        changes = []
+        for guild_id, user_id, role_id, add, reason, attempts in due:
+            guild = bot.get_guild(guild_id)
+            role = guild.get_role(role_id) if guild else None
+            if role is None:
+                # The bot left the guild or the role was deleted
+                await db.role_queue.remove(guild_id, user_id, role_id)
+                continue
+            changes.append((RoleChange(guild, user_id, role, add, reason), attempts))
+        if changes:
+            logger.info(f"Retrying {len(changes)} queued role changes.")
+        await asyncio.gather(*(self._attempt(change, attempts) for change, attempts in changes))
+
+    async def _attempt(self, change: RoleChange, attempts: int, queue: bool = True) -> str:
+        """
+        Try a role change once and queue or unqueue it depending on the outcome.
+        Args:
+            change (RoleChange): The change.
+            attempts (int): Number of failed attempts before this one.
+            queue (bool): False to fail the change instead of queueing it.
+        Returns:
+            str: The outcome.
+        """
+        async with self._semaphore:
+            outcome, retry_after = await self._send(change)
+        key = (change.guild.id, change.user_id, change.role.id)
+
+        if outcome == QUEUED and not queue:
+            logger.warning(f"Role change {key} not applied and not queued.")
+            return FAILED
+        if outcome == QUEUED:
+            attempts += 1
+            if attempts >= self.max_attempts:
+                logger.error(We(f"Giving up role change {key} after {attempts} attempts."))
+                await db.role_queue.remove(*key)
+                return FAILED
+            delay = max(retry_after, self.backoff * 2 ** (attempts - 1))
+            next_attempt_at = datetime.datetime.now() + datetime.timedelta(seconds=delay)
+            await db.role_queue.push(*key, change.add, change.reason, attempts, next_attempt_at)
+            scheduler.schedule(ROLE_RETRY, key, next_attempt_at)
+        else:
+            # Also drops an older queued change of the same role, so it can't undo this one
+            if attempts:
+                logger.info(f"Queued role change {key} finished after {attempts} attempts: {outcome}")
+            await db.role_queue.remove(*key)
+            scheduler.cancel(ROLE_RETRY, key)
+        return outcome
+
+    async def _send(self, change: RoleChange) -> tuple[str, float]:
+        """
+        Send a role change to Discord.
+        Returns:
+            tuple[str, float]: The outcome, and the seconds to wait before retrying a queued change.
+        """
+        guild_id = change.guild.id
+        cooldown = self._cooldowns.get(guild_id, 0) - time.monotonic()
+        if cooldown > 0:
+            return QUEUED, cooldown
+
+        try:
+            member = change.guild.get_member(change.user_id) or await change.guild.fetch_member(change.user_id)
+            if change.add:
+                await member.add_roles(change.role, reason=change.reason)
+            else:
+                await member.remove_roles(change.role, reason=change.reason)
+            return DONE, 0
+        except discord.Forbidden:
+            return FORBIDDEN, 0
+        except discord.NotFound:
+            # The member left the guild or the role was deleted
+            return NOT_FOUND, 0
+        except discord.HTTPException as e:
+            if e.status == 429:
+                retry_after = float(e.response.headers.get("Retry-After", self.backoff))
+                self._cooldowns[guild_id] = time.monotonic() + retry_after
+                logger.warning(f"Rate limited while changing roles in guild {guild_id}, retrying in {retry_after}s.")
+                return QUEUED, retry_after
+            if e.status >= 500:
+                return QUEUED, 0
+            logger.error(We(f"Error changing role {change.role.id} of user {change.user_id}: {e}"))
+            return FAILED, 0
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            logger.warning(f"Connection error while changing roles in guild {guild_id}: {e}")
+            return QUEUED, 0
+
+
+role_assigner = RoleAssigner(
+    C.role_assign_concurrency, C.role_retry_backoff, C.role_retry_max_attempts)
+
+
+def setup_role_assigner(bot: CustomBot):
+    """
+    Setup the retries of queued role changes.
+    Args:
+        bot (CustomBot): The Discord bot instance.
+    """
+    scheduler.register(
+        ROLE_RETRY, lambda: db.role_queue.get_retry_deadlines(), lambda: role_assigner.retry_due(bot))
@@ -0,0 +1,175 @@
+"""
+Deadline scheduler for the background work of all features.
+One task sleeps until the earliest deadline (ticket auto-close, giveaway end, application ban end, role retry)
+and runs the handler of its kind, instead of every feature polling the database on its own interval.
+"""
+import asyncio
+import datetime
+import heapq
+import time
+from typing import Awaitable, Callable, Hashable
+from src.constants import C
+from src.error import We
+from src.utils import logger
+from src.custom_bot import CustomBot
+
+# Kinds of deadlines
+TICKET_CLOSE = "ticket_close"
+GIVEAWAY_END = "giveaway_end"
+APPLICATION_BAN_END = "application_ban_end"
+ROLE_RETRY = "role_retry"
+
+# Key of the deadline that retries a kind whose handler failed
+RETRY = "retry"
+
+type DeadlineLoader = Callable[[], Awaitable[list[tuple[Hashable, datetime.datetime]]]]
+type DeadlineHandler = Callable[[], Awaitable[None]]
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of (deadline, kind, key) entries.
+    Each kind has a loader that reads its upcoming deadlines from the database and a handler that
+    processes everything of that kind that is due. Handlers query the database for due work themselves,
+    so running one for a deadline that was moved or cancelled without telling the scheduler is harmless.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, str, Hashable]] = []
+        # Current deadline of every scheduled key; heap entries that don't match are skipped
+        self._deadlines: dict[tuple[str, Hashable], float] = {}
+        self._loaders: dict[str, DeadlineLoader] = {}
+        self._handlers: dict[str, DeadlineHandler] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def register(self, kind: str, load: DeadlineLoader, handle: DeadlineHandler):
+        """
+        Register a kind of deadline.
+        Args:
+            kind (str): Name of the kind.
+            load (DeadlineLoader): Returns (key, deadline) of all upcoming deadlines of this kind.
+            handle (DeadlineHandler): Processes all due work of this kind.
+        """
+        self._loaders[kind] = load
+        self._handlers[kind] = handle
+
+    def schedule(self, kind: str, key: Hashable, deadline: datetime.datetime, replace: bool = True):
+        """
+        Schedule or move the deadline of a key. Call after the deadline was committed to the database.
+        Args:
+            kind (str): Kind of the deadline.
+            key (Hashable): Identifies the deadline within its kind, eg. a channel ID.
+            deadline (datetime.datetime): When the deadline is due.
+            replace (bool): Whether to replace an already scheduled deadline of the key.
+        """
+        if not replace and (kind, key) in self._deadlines:
+            return
+        timestamp = deadline.timestamp()
+        self._deadlines[(kind, key)] = timestamp
+        heapq.heappush(self._heap, (timestamp, kind, key))
+        if self._heap[0][0] == timestamp:
+            # The new deadline is the earliest one, so the sleep has to be shortened
+            self._wakeup.set()
+
+    def cancel(self, kind: str, key: Hashable):
+        """
+        Cancel the deadline of a key, if it is scheduled.
+        Args:
+            kind (str): Kind of the deadline.
+            key (Hashable): Identifies the deadline within its kind.
+        """
+        self._deadlines.pop((kind, key), None)
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the scheduler task, unless it is already running."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def stats(self) -> dict[str, float | int | None]:
+        """
+        Get the scheduler state.
+        Returns:
+            dict[str, float | int | None]: Number of pending deadlines and seconds until the next one.
+        """
+        upcoming = min(self._deadlines.values(), default=None)
+        return {
+            "pending": len(self._deadlines),
+            "next_in": None if upcoming is None else max(upcoming - time.time(), 0),
+        }
+
+    async def reload(self):
+        """
+        Load the upcoming deadlines of all kinds from the database.
+        Deadlines that are already scheduled are kept, since they are at least as recent.
+        """
+        for kind, load in self._loaders.items():
+            for key, deadline in await load():
+                self.schedule(kind, key, deadline, replace=False)
+        logger.debug(
+            f"Deadline scheduler loaded, {len(self._deadlines)} deadlines pending.")
+
+    def _pop_due(self, now: float) -> list[str]:
+        """Remove all due deadlines and return their kinds."""
+        kinds = []
+        while self._heap and self._heap[0][0] <= now:
+            timestamp, kind, key = heapq.heappop(self._heap)
+            if self._deadlines.get((kind, key)) != timestamp:
+                # Moved or cancelled
+                continue
+            del self._deadlines[(kind, key)]
+            if kind not in kinds:
+                kinds.append(kind)
+        return kinds
+
+    async def _run(self):
+        """Sleep until the next deadline and run the handlers of all due kinds."""
+        next_reload = 0.0
+        while True:
+            now = time.time()
+            if now >= next_reload:
+                try:
+                    await self.reload()
+                except Exception as e:
+                    logger.error(We(f"Error loading deadlines: {e}"))
+                # Also catches deadlines that were changed without telling the scheduler
+                next_reload = now + C.scheduler_reload_interval
+
+            due = self._pop_due(now)
+            for kind in due:
+                try:
+                    await self._handlers[kind]()
+                except Exception as e:
+                    logger.error(We(f"Error handling {kind} deadlines: {e}"))
+                    # The due work is still in the database, run the handler again after a backoff
+                    # instead of waiting for the next reload
+                    self.schedule(kind, RETRY, datetime.datetime.fromtimestamp(
+                        time.time() + C.scheduler_retry_backoff))
+            if due:
+                continue
+
+            self._wakeup.clear()
+            wake_at = min(self._heap[0][0], next_reload) if self._heap else next_reload
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(wake_at - time.time(), 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+scheduler = DeadlineScheduler()
+
+
+def setup_scheduler(bot: CustomBot):
+    """
+    Start the deadline scheduler once the bot is ready, so handlers can look up channels and guilds.
+    Args:
+        bot (CustomBot): The Discord bot instance.
+    """
+    @bot.listen("on_ready")
+    async def start_scheduler():
+        scheduler.start()
@@ -174,7 +174,7 @@ class SetupOptionView(LateView):
                     return
                 # Save selected roles as comma-separated IDs
                 role_ids = [str(role.id) for role in self.selected_roles]
-                db.constant.set(C.DBKey.mod_roles, ",".join(
+                await db.constant.set(C.DBKey.mod_roles, ",".join(
                     role_ids), interaction.guild.id)
                 roles_mentions = ", ".join(
                     [role.mention for role in self.selected_roles])
@@ -301,7 +301,7 @@ class SetupButton(discord.ui.Button):
         )
 
     async def callback(self, interaction: discord.Interaction):
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         embed = create_embed(
             R.feature.setup.button.select_view.embed_desc,
             title=R.feature.setup.button.select_view.embed_title,
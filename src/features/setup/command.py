@@ -152,7 +152,7 @@ def setup_setup_command(bot: CustomBot):
                     return
                 # Save selected roles as comma-separated IDs
                 role_ids = [str(role.id) for role in self.selected_roles]
-                db.constant.set(C.DBKey.mod_roles,
+                await db.constant.set(C.DBKey.mod_roles,
                                 ",".join(role_ids), ctx.guild.id)
                 roles_mentions = ", ".join(
                     [role.mention for role in self.selected_roles])
@@ -167,7 +167,7 @@ def setup_setup_command(bot: CustomBot):
                 self.stop()
 
         # Show current mod roles if set
-        mod_role_ids = db.constant.get(C.DBKey.mod_roles, ctx.guild.id)
+        mod_role_ids = await db.constant.get(C.DBKey.mod_roles, ctx.guild.id)
         if mod_role_ids:
             role_ids = [int(rid) for rid in mod_role_ids.split(",") if rid]
             roles = [ctx.guild.get_role(rid) for rid in role_ids]
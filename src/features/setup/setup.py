@@ -18,7 +18,7 @@ async def setup_tickets(interaction: discord.Interaction, category: discord.Cate
     """
     if category is None:
         # Tell the user the current ticket category
-        cat = db.constant.get(C.DBKey.ticket_category, interaction.guild.id)
+        cat = await db.constant.get(C.DBKey.ticket_category, interaction.guild.id)
         if cat is None:
             await interaction.response.send_message(embed=create_embed(R.setup_no_ticket_category, color=C.warning_color, title=R.setup_title), ephemeral=True)
             logger.error(We(R.setup_no_ticket_category), interaction)
@@ -40,7 +40,7 @@ async def setup_tickets(interaction: discord.Interaction, category: discord.Cate
         return
 
     # Set the category in the database
-    db.constant.set(C.DBKey.ticket_category, str(
+    await db.constant.set(C.DBKey.ticket_category, str(
         category.id), interaction.guild.id)
     await interaction.response.send_message(
         embed=create_embed(R.setup_tickets_set_category %
@@ -60,7 +60,7 @@ async def setup_transcript(interaction: discord.Interaction, category: discord.C
     """
     if category is None:
         # Tell the user the current transcript category
-        cat = db.constant.get(C.DBKey.transcript_category,
+        cat = await db.constant.get(C.DBKey.transcript_category,
                               interaction.guild.id)
         if cat is None:
             await interaction.response.send_message(embed=create_embed(R.setup_no_transcript_category, color=C.warning_color), ephemeral=True)
@@ -84,7 +84,7 @@ async def setup_transcript(interaction: discord.Interaction, category: discord.C
         return
 
     # Set the category in the database
-    db.constant.set(C.DBKey.transcript_category, str(
+    await db.constant.set(C.DBKey.transcript_category, str(
         category.id), interaction.guild.id)
     await interaction.response.send_message(
         embed=create_embed(R.setup_transcript_set_category %
@@ -104,7 +104,7 @@ async def setup_logchannel(interaction: discord.Interaction, channel: discord.Te
     """
     if channel is None:
         # Tell the user the current log channel
-        log_channel_id = db.constant.get(
+        log_channel_id = await db.constant.get(
             C.DBKey.log_channel, interaction.guild.id)
         if log_channel_id is None:
             await interaction.response.send_message(embed=create_embed(R.setup_no_logchannel, color=C.warning_color, title=R.log_channel_title), ephemeral=True)
@@ -125,7 +125,7 @@ async def setup_logchannel(interaction: discord.Interaction, channel: discord.Te
         return
 
     # Set the log channel in the database
-    db.constant.set(C.DBKey.log_channel, str(channel.id), interaction.guild.id)
+    await db.constant.set(C.DBKey.log_channel, str(channel.id), interaction.guild.id)
     await interaction.response.send_message(
         embed=create_embed(R.setup_logchannel_set % channel.mention,
                            color=C.success_color, title=R.log_channel_title),
@@ -157,7 +157,7 @@ async def setup_timeout_logchannel(interaction: discord.Interaction, channel: di
         return
 
     # Set the log channel in the database
-    db.constant.set(C.DBKey.timeout_log_channel, str(channel.id), guild_id)
+    await db.constant.set(C.DBKey.timeout_log_channel, str(channel.id), guild_id)
     await interaction.response.send_message(
         embed=create_embed(R.setup_timeout_logchannel_set % channel.mention,
                            color=C.success_color, title=R.timeout_log_channel_title),
@@ -173,7 +173,7 @@ async def show_modroles(interaction: discord.Interaction):
     Args:
         interaction (discord.Interaction): The interaction context.
     """
-    mod_role_ids = db.constant.get(C.DBKey.mod_roles, interaction.guild.id)
+    mod_role_ids = await db.constant.get(C.DBKey.mod_roles, interaction.guild.id)
     if mod_role_ids:
         role_ids = [int(rid) for rid in mod_role_ids.split(",") if rid]
         roles = [interaction.guild.get_role(rid) for rid in role_ids]
@@ -215,16 +215,17 @@ async def setup_language(interaction: discord.Interaction, language: str = None)
         language (str): The language to set (optional).
     """
     if language:
-        db.constant.set(C.DBKey.locale, language, interaction.guild.id)
+        await db.constant.set(C.DBKey.locale, language, interaction.guild.id)
+        R.set_guild_locale(interaction.guild.id, language)
         # Switch to the new language
-        await R.init(interaction.guild.id)
+        R.init(interaction.guild.id)
         lang = get_native_name(language)
         await interaction.response.send_message(embed=create_embed(R.feature.setup.language.set_success % lang, color=C.success_color), ephemeral=True)
         logger.info(
             f"Language set to {language}",
             interaction)
     else:
-        locale = db.constant.get(
+        locale = await db.constant.get(
             C.DBKey.locale, interaction.guild.id) or DEFAULT_LANG
 
         lang = get_native_name(locale)
@@ -87,5 +87,5 @@ class ListDisplayView(discord.ui.View):
         self.add_item(self.update_button)
 
     async def update(self, interaction: discord.Interaction):
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await self.update_callback(interaction)
@@ -0,0 +1,77 @@
+"""
+Stats slash command - shows runtime statistics of the bot.
+"""
+import discord
+from src.res import R, RD, RL
+from src.utils import create_embed, logger
+from src.database import db
+from src.custom_bot import CustomBot
+
+
+def format_cache_stats(stats: dict[str, int]) -> str:
+    """
+    Format the counters of a cache for an embed field.
+    Args:
+        stats (dict[str, int]): The counters returned by the cache's `stats` method.
+    Returns:
+        str: The formatted counters.
+    """
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+    lines = [R.stats_cache_hit_rate % (hit_rate, stats["hits"], lookups)]
+    lines += [f"{key}: {value}" for key,
+              value in stats.items() if key not in ("hits", "misses")]
+    return "\n".join(lines)
+
+
+def format_backup_stats() -> str:
+    """
+    Format the state of the database backups for an embed field.
+    Returns:
+        str: The last backup and whether a backup is running.
+    """
+    result = db.backup.last_result
+    if result is None:
+        text = R.stats_backup_none
+    else:
+        text = R.stats_backup_last % (discord.utils.format_dt(result.finished_at, "R"),
+                                      result.pages, result.duration)
+    if db.backup.running:
+        text += "\n" + R.stats_backup_running
+    return text
+
+
+def setup_stats_command(bot: CustomBot):
+    """
+    Setup the stats command for the bot.
+    Args:
+        bot (CustomBot): The Discord bot instance.
+    """
+
+    @bot.slash_command(
+        name=RD.command.stats.name,
+        name_localizations=RL.command.stats.name,
+        description=RD.command.stats.desc,
+        description_localizations=RL.command.stats.desc
+    )
+    @discord.default_permissions(administrator=True)
+    async def stats_command(ctx: discord.ApplicationContext):
+        """
+        Show the hit rates of the database caches, the last database backup and the log queue.
+        Args:
+            ctx (discord.ApplicationContext): The command context.
+        """
+        R.init(ctx.guild_id)
+        embed = create_embed(title=R.stats_embed_title)
+        embed.add_field(name=R.stats_ticket_cache,
+                        value=format_cache_stats(db.ticket_cache.stats()), inline=False)
+        embed.add_field(name=R.stats_constant_cache,
+                        value=format_cache_stats(db.constant_cache.stats()), inline=False)
+        embed.add_field(name=R.stats_category_cache,
+                        value=format_cache_stats(db.category_cache.stats()), inline=False)
+        embed.add_field(name=R.stats_backup,
+                        value=format_backup_stats(), inline=False)
+        embed.add_field(name=R.stats_logging,
+                        value="\n".join(f"{key}: {value}" for key, value in logger.sink.stats().items()), inline=False)
+        await ctx.respond(embed=embed, ephemeral=True)
+        logger.info("Stats command executed", ctx.interaction)
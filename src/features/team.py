@@ -11,7 +11,8 @@ from src.error import Error, We
 from src.database import db
 from src.constants import C
 from src.res import R, RD, RL, LateView, button, late
-from discord.ext import tasks
+from src.features.scheduler import scheduler, APPLICATION_BAN_END
+from src.features.roles import RoleBatchResult, RoleChange, role_assigner
 from src.features.shared.list_display import ListDisplayView, create_list_embeds
 
 
@@ -36,7 +37,9 @@ class ApplicationBannedView(LateView):
             await handle_error(interaction, err)
             return
 
-        db.ab.unban_user(self.user.id, interaction.guild.id)
+        await db.ab.unban_user(self.user.id, interaction.guild.id)
+        scheduler.cancel(APPLICATION_BAN_END,
+                         (self.user.id, interaction.guild.id))
         await interaction.response.send_message(embed=create_embed(R.team_sperre_unban_success % self.user.mention, color=C.success_color), ephemeral=True)
         log_message = R.team_sperre_unban_log % (
             interaction.user.mention, self.user.mention)
@@ -202,6 +205,30 @@ class TeamListMessage:
         return embeds_or_err, view
 
 
+async def respond_role_result(ctx: discord.ApplicationContext, result: RoleBatchResult) -> bool:
+    """
+    Tell the user about role changes that were not applied right away.
+    Args:
+        ctx (discord.ApplicationContext): The command context.
+        result (RoleBatchResult): The result of the role changes.
+    Returns:
+        bool: True if all changes were applied or queued for a retry.
+    """
+    if result.ok:
+        return True
+    if result.forbidden:
+        await ctx.respond(embed=error_embed(R.add_role_no_perm), ephemeral=True)
+        logger.error(We(R.add_role_no_perm), ctx.interaction)
+        return False
+    await ctx.respond(embed=result.summary_embed(R.role_batch_title), ephemeral=True)
+    if result.pending:
+        logger.warning(
+            f"Role changes not applied right away, {len(result.queued)} queued for a retry", ctx.interaction)
+        return True
+    logger.error(We("Role changes could not be applied"), ctx.interaction)
+    return False
+
+
 def setup_team_command(bot: CustomBot) -> None:
     """
     Setup team management commands for the bot.
@@ -248,9 +275,13 @@ def setup_team_command(bot: CustomBot) -> None:
             logger.error(err, ctx.interaction)
             return
 
+        # Add the role to the user
+        result = await role_assigner.apply(
+            [RoleChange(ctx.guild, user.id, role, True, f"Added to team by {ctx.author.name}")])
+        if not await respond_role_result(ctx, result):
+            return
+
         try:
-            # Add the role to the user
-            await user.add_roles(role, reason=f"Added to team by {ctx.author.name}")
             # Send a message to the log channel
             log_message = R.team_add_success_log % (
                 user.mention, ctx.author.mention, role.mention)
@@ -372,9 +403,19 @@ def setup_team_command(bot: CustomBot) -> None:
             logger.error(
                 We(R.team_wechsel_user_already_has_to_role), ctx.interaction)
             return
+        reason = f"Role switch by {ctx.author.name}"
+        # Add the new role before removing the old one, so a failed change can't leave the user without either.
+        # The add is not queued, since the old role must only be removed once the user has the new one.
+        result = await role_assigner.apply(
+            [RoleChange(ctx.guild, user.id, to_role, True, reason)], queue=False)
+        if not await respond_role_result(ctx, result):
+            return
+        result = await role_assigner.apply(
+            [RoleChange(ctx.guild, user.id, from_role, False, reason)])
+        if not await respond_role_result(ctx, result):
+            return
+
         try:
-            await user.remove_roles(from_role, reason=f"Role switch by {ctx.author.name}")
-            await user.add_roles(to_role, reason=f"Role switch by {ctx.author.name}")
             log_message = R.team_wechsel_success_log % (
                 user.mention, ctx.author.mention, from_role.mention, to_role.mention)
             await log_channel.send(embed=create_embed(log_message, title=R.team_wechsel_success_title))
@@ -438,7 +479,7 @@ def setup_team_command(bot: CustomBot) -> None:
             user (discord.Member): The user to ban from creating applications.
         """
         # Check if the user is already banned
-        if db.ab.is_user_banned(user.id, ctx.guild.id):
+        if await db.ab.is_user_banned(user.id, ctx.guild.id):
 
             view = ApplicationBannedView.create(ctx.interaction, user)
             await ctx.respond(embed=create_embed(R.team_sperre_already_banned % user.mention, color=C.warning_color), view=view, ephemeral=True)
@@ -463,7 +504,10 @@ def setup_team_command(bot: CustomBot) -> None:
             return
 
         # Ban the user
-        db.ab.ban_user(user.id, ctx.guild.id, ends_at)
+        await db.ab.ban_user(user.id, ctx.guild.id, ends_at)
+        if ends_at:
+            scheduler.schedule(APPLICATION_BAN_END,
+                               (user.id, ctx.guild.id), ends_at)
 
         if duration:
             str_duration = str(datetime.timedelta(seconds=seconds))
@@ -498,7 +542,7 @@ def setup_team_command(bot: CustomBot) -> None:
     )
     async def team_welcome(ctx: discord.ApplicationContext, channel: discord.TextChannel = None):
         if channel:
-            db.constant.set(C.DBKey.welcome_channel_id,
+            await db.constant.set(C.DBKey.welcome_channel_id,
                             channel.id, ctx.guild.id)
             await ctx.respond(embed=create_embed(R.team_welcome_channel_set % channel.mention, color=C.success_color), ephemeral=True)
             logger.info(
@@ -510,17 +554,22 @@ def setup_team_command(bot: CustomBot) -> None:
                 return
             await ctx.respond(embed=create_embed(R.team_welcome_current_channel % welcome_channel.mention), ephemeral=True)
 
-    @tasks.loop(seconds=C.application_ban_check_interval)
     async def check_application_bans():
         """
-        Background task that checks for expired application bans and removes them.
+        Remove expired application bans. Run by the deadline scheduler when a timed ban ends.
         """
         now = datetime.datetime.now(datetime.timezone.utc)
-        expired_bans = db.ab.get_expired(now)
+        expired_bans = await db.ab.get_expired(now)
         for (user_id, guild_id) in expired_bans:
-            db.ab.unban_user(user_id, guild_id)
+            await db.ab.unban_user(user_id, guild_id)
             logger.info(
                 f"Automatically removed expired application ban for user {user_id} in guild {guild_id}")
-    check_application_bans.start()
+
+    async def load_application_ban_deadlines():
+        """Get the end of all timed application bans, keyed by (user_id, guild_id)."""
+        return [((user_id, guild_id), ends_at) for user_id, guild_id, ends_at in await db.ab.get_ban_deadlines()]
+
+    scheduler.register(
+        APPLICATION_BAN_END, load_application_ban_deadlines, check_application_bans)
 
     bot.add_application_command(team)
@@ -9,7 +9,7 @@ class ApplicationRejectModal(discord.ui.Modal):
     A modal for collecting the rejection reason when rejecting an application.
     """
 
-    def __init__(self, user_id: str):
+    def __init__(self, user_id: int):
         super().__init__(title=R.reject_application_modal_title)
         self.user_id = user_id
 
@@ -27,7 +27,7 @@ class ApplicationRejectModal(discord.ui.Modal):
         Args:
             interaction (discord.Interaction): The interaction from the modal submission.
         """
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         # Get the user who submitted the application
         user, err = get_member(interaction.guild, self.user_id)
         if err:
@@ -52,12 +52,12 @@ class ApplicationRejectModal(discord.ui.Modal):
             f"Application rejected for {user.name} (ID: {user.id}) with reason: {self.reason.value}", interaction)
 
 
-async def reject_application(interaction: discord.Interaction, user_id: str):
+async def reject_application(interaction: discord.Interaction, user_id: int):
     """
     Show a modal to collect rejection reason and reject a user's application.
     Args:
         interaction (discord.Interaction): The interaction that triggered the rejection.
-        user_id (str): The ID of the user whose application is being rejected.
+        user_id (int): The ID of the user whose application is being rejected.
     """
     modal = ApplicationRejectModal(user_id)
     await interaction.response.send_modal(modal)
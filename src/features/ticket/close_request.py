@@ -52,7 +52,7 @@ class TicketCloseRequestView(LateView):
             button (discord.ui.Button): The button that was clicked.
             interaction (discord.Interaction): The interaction that triggered the button click.
         """
-        ticket = db.ticket.get(str(interaction.channel.id))
+        ticket = await db.ticket.get(interaction.channel.id)
         if not ticket:
             await handle_error(interaction, Ce(R.ticket_not_found))
             return
@@ -5,6 +5,7 @@ from src.constants import C
 from src.res import R
 from src.error import Ce, UserNotFoundError, We, Error
 from src.res.utils import LateView, late, button
+from src.features.scheduler import scheduler, TICKET_CLOSE
 
 
 class ClosedView(LateView):
@@ -38,7 +39,7 @@ class ClosedView(LateView):
             return
 
         await interaction.channel.delete()
-        db.ticket.delete(str(interaction.channel.id))
+        await db.ticket.delete(interaction.channel.id)
         logger.info("ticket deleted", interaction)
 
     @late(lambda: button(label=R.reopen_ticket_button, style=discord.ButtonStyle.secondary, custom_id="reopen_ticket", emoji=discord.PartialEmoji(name=R.reopen_emoji)))
@@ -54,7 +55,7 @@ class ClosedView(LateView):
         if err:
             await handle_error(interaction, err)
             return
-        ticket = db.ticket.get(str(interaction.channel.id))
+        ticket = await db.ticket.get(interaction.channel.id)
         if ticket is None:
             await handle_error(interaction, Ce(R.ticket_not_found))
             return
@@ -70,7 +71,7 @@ class ClosedView(LateView):
         await interaction.channel.edit(category=original_category)
 
         # Update database
-        db.ticket.update(str(interaction.channel.id), archived=False)
+        await db.ticket.update(interaction.channel.id, archived=False)
 
         # Edit the original message to remove buttons
         await interaction.message.edit(view=None)
@@ -96,7 +97,7 @@ async def close_channel(channel: discord.TextChannel) -> Error | None:
         return err
     await channel.edit(category=category)
     # Change permissions
-    ticket = db.ticket.get(str(channel.id))
+    ticket = await db.ticket.get(channel.id)
     if ticket is None:
         return Ce(R.ticket_not_found)
     user, err = get_member(channel.guild, ticket.user_id)
@@ -126,7 +127,8 @@ async def close_ticket(interaction: discord.Interaction):
         return
 
     # Update database
-    db.ticket.update(str(interaction.channel.id), archived=True, close_at=None)
+    await db.ticket.update(interaction.channel.id, archived=True, close_at=None)
+    scheduler.cancel(TICKET_CLOSE, interaction.channel.id)
 
     msg = R.ticket_closed_msg % interaction.user.mention
     # Send message
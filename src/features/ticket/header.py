@@ -37,9 +37,9 @@ class HeaderView(discord.ui.View):
         Args:
             interaction (discord.Interaction): The interaction that triggered the close action.
         """
-        await R.init(interaction.guild_id)
-        cid = str(interaction.channel.id)
-        ticket = db.ticket.get(cid)
+        R.init(interaction.guild_id)
+        cid = interaction.channel.id
+        ticket = await db.ticket.get(cid)
         if not ticket:
             await handle_error(interaction, Ce(R.ticket_not_found))
             return
@@ -48,7 +48,7 @@ class HeaderView(discord.ui.View):
             await handle_error(interaction, We(R.ticket_already_closed))
             return
 
-        is_mod_admin, err = is_mod_or_admin(interaction.user)
+        is_mod_admin, err = await is_mod_or_admin(interaction.user)
         if err:
             await handle_error(interaction, err)
             return
@@ -56,7 +56,7 @@ class HeaderView(discord.ui.View):
         if is_mod_admin:
             # If the user is a mod or admin, close the ticket directly
             await close_ticket(interaction)
-        elif ticket.user_id == str(interaction.user.id):
+        elif ticket.user_id == interaction.user.id:
             # If the user is the ticket owner, send a close request
             msg, view = TicketCloseRequestView.create(interaction)
             await interaction.response.send_message(
@@ -74,7 +74,7 @@ class HeaderView(discord.ui.View):
         Args:
             interaction (discord.Interaction): The interaction that triggered the mod options.
         """
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         embed, view = await ModOptionsMessage.create(
             interaction,
         )
@@ -19,12 +19,12 @@ class ModOptionsMessage(discord.ui.View):
     A Discord UI view that provides moderator options for ticket management, including assignment and application review.
     """
 
-    def __init__(self, ticket: Ticket, interaction: discord.Interaction):
+    def __init__(self, ticket: Ticket, category: str, interaction: discord.Interaction):
         super().__init__(timeout=None)
 
         self.assignee_id = ticket.assignee_id
         self.user_id = ticket.user_id
-        self.category = get_category_name(ticket.category_id)
+        self.category = category
 
         if self.assignee_id is None:
             # No assignee
@@ -33,7 +33,7 @@ class ModOptionsMessage(discord.ui.View):
                 emoji=discord.PartialEmoji(name=R.assign_emoji))
             assign_button.callback = self.assign_ticket
             self.add_item(assign_button)
-        elif self.assignee_id == str(interaction.user.id):
+        elif self.assignee_id == interaction.user.id:
             # Assignee is the current user
             unassign_button = discord.ui.Button(
                 label=R.unassign_ticket, style=discord.ButtonStyle.secondary,
@@ -75,7 +75,7 @@ class ModOptionsMessage(discord.ui.View):
         Args:
             interaction (discord.Interaction): The interaction that triggered this action.
         """
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await interaction.response.defer()
         await create_noch_fragen(interaction)
 
@@ -85,13 +85,13 @@ class ModOptionsMessage(discord.ui.View):
         Args:
             interaction (discord.Interaction): The interaction that triggered the assignment.
         """
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await interaction.response.defer()
 
-        new_assigned_id = str(interaction.user.id)
+        new_assigned_id = interaction.user.id
 
         # Update ticket in database
-        db.ticket.update(str(interaction.channel.id),
+        await db.ticket.update(interaction.channel.id,
                          assignee_id=new_assigned_id)
 
         # Send update message in the ticket channel
@@ -115,11 +115,11 @@ class ModOptionsMessage(discord.ui.View):
         Args:
             interaction (discord.Interaction): The interaction that triggered the unassignment.
         """
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         await interaction.response.defer(ephemeral=True)
 
         # Update ticket in database
-        db.ticket.update(str(interaction.channel.id), assignee_id=None)
+        await db.ticket.update(interaction.channel.id, assignee_id=None)
 
         # Send update message in the ticket channel
         await interaction.channel.send(
@@ -141,7 +141,7 @@ class ModOptionsMessage(discord.ui.View):
         Args:
             interaction (discord.Interaction): The interaction that triggered the approval.
         """
-        await R.init(interaction.guild_id)
+        R.init(interaction.guild_id)
         # Get the user who submitted the application
         user, err = get_member(interaction.guild, self.user_id)
         if err:
@@ -171,13 +171,13 @@ class ModOptionsMessage(discord.ui.View):
             tuple[discord.Embed | None, discord.ui.View | None]: The message and view for the mod options.
         """
 
-        ticket = db.ticket.get(str(interaction.channel.id))
+        ticket = await db.ticket.get(interaction.channel.id)
         if ticket is None:
             err = Ce(R.ticket_not_found_msg)
             logger.error(err, interaction)
             return error_to_embed(err), None
 
-        has_permission, err = is_mod_or_admin(interaction.user)
+        has_permission, err = await is_mod_or_admin(interaction.user)
         if err:
             logger.error(err, interaction)
             return error_to_embed(err), None
@@ -189,7 +189,7 @@ class ModOptionsMessage(discord.ui.View):
         assignee_id = ticket.assignee_id
         user_id = ticket.user_id
         archived = ticket.archived
-        category = get_category_name(ticket.category_id)
+        category = await get_category_name(ticket.category_id)
         created_at = ticket.created_at
 
         if assignee_id is None:
@@ -200,7 +200,7 @@ class ModOptionsMessage(discord.ui.View):
         user_mention = mention(user_id)
 
         # Create the view
-        view = ModOptionsMessage(ticket, interaction)
+        view = ModOptionsMessage(ticket, category, interaction)
 
         # Create the embed
         embed = discord.Embed(
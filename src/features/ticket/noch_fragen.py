@@ -1,6 +1,5 @@
 from src.custom_bot import CustomBot
 import discord
-from discord.ext import tasks
 from .closed import ClosedView, close_channel, close_ticket
 from src.database import db
 from src.utils import create_embed, logger, handle_error
@@ -9,6 +8,7 @@ from src.constants import C
 from src.res import R
 from src.error import Ce, We
 from src.res.utils import LateView, late, button
+from src.features.scheduler import scheduler, TICKET_CLOSE
 
 
 class NochFragenMessage(LateView):
@@ -42,10 +42,10 @@ class NochFragenMessage(LateView):
             interaction (discord.Interaction): The interaction context.
         """
 
-        if (ticket := db.ticket.get(interaction.channel.id)) is None:
+        if (ticket := await db.ticket.get(interaction.channel.id)) is None:
             await handle_error(interaction, Ce(R.ticket_not_found))
             return
-        if ticket.user_id != str(interaction.user.id):
+        if ticket.user_id != interaction.user.id:
             await handle_error(interaction, We(R.noch_fragen_no_permission))
             return
         if ticket.close_at is None:
@@ -69,10 +69,10 @@ class NochFragenMessage(LateView):
             button (discord.ui.Button): The button that was clicked.
             interaction (discord.Interaction): The interaction context.
         """
-        if (ticket := db.ticket.get(interaction.channel.id)) is None:
+        if (ticket := await db.ticket.get(interaction.channel.id)) is None:
             await handle_error(interaction, Ce(R.ticket_not_found))
             return
-        if ticket.user_id != str(interaction.user.id):
+        if ticket.user_id != interaction.user.id:
             await handle_error(interaction, We(R.noch_fragen_no_permission))
             return
         if ticket.close_at is None:
@@ -85,7 +85,8 @@ class NochFragenMessage(LateView):
         await interaction.channel.send(
             embed=create_embed(R.noch_fragen_cancel_msg % interaction.user.mention, color=C.success_color))
 
-        db.ticket.update(interaction.channel.id, close_at=None)
+        await db.ticket.update(interaction.channel.id, close_at=None)
+        scheduler.cancel(TICKET_CLOSE, interaction.channel.id)
         logger.info("cancelled noch fragen after user request", interaction)
 
 
@@ -98,7 +99,8 @@ async def create_noch_fragen(interaction: discord.Interaction):
     embed, view = NochFragenMessage.create(interaction)
     now = datetime.datetime.now()
     close_time = now + datetime.timedelta(hours=C.ticket_close_time)
-    db.ticket.update(interaction.channel.id, close_at=close_time)
+    await db.ticket.update(interaction.channel.id, close_at=close_time)
+    scheduler.schedule(TICKET_CLOSE, interaction.channel.id, close_time)
     await interaction.channel.send(
         embed=embed,
         view=view,
@@ -108,35 +110,45 @@ async def create_noch_fragen(interaction: discord.Interaction):
 
 def setup_noch_fragen(bot: CustomBot):
     """
-    Setup the automatic ticket closing task for the bot.
+    Setup the automatic closing of overdue tickets for the bot.
     Args:
         bot (CustomBot): The Discord bot instance.
     """
-    @tasks.loop(minutes=5)
     async def delete_noch_fragen():
         """
-        Background task that automatically closes overdue tickets.
+        Close all overdue tickets. Run by the deadline scheduler when a ticket's `close_at` is due.
         """
         now = datetime.datetime.now()
-        overdue_ids = db.ticket.get_overdue(now)
-        for id in overdue_ids:
-            channel = bot.get_channel(int(id))
-            if channel is None:
-                logger.error(We(f"Channel {id} not found, skipping deletion."))
-                continue  # Continue to next id if channel not found
-            await R.init(channel.guild.id)
-            err = await close_channel(channel)
-            if err:
-                logger.error(err)
-                continue  # Skip database update if closing channel failed
-
-            # If close_channel was successful
-            db.ticket.update(id, close_at=None, archived=True)
-            embed, view = ClosedView.create(R.noch_fragen_closed_msg)
-            await channel.send(
-                embed=embed,
-                view=view
-            )
-            logger.info(f"Closed channel {id} due to overdue noch fragen.")
-
-    delete_noch_fragen.start()
+        overdue_ids = await db.ticket.get_overdue(now)
+        # IDs of the tickets closed in this run, archived in one commit once all were handled
+        closed_ids = []
+        try:
+            for id in overdue_ids:
+                channel = bot.get_channel(id)
+                if channel is None:
+                    logger.error(
+                        We(f"Channel {id} not found, skipping deletion."))
+                    continue  # Continue to next id if channel not found
+                R.init(channel.guild.id)
+                err = await close_channel(channel)
+                if err:
+                    logger.error(err)
+                    continue  # Skip database update if closing channel failed
+
+                # If close_channel was successful
+                closed_ids.append(id)
+                embed, view = ClosedView.create(R.noch_fragen_closed_msg)
+                await channel.send(
+                    embed=embed,
+                    view=view
+                )
+                logger.info(f"Closed channel {id} due to overdue noch fragen.")
+        finally:
+            # Also archive the closed tickets if a later Discord call failed
+            if closed_ids:
+                async with db.transaction() as tx:
+                    for id in closed_ids:
+                        tx.ticket.update(id, close_at=None, archived=True)
+
+    scheduler.register(
+        TICKET_CLOSE, lambda: db.ticket.get_close_deadlines(), delete_noch_fragen)
@@ -38,7 +38,7 @@ class PanelView(discord.ui.View):
                 )
             ]
         else:
-            categories = db.tc.get_categories_for_guild(interaction.guild.id)
+            categories = await db.tc.get_categories_for_guild(interaction.guild.id)
 
         if not categories:
             # No categories available - user has no access or none configured
@@ -82,7 +82,7 @@ class PanelView(discord.ui.View):
         )
 
         async def callback(select_interaction: discord.Interaction):
-            await R.init(interaction.guild_id)
+            R.init(interaction.guild_id)
             category_id = int(select_interaction.data["values"][0])
             await self.handle_category_selection(select_interaction, category_id)
 
@@ -92,20 +92,21 @@ class PanelView(discord.ui.View):
     async def handle_category_selection(self, interaction: discord.Interaction, category_id: int):
         """Handle ticket creation for a selected category."""
         try:
-            # Get category details
-            category = db.tc.get_category(category_id)
+            # Get category details, permissions and questions in one lookup
+            graph = await db.tc.get_category_graph_of(category_id)
+            category = graph.by_id.get(category_id) if graph else None
             if not category:
                 await handle_error(interaction, We(R.feature.panel.category_not_found))
                 return
 
             # Check if user can use this category
             user_role_ids = [role.id for role in interaction.user.roles]
-            if not db.tc.user_can_use_category(category_id, user_role_ids):
+            if not graph.user_can_use_category(category_id, user_role_ids):
                 await handle_error(interaction, We(R.feature.panel.no_permission))
                 return
 
             # Check for questions
-            questions = db.tc.get_questions(category_id)
+            questions = graph.questions.get(category_id, [])
 
             if questions:
                 # Show modal with questions
@@ -194,12 +195,12 @@ async def create_ticket_channel(interaction: discord.Interaction, user: discord.
         return None
 
     # Get category name for channel naming
-    category = db.tc.get_category(category_id)
+    category = await db.tc.get_category(category_id)
     category_name = category.name if category else R.feature.panel.default_category_name
 
     channel_name = generate_channel_name(user, category_name)
 
-    mod_roles, err = get_mod_roles(interaction.guild)
+    mod_roles, err = await get_mod_roles(interaction.guild)
     if err:
         await handle_error(interaction, err)
         return None
@@ -237,7 +238,7 @@ async def init_ticket_channel(interaction: discord.Interaction, user: discord.Us
     view = HeaderView()
 
     # Get category details
-    category = db.tc.get_category(category_id)
+    category = await db.tc.get_category(category_id)
     title = f"{category.emoji} {category.name}"
     msg = R.feature.panel.welcome_message % (user.mention, category.description)
 
@@ -287,10 +288,11 @@ async def create_new_ticket(interaction: discord.Interaction, user: discord.User
     if channel is None:
         # Error occurred
         return None
-    db.ticket.create(
-        str(channel.id),
+    await db.ticket.create(
+        channel.id,
+        interaction.guild.id,
         category_id,
-        str(user.id),
+        user.id,
         None
     )
     await init_ticket_channel(interaction, user, channel, category_id, question_answers)
@@ -310,7 +312,7 @@ async def create_panel_view(guild_id: int, interaction: discord.Interaction | No
     """
     try:
         # Check if guild has any categories
-        categories = db.tc.get_categories_for_guild(guild_id)
+        categories = await db.tc.get_categories_for_guild(guild_id)
 
         if not categories:
             return None, We(R.feature.panel.no_categories_configured_error)
@@ -28,7 +28,7 @@ def setup_help_command(bot: CustomBot):
             ctx (discord.ApplicationContext): The interaction context.
         """
         # The command names change based on locale name so here we want resource strings for the user locale
-        await R.initlocale(ctx.locale)
+        R.initlocale(ctx.locale)
         embed = discord.Embed(
             title=R.help_title,
             description=R.help_description,
@@ -45,9 +45,12 @@ def setup_help_command(bot: CustomBot):
                 " *(Administrator)*",
                 f"- `/{R.command.giveaway.name}` - " +
                 R.command.giveaway.desc + " *(Administrator)*",
+                f"- `/{R.command.giveaway_reroll.name}` - " +
+                R.command.giveaway_reroll.desc + " *(Administrator)*",
                 f"- `/{R.command.timeout.name}` - " +
                 R.command.timeout.desc + " *(Moderator)*",
                 f"- `/{R.command.category.name}` - {R.command.category.desc} *(Administrator)*",
+                f"- `/{R.command.stats.name}` - {R.command.stats.desc} *(Administrator)*",
             ]
 
             embed.add_field(
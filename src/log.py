@@ -3,6 +3,12 @@ Simple logging utility for the bot, supporting different log levels and file out
 """
 from dataclasses import dataclass
 import datetime
+import gzip
+import json
+import queue
+import shutil
+import sys
+import threading
 import traceback
 
 import discord
@@ -36,6 +42,10 @@ class Col:
         ORANGE = "\033[48;5;208m"
 
 
+# Frames from these files and functions are never reported as the call site of a log line
+SKIPPED_FILES = ("log.py", "error.py", "res.py", "packs.py", "command_table.py")
+SKIPPED_FUNCTIONS = ("handle_error",)
+
 level_names = {
     logging.DEBUG: "DEBUG",
     logging.INFO: "INFO",
@@ -45,15 +55,31 @@ level_names = {
 
 
 class FileManager:
-    def __init__(self, filename: str):
+    """
+    Appends to a log file per day.
+    Files are rotated when the date changes or when they grow larger than `max_bytes`.
+    Rotated files are gzip-compressed on a separate thread and deleted after `retention_days`.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, retention_days: int = 0, compress: bool = True):
         """
         Initialize the FileManager with a file path.
         Args:
-            filename (str): Path to the file to manage.
+            filename (str): Path to the file to manage. `{date}` is replaced with the current date.
+            max_bytes (int): Size after which the file is rotated. 0 disables size-based rotation.
+            retention_days (int): Days after which rotated files are deleted. 0 keeps them forever.
+            compress (bool): Whether to gzip rotated files.
         """
         self.filename = filename
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self.compress = compress
         self.open_file = None
         self.open_filename = None
+        self.open_size = 0
+        self._compressors: list[threading.Thread] = []
+        # Files that are being compressed right now
+        self._compressing: set[str] = set()
 
         self._ensure_open()
 
@@ -74,6 +100,64 @@ class FileManager:
                 self.open_file.close()
             self.open_file = self._open_location(correct_filename)
             self.open_filename = correct_filename
+            self.open_size = os.path.getsize(correct_filename)
+            self._cleanup()
+        elif self.max_bytes and self.open_size >= self.max_bytes:
+            self._rotate_by_size()
+
+    def _rotate_by_size(self):
+        """Move the full file to the next free `<name>.<n><ext>` and start a new one."""
+        self.open_file.close()
+        base, ext = os.path.splitext(self.open_filename)
+        index = 1
+        while os.path.exists(f"{base}.{index}{ext}") or os.path.exists(f"{base}.{index}{ext}.gz"):
+            index += 1
+        os.replace(self.open_filename, f"{base}.{index}{ext}")
+        self.open_file = self._open_location(self.open_filename)
+        self.open_size = 0
+        self._cleanup()
+
+    def _cleanup(self):
+        """Compress all rotated files and delete the ones past the retention limit."""
+        directory = os.path.dirname(self.open_filename) or "."
+        prefix = os.path.basename(self.filename.split("{date}")[0])
+        ext = os.path.splitext(self.filename)[1]
+        cutoff = datetime.datetime.now().timestamp() - self.retention_days * 86400
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            # Files being compressed are deleted by their compressor thread
+            if not name.startswith(prefix) or path == self.open_filename or path in self._compressing:
+                continue
+            try:
+                if self.retention_days and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    continue
+            except OSError:
+                # Deleted in the meantime, eg. by a compressor thread that just finished
+                continue
+            if self.compress and name.endswith(ext):
+                self._compress_async(path)
+
+    def _compress_async(self, path: str):
+        """Gzip a rotated file on a separate thread and delete the original."""
+        if path in self._compressing:
+            return
+        self._compressing.add(path)
+
+        def compress():
+            try:
+                with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(path)
+            except OSError as e:
+                print(f"Failed to compress log file {path}: {e}", file=sys.stderr)
+            finally:
+                self._compressing.discard(path)
+
+        self._compressors = [t for t in self._compressors if t.is_alive()]
+        thread = threading.Thread(target=compress, name="log-compress")
+        thread.start()
+        self._compressors.append(thread)
 
     def write(self, message: str):
         """
@@ -84,114 +168,294 @@ class FileManager:
 
         self._ensure_open()
         self.open_file.write(message)
+        self.open_size += len(message)
+
+    def flush(self):
+        """
+        Flush the file.
+        """
+        if self.open_file:
+            self.open_file.flush()
 
     def close(self):
         """
-        Close the file.
+        Close the file and wait for running compressions.
         """
         if self.open_file:
             self.open_file.close()
             self.open_file = None
             self.open_filename = None
+        for thread in self._compressors:
+            thread.join()
+        self._compressors = []
+
+
+class LogSink:
+    """
+    Writes log records to stdout and the log file on a background thread.
+    Producers only format the record and put it into a bounded queue.
+
+    Overflow policies when the queue is full:
+    - "block": wait until the writer has made room.
+    - "drop-debug-first": drop debug records, wait for room for all others.
+    - "sample": keep every `sample_rate`-th overflowing record and drop the rest. Errors are always kept.
+    """
+
+    POLICIES = ("block", "drop-debug-first", "sample")
+
+    def __init__(self, file_manager: FileManager, max_size: int, policy: str, sample_rate: int, batch_size: int):
+        """
+        Args:
+            file_manager (FileManager): The log file to write to. Only used by the writer thread.
+            max_size (int): Maximum number of queued records.
+            policy (str): Overflow policy, one of `LogSink.POLICIES`.
+            sample_rate (int): Every how many overflowing records one is kept with the "sample" policy.
+            batch_size (int): Maximum number of records written at once.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Invalid log overflow policy '{policy}'")
+        self.file_manager = file_manager
+        self.policy = policy
+        self.sample_rate = max(sample_rate, 1)
+        self.batch_size = batch_size
+        self._queue: queue.Queue[tuple[str, str] | None] = queue.Queue(max_size)
+        self._overflows = 0
+        self._lock = threading.Lock()
+        # Dropped records by level name
+        self.dropped: dict[str, int] = {}
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="log-writer", daemon=True)
+        self._writer.start()
+
+    def put(self, level: int, line: str, colored: str):
+        """
+        Queue a formatted record, applying the overflow policy if the queue is full.
+        Args:
+            level (int): The log level of the record.
+            line (str): The record as written to the file.
+            colored (str): The record as printed to stdout.
+        """
+        if self._closed:
+            return
+        record = (line, colored)
+        try:
+            self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.policy == "drop-debug-first" and level <= logging.DEBUG:
+            self._drop(level)
+            return
+        if self.policy == "sample" and level < logging.ERROR:
+            with self._lock:
+                self._overflows += 1
+                keep = self._overflows % self.sample_rate == 0
+            if not keep:
+                self._drop(level)
+                return
+        self._queue.put(record)
+
+    def _drop(self, level: int):
+        """Count a dropped record."""
+        name = level_names.get(level, "UNKNOWN")
+        with self._lock:
+            self.dropped[name] = self.dropped.get(name, 0) + 1
+
+    def _writer_loop(self):
+        """Write queued records in batches until the sink is closed."""
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            while record is not None and len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(record)
+            records = [r for r in batch if r is not None]
+            try:
+                if records:
+                    sys.stdout.write("".join(r[1] for r in records))
+                    sys.stdout.flush()
+                    self.file_manager.write("".join(r[0] for r in records))
+                    self.file_manager.flush()
+            except Exception as e:
+                # Logging must never take the bot down
+                print(f"Failed to write log records: {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(records) != len(batch):
+                return
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the sink counters.
+        Returns:
+            dict[str, int]: Number of queued records and dropped records per level.
+        """
+        with self._lock:
+            stats = {"queued": self._queue.qsize()}
+            stats.update({f"dropped_{name.lower()}": count for name,
+                         count in self.dropped.items()})
+            return stats
+
+    def flush(self):
+        """
+        Block until all queued records have been written.
+        """
+        if not self._closed:
+            self._queue.join()
+
+    def close(self):
+        """
+        Write all queued records, stop the writer thread and close the log file.
+        """
+        if self._closed:
+            return
+        self._queue.put(None)
+        self._closed = True
+        self._writer.join()
+        self.file_manager.close()
 
 
 class Logger:
     """
     Logger class for writing log messages to a file and printing them to stdout.
+    Records are written by a `LogSink` on a background thread.
     """
 
-    def __init__(self, filename: str, min_level: int):
+    def __init__(self, filename: str, min_level: int, queue_size: int = 10000, overflow_policy: str = "drop-debug-first",
+                 sample_rate: int = 10, batch_size: int = 256, json_lines: bool = False,
+                 max_bytes: int = 0, retention_days: int = 0, compress: bool = True):
         """
         Initialize the Logger.
         Args:
             filename (str): Path to the log file.
+            min_level (int): Records below this level are ignored.
+            queue_size (int): Maximum number of records waiting to be written.
+            overflow_policy (str): What to do when the queue is full, see `LogSink`.
+            sample_rate (int): Every how many overflowing records one is kept with the "sample" policy.
+            batch_size (int): Maximum number of records written at once.
+            json_lines (bool): Whether to write one JSON object per record to the file instead of text.
+            max_bytes (int): Size after which the log file is rotated. 0 only rotates daily.
+            retention_days (int): Days after which rotated log files are deleted. 0 keeps them forever.
+            compress (bool): Whether to gzip rotated log files.
         """
         self.min_level = min_level
-        self.file_manager = FileManager(filename)
+        self.json_lines = json_lines
+        self.file_manager = FileManager(
+            filename, max_bytes, retention_days, compress)
+        self.sink = LogSink(self.file_manager, queue_size,
+                            overflow_policy, sample_rate, batch_size)
+        # Source file path -> dotted module name shown in log lines
+        self._module_names: dict[str, str] = {}
+
+    def flush(self):
+        """
+        Block until all logged records have been written.
+        """
+        self.sink.flush()
 
     def close(self):
         """
-        Close the file manager.
+        Write all logged records and close the log file.
         """
-        self.file_manager.close()
+        self.sink.close()
 
-    def _format_frame(self, frame: traceback.FrameSummary) -> str:
+    def _format_location(self, filename: str, lineno: int, func: str) -> str:
         """
-        Format a single frame from the stack trace.
+        Format a code location as "a.b:123:func_name".
         Args:
-            frame (traceback.FrameSummary): The frame to format.
+            filename (str): Path of the source file.
+            lineno (int): Line number.
+            func (str): Function name.
         Returns:
-            str: Formatted string of the frame.
+            str: Formatted location.
         """
-
-        # Turn "/bla/src/a/b.py" to "a.b:123:func_name"
-        filename = frame.filename.split(
-            "src/")[-1].replace("/", ".").replace(".py", "")
-        lno = frame.lineno
-        func = frame.name
-        return f"{filename}:{lno}:{func}"
-
-    def _get_formatted_stack(self, stacksum: traceback.StackSummary) -> list[str]:
+        module = self._module_names.get(filename)
+        if module is None:
+            # Turn "/bla/src/a/b.py" to "a.b"
+            module = filename.split(
+                "src/")[-1].replace("/", ".").replace(".py", "")
+            self._module_names[filename] = module
+        return f"{module}:{lineno}:{func}"
+
+    def _is_skipped(self, filename: str, func: str) -> bool:
         """
-        Format a stack trace summary into a list of formatted frame strings.
+        Check if a frame belongs to the logging or error handling machinery.
         Args:
-            stacksum (traceback.StackSummary): The stack summary to format.
+            filename (str): Path of the source file.
+            func (str): Function name.
         Returns:
-            list[str]: List of formatted frame strings.
+            bool: True if the frame should not be reported as the call site.
         """
-        formatted_stack = []
-        for frame in stacksum:
-            # Skip if the frame is from the logging function itself
-            if frame.filename.endswith("log.py"):
-                continue
-            # Skip frames that are part of the error handling
-            if frame.name == "handle_error":
-                continue
-            if frame.filename.endswith("error.py"):
-                continue
-            if frame.filename.endswith("res.py"):
-                continue
-            formatted_stack.append(self._format_frame(frame))
-        return formatted_stack
+        return filename.endswith(SKIPPED_FILES) or func in SKIPPED_FUNCTIONS
 
-    def _get_interaction_info(self, interaction: discord.Interaction | None) -> str:
+    def _find_call_site(self) -> str:
+        """
+        Find the innermost frame outside of the logging and error handling machinery.
+        Only walks frame references, no stack summary is built.
+        Returns:
+            str: Formatted location of the call site, or "unknown".
         """
-        Get formatted interaction information if available.
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            if not self._is_skipped(code.co_filename, code.co_name):
+                return self._format_location(code.co_filename, frame.f_lineno, code.co_name)
+            frame = frame.f_back
+        return "unknown"
+
+    def _get_interaction_fields(self, interaction: discord.Interaction | None) -> dict[str, int | str | None]:
+        """
+        Get the context of an interaction as separate fields.
         Args:
             interaction (discord.Interaction | None): The interaction context.
+        Returns:
+            dict[str, int | str | None]: User, guild and channel ids and names, or an empty dict without an interaction.
+        """
+        if not interaction:
+            return {}
+        return {
+            "user_id": interaction.user.id,
+            "user_name": interaction.user.name,
+            "guild_id": interaction.guild.id if interaction.guild else None,
+            "guild_name": interaction.guild.name if interaction.guild else None,
+            "channel_id": interaction.channel.id if interaction.channel else None,
+            "channel_name": getattr(interaction.channel, "name", None) if interaction.channel else None,
+        }
+
+    def _get_interaction_info(self, fields: dict[str, int | str | None]) -> str:
+        """
+        Format interaction information if available.
+        Args:
+            fields (dict[str, int | str | None]): The fields returned by `_get_interaction_fields`.
         Returns:
             str: Formatted interaction information.
         """
-        if interaction:
-            user_id = str(interaction.user.id)
-            user_name = interaction.user.name
-            guild_id = str(
-                interaction.guild.id) if interaction.guild else "None"
-            guild_name = interaction.guild.name if interaction.guild else "None"
-            channel_id = str(
-                interaction.channel.id) if interaction.channel else "None"
-            channel_name = interaction.channel.name if interaction.channel else "None"
-            return f" {{{user_name}/{user_id} in {guild_name}/{guild_id} #{channel_name}/{channel_id}}}"
+        if fields:
+            return (f" {{{fields['user_name']}/{fields['user_id']} in {fields['guild_name']}/{fields['guild_id']}"
+                    f" #{fields['channel_name']}/{fields['channel_id']}}}")
         return ""
 
-    def _log(self, level: int, message: str, interaction: discord.Interaction | None, stack: traceback.StackSummary, extended_traceback: bool = False) -> None:
+    def _log(self, level: int, message: str, interaction: discord.Interaction | None, location: str, stack: traceback.StackSummary | None = None) -> None:
         """
         Core logging method that formats and outputs log messages.
+        The caller is responsible for checking `min_level` first.
         Args:
             level (int): The log level (e.g., logging.DEBUG, logging.INFO).
             message (str): The message to log.
             interaction (discord.Interaction | None): Optional interaction context.
-            stack (traceback.StackSummary): The stack trace information.
-            extended_traceback (bool): Whether to include full traceback. Defaults to False.
+            location (str): The formatted call site.
+            stack (traceback.StackSummary | None): Full stack to print as a traceback, or None to omit it.
         """
-
-        if level < self.min_level:
-            return
+        level_no = level
         level = level_names.get(level, "UNKNOWN")
 
-        formatted_stack = self._get_formatted_stack(stack)
-        location = formatted_stack[-1] if formatted_stack else "unknown"
-        interaction_info = self._get_interaction_info(interaction)
+        fields = self._get_interaction_fields(interaction)
+        interaction_info = self._get_interaction_info(fields)
 
         now = datetime.datetime.now()
         t = now.strftime("%Y-%m-%d %H:%M:%S")
@@ -212,25 +476,33 @@ class Logger:
             f"{Col.ORANGE}{interaction_info}{Col.RESET}\n"
         )
 
-        if extended_traceback and formatted_stack:
-            traceback_list = "\n".join(traceback.format_list(stack))
+        traceback_lines = traceback.format_list(stack) if stack else None
+        if traceback_lines:
+            traceback_list = "\n".join(traceback_lines)
             msg += f"Traceback:\n{traceback_list}\n"
             msg_colored += f"{Col.RED}Traceback:\n{Col.RESET}{traceback_list}\n"
 
-        print(msg_colored, end='')
+        if self.json_lines:
+            record = {"time": now.isoformat(), "level": level,
+                      "location": location, "message": str(message)}
+            record.update(fields)
+            if traceback_lines:
+                record["traceback"] = traceback_lines
+            msg = json.dumps(record, ensure_ascii=False) + "\n"
 
-        self.file_manager.write(msg)
+        self.sink.put(level_no, msg, msg_colored)
 
-    def _log_str(self, level: str, message: str, interaction: discord.Interaction | None) -> None:
+    def _log_str(self, level: int, message: str, interaction: discord.Interaction | None) -> None:
         """
         Log a string message with the specified level.
         Args:
-            level (str): The log level.
+            level (int): The log level.
             message (str): The message to log.
             interaction (discord.Interaction | None): Optional interaction context.
         """
-        stack = traceback.extract_stack()
-        self._log(level, message, interaction, stack, False)
+        if level < self.min_level:
+            return
+        self._log(level, message, interaction, self._find_call_site())
 
     def debug(self, message: str, interaction: discord.Interaction | None = None):
         """
@@ -266,5 +538,13 @@ class Logger:
             error (Error): The error object to log.
             interaction (discord.Interaction | None): Optional interaction context.
         """
-        self._log(logging.ERROR, error.message, interaction,
-                  error.stack, error.show_traceback)
+        if logging.ERROR < self.min_level:
+            return
+        location = "unknown"
+        for filename, lineno, name in error.frames:
+            if not self._is_skipped(filename, name):
+                location = self._format_location(filename, lineno, name)
+                break
+        # The stack summary is only built if the traceback is printed
+        stack = error.stack if error.show_traceback and location != "unknown" else None
+        self._log(logging.ERROR, error.message, interaction, location, stack)
@@ -0,0 +1,110 @@
+"""
+Generated localization table of the slash commands.
+The names and descriptions of all commands and options are flattened once from the `command` group
+of every language pack and cached in a JSON file, keyed by a hash of the files in `lang/`.
+`RD.command` and `RL.command` are served from this table, so command decorators read plain dicts.
+
+Run `python -m src.res.command_table` to generate the table ahead of time, eg. when building an image.
+"""
+import glob
+import hashlib
+import json
+import os
+from .log_helper import logger
+from .packs import LANG_DIR, LanguageRegistry, flatten_group
+
+# Bump when the layout of the table changes, so old cache files are regenerated
+TABLE_VERSION = 1
+
+
+def lang_files_hash() -> str:
+    """
+    Hash the source of all language packs.
+    Returns:
+        str: Hex digest that changes whenever a file in `lang/` changes.
+    """
+    digest = hashlib.sha256(f"v{TABLE_VERSION}".encode())
+    paths = glob.glob(os.path.join(LANG_DIR, "*.py")) + \
+        glob.glob(os.path.join(LANG_DIR, "*.json"))
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_command_table(languages: LanguageRegistry, default_lang: str) -> dict:
+    """
+    Generate the command localization table from the language packs. Loads all packs.
+    Args:
+        languages (LanguageRegistry): The registered language packs.
+        default_lang (str): Locale code of the default language.
+    Returns:
+        dict: "default" maps every dotted path below `command` to its string in the default language,
+        "localized" maps it to a dict of its strings by locale code.
+    """
+    flat = {}
+    for lang_code in languages.codes():
+        flat[lang_code] = {}
+        flatten_group(languages.get(lang_code).command, "command", flat[lang_code])
+
+    localized = {
+        path: {lang_code: strings[path] for lang_code, strings in flat.items() if path in strings}
+        for path in flat[default_lang]
+    }
+    return {"default": flat[default_lang], "localized": localized}
+
+
+def write_command_table(filename: str, table: dict, lang_hash: str):
+    """
+    Write the table to the cache file. Failing to write only logs a warning.
+    Args:
+        filename (str): Path of the cache file.
+        table (dict): The table returned by `build_command_table`.
+        lang_hash (str): The hash returned by `lang_files_hash`.
+    """
+    try:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        partial = filename + ".part"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump({"hash": lang_hash, **table}, f, ensure_ascii=False)
+        os.replace(partial, filename)
+    except OSError as e:
+        logger().warning(f"Could not write the command table to {filename}: {e}")
+
+
+def load_command_table(filename: str, languages: LanguageRegistry, default_lang: str) -> dict:
+    """
+    Load the command table from the cache file, or generate and cache it if the file is missing or stale.
+    The language packs are only loaded when the table is generated.
+    Args:
+        filename (str): Path of the cache file.
+        languages (LanguageRegistry): The registered language packs.
+        default_lang (str): Locale code of the default language.
+    Returns:
+        dict: The table, see `build_command_table`.
+    """
+    lang_hash = lang_files_hash()
+    try:
+        with open(filename, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("hash") == lang_hash:
+            return cached
+    except (OSError, ValueError):
+        pass
+
+    logger().info("Generating the command localization table.")
+    table = build_command_table(languages, default_lang)
+    write_command_table(filename, table, lang_hash)
+    return table
+
+
+if __name__ == "__main__":
+    from src.constants import C
+    from .res import languages, DEFAULT_LANG
+
+    write_command_table(C.res_command_table_file, build_command_table(
+        languages, DEFAULT_LANG), lang_files_hash())
+    print(f"Command table written to {C.res_command_table_file}")
@@ -168,6 +168,14 @@ class ResDE:
     giveaway_role_perms_error: str = "⚠️ Konnte %s nicht an %s vergeben (fehlende Rechte)."
     giveaway_not_found: str = "Giveaway nicht in der Datenbank gefunden."
     giveaway_already_ended: str = "Dieses Giveaway ist bereits beendet."
+    giveaway_not_ended: str = "Dieses Giveaway läuft noch."
+    giveaway_reroll_announcement: str = "🎲 Neu ausgelost: Glückwunsch %s! Du hast **%s** gewonnen!"
+    giveaway_reroll_no_participants: str = "Es gibt keine Teilnehmer, die noch nicht gewonnen haben."
+    giveaway_channel_not_found: str = "Der Kanal des Giveaways wurde nicht gefunden."
+    giveaway_invalid_message_id: str = "❌ Ungültige Nachrichten-ID."
+    giveaway_rerolled: str = "✅ Neue Gewinner wurden ausgelost."
+    giveaway_bonus_role: str = "🍀 Bonus"
+    giveaway_bonus_role_value: str = "Mitglieder von <@&%s> haben eine %s-fache Gewinnchance"
     giveaway_no_role: str = "Keine Rolle"
 
     # setup.py
@@ -239,6 +247,16 @@ class ResDE:
     team_wechsel_user_missing_from_role: str = "Der Benutzer hat die alte Rolle nicht."
     team_wechsel_user_already_has_to_role: str = "Der Benutzer hat die neue Rolle bereits."
 
+    # Role assignment
+    role_change_add: str = "%s +%s"
+    role_change_remove: str = "%s −%s"
+    role_batch_title: str = "🎭 Rollen"
+    role_batch_done: str = "✅ Erledigt: %s"
+    role_batch_queued: str = "⏳ Wird später erneut versucht: %s"
+    role_batch_forbidden: str = "⚠️ Fehlende Rechte: %s"
+    role_batch_not_found: str = "➖ Nicht mehr auf dem Server: %s"
+    role_batch_failed: str = "❌ Fehlgeschlagen: %s"
+
     # Application
     application_cancelled: str = "Die Bewerbung wurde abgebrochen."
     application_info: str = "Bitte gib die Informationen für deine Bewerbung ein."
@@ -274,6 +292,18 @@ class ResDE:
     help_tutorial_text: str = f"**Setup-Reihenfolge:**\n1️⃣ `/setup tickets` - Kategorie für neue Tickets festlegen\n2️⃣ `/setup transcript` - Kategorie für geschlossene Tickets festlegen\n3️⃣ `/setup modroles` - Moderator-Rollen auswählen\n4️⃣ `/setup logchannel` - Log-Channel für Team-Aktionen *(optional)*\n5️⃣ `/createpanel` - Ticket-Panel für User erstellen\n\n✨ **Tipp:** Deine Frage wurde nicht beantwortet? Erstelle auf unserem [Support-Server]({C.support_guild_invite_link}) ein Ticket!"
     help_footer: str = f"{C.bot_name} - Tickets & more"
 
+    # Stats command
+    stats_embed_title: str = "📊 Statistiken"
+    stats_ticket_cache: str = "Ticket-Cache"
+    stats_constant_cache: str = "Einstellungs-Cache"
+    stats_category_cache: str = "Kategorie-Cache"
+    stats_cache_hit_rate: str = "Trefferquote: %.1f%% (%d von %d)"
+    stats_backup: str = "Datenbank-Backup"
+    stats_backup_none: str = "Seit dem Start wurde noch kein Backup erstellt."
+    stats_backup_last: str = "Letztes Backup %s (%d Seiten in %.2fs)"
+    stats_backup_running: str = "Ein Backup läuft gerade."
+    stats_logging: str = "Logging"
+
     # Timeout
     timeout_success: str = "✅ %s wurde für %s getimeoutet. Grund: %s"
     timeout_success_no_reason: str = "✅ %s wurde für %s getimeoutet."
@@ -714,9 +744,27 @@ class ResDE:
                 winner_count_desc: str = "Anzahl der Gewinner"
                 role_desc: str = "Rolle, die die Gewinner erhalten (optional)"
                 prize_desc: str = "Preis des Giveaways"
+                bonus_role: str = "bonusrolle"
+                bonus: str = "bonus"
+                bonus_role_desc: str = "Rolle, deren Mitglieder eine höhere Gewinnchance haben (optional)"
+                bonus_desc: str = "Wie viel Mal höher die Gewinnchance der Bonusrolle ist"
             option = Option()
         giveaway = Giveaway()
 
+        @dataclass
+        class GiveawayReroll:
+            name: str = "giveaway_neu_auslosen"
+            desc: str = "Lost neue Gewinner eines beendeten Giveaways aus."
+
+            @dataclass
+            class Option:
+                message_id: str = "nachrichten_id"
+                winner_count: str = "gewinner"
+                message_id_desc: str = "ID der Giveaway-Nachricht"
+                winner_count_desc: str = "Anzahl der neuen Gewinner"
+            option = Option()
+        giveaway_reroll = GiveawayReroll()
+
         @dataclass
         class Team:
             name: str = "team"
@@ -917,6 +965,12 @@ class ResDE:
             desc: str = "Zeigt alle verfügbaren Bot-Befehle an."
         help = Help()
 
+        @dataclass
+        class Stats:
+            name: str = "stats"
+            desc: str = "Zeigt Laufzeitstatistiken des Bots an."
+        stats = Stats()
+
         @dataclass
         class Category:
             name: str = "category"
@@ -168,6 +168,14 @@ class ResEN:
     giveaway_role_perms_error: str = "⚠️ Could not award %s to %s (missing permissions)."
     giveaway_not_found: str = "Giveaway not found in the database."
     giveaway_already_ended: str = "This giveaway has already ended."
+    giveaway_not_ended: str = "This giveaway is still running."
+    giveaway_reroll_announcement: str = "🎲 Re-rolled: Congratulations %s! You have won **%s**!"
+    giveaway_reroll_no_participants: str = "There are no participants left who haven't won yet."
+    giveaway_channel_not_found: str = "The channel of the giveaway was not found."
+    giveaway_invalid_message_id: str = "❌ Invalid message ID."
+    giveaway_rerolled: str = "✅ New winners have been drawn."
+    giveaway_bonus_role: str = "🍀 Bonus"
+    giveaway_bonus_role_value: str = "Members of <@&%s> have a %sx chance to win"
     giveaway_no_role: str = "No role"
 
     # setup.py
@@ -239,6 +247,16 @@ class ResEN:
     team_wechsel_user_missing_from_role: str = "The user does not have the old role."
     team_wechsel_user_already_has_to_role: str = "The user already has the new role."
 
+    # Role assignment
+    role_change_add: str = "%s +%s"
+    role_change_remove: str = "%s −%s"
+    role_batch_title: str = "🎭 Roles"
+    role_batch_done: str = "✅ Done: %s"
+    role_batch_queued: str = "⏳ Will be retried later: %s"
+    role_batch_forbidden: str = "⚠️ Missing permissions: %s"
+    role_batch_not_found: str = "➖ No longer on the server: %s"
+    role_batch_failed: str = "❌ Failed: %s"
+
     # Application
     application_cancelled: str = "The application has been cancelled."
     application_info: str = "Please enter the information for your application."
@@ -274,6 +292,18 @@ class ResEN:
     help_tutorial_text: str = f"**Setup Order:**\n1️⃣ `/setup tickets` - Set category for new tickets\n2️⃣ `/setup transcript` - Set category for closed tickets\n3️⃣ `/setup modroles` - Select moderator roles\n4️⃣ `/setup logchannel` - Log channel for team actions *(optional)*\n5️⃣ `/createpanel` - Create ticket panel for users\n\n✨ **Tip:** Your question was not answered? Create a ticket on our [Support Server]({C.support_guild_invite_link})!"
     help_footer: str = f"{C.bot_name} - Tickets & more"
 
+    # Stats command
+    stats_embed_title: str = "📊 Statistics"
+    stats_ticket_cache: str = "Ticket cache"
+    stats_constant_cache: str = "Settings cache"
+    stats_category_cache: str = "Category cache"
+    stats_cache_hit_rate: str = "Hit rate: %.1f%% (%d of %d)"
+    stats_backup: str = "Database backup"
+    stats_backup_none: str = "No backup has been written since the start."
+    stats_backup_last: str = "Last backup %s (%d pages in %.2fs)"
+    stats_backup_running: str = "A backup is running right now."
+    stats_logging: str = "Logging"
+
     # Timeout
     timeout_success: str = "✅ %s has been timed out for %s. Reason: %s"
     timeout_success_no_reason: str = "✅ %s has been timed out for %s."
@@ -714,9 +744,27 @@ class ResEN:
                 winner_count_desc: str = "Number of winners"
                 role_desc: str = "Role that winners will receive (optional)"
                 prize_desc: str = "Prize of the giveaway"
+                bonus_role: str = "bonus_role"
+                bonus: str = "bonus"
+                bonus_role_desc: str = "Role whose members have a higher chance to win (optional)"
+                bonus_desc: str = "How many times higher the chance of the bonus role is"
             option = Option()
         giveaway = Giveaway()
 
+        @dataclass
+        class GiveawayReroll:
+            name: str = "giveaway_reroll"
+            desc: str = "Draw new winners of an ended giveaway."
+
+            @dataclass
+            class Option:
+                message_id: str = "message_id"
+                winner_count: str = "winners"
+                message_id_desc: str = "ID of the giveaway message"
+                winner_count_desc: str = "Number of new winners"
+            option = Option()
+        giveaway_reroll = GiveawayReroll()
+
         @dataclass
         class Team:
             name: str = "team"
@@ -917,6 +965,12 @@ class ResEN:
             desc: str = "Shows all available bot commands."
         help = Help()
 
+        @dataclass
+        class Stats:
+            name: str = "stats"
+            desc: str = "Shows runtime statistics of the bot."
+        stats = Stats()
+
         @dataclass
         class Category:
             name: str = "category"
@@ -0,0 +1,201 @@
+"""
+Language packs and their compiled form.
+A language pack is loaded and compiled into a tree of ResourceGroup objects only the first time
+its locale is used, so adding languages does not add to import time or memory.
+"""
+import dataclasses
+import importlib
+import json
+import os
+import threading
+import time
+from .log_helper import logger
+
+LANG_DIR = os.path.join(os.path.dirname(__file__), "lang")
+
+
+class LocaleUnknownString(str):
+    """
+    This class is used to represent a path with no associated resource string.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __getattr__(self, item):
+        self.path += f".{item}"
+        return self
+
+    def __str__(self):
+        return self.path
+
+    def __repr__(self):
+        return f"LocaleUnknownString({self.path})"
+
+
+class ResourceGroup:
+    """
+    A compiled group of resource strings of one locale.
+    Strings and subgroups are plain instance attributes, so a lookup is a single attribute access.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def __getattr__(self, item):
+        # Only called if the attribute does not exist, so return a placeholder
+        logger().warning(
+            f"Resource '{self._path}.{item}' not found, returning LocaleUnknownString")
+        return LocaleUnknownString(f"{self._path}.{item}")
+
+
+def compile_resources(obj: object, path: str = "R") -> ResourceGroup:
+    """
+    Flatten a resource dataclass or a nested dict of strings into a tree of ResourceGroup objects.
+    Args:
+        obj (object): Resource dataclass (class or instance), eg. ResDE, or a dict loaded from a data file.
+        path (str): Dotted path of `obj`, used for warnings about missing resources.
+    Returns:
+        ResourceGroup: The compiled group.
+    """
+    group = ResourceGroup(path)
+    if isinstance(obj, dict):
+        items = obj.items()
+    else:
+        items = ((name, getattr(obj, name))
+                 for name in dir(obj) if not name.startswith("_"))
+    for name, attr in items:
+        if isinstance(attr, type):
+            # Nested dataclass types; the strings are read from their instances
+            continue
+        if isinstance(attr, dict) or dataclasses.is_dataclass(attr):
+            # A further subgroup
+            attr = compile_resources(attr, f"{path}.{name}")
+        setattr(group, name, attr)
+    return group
+
+
+def group_from_table(table: dict[str, object], path: str) -> ResourceGroup:
+    """
+    Build a tree of ResourceGroup objects from a table of dotted paths.
+    Args:
+        table (dict[str, object]): Values by dotted path, eg. {"command.ping.name": "ping"}.
+        path (str): Dotted path of the root group, used for warnings about missing resources.
+    Returns:
+        ResourceGroup: The root group.
+    """
+    root = ResourceGroup(path)
+    for key, value in table.items():
+        group = root
+        *parents, name = key.split(".")
+        for parent in parents:
+            child = group.__dict__.get(parent)
+            if child is None:
+                child = ResourceGroup(f"{group._path}.{parent}")
+                setattr(group, parent, child)
+            group = child
+        setattr(group, name, value)
+    return root
+
+
+def flatten_group(group: ResourceGroup, path: str, out: dict[str, object]):
+    """
+    Add all strings below a compiled group to `out`, keyed by their dotted path.
+    Args:
+        group (ResourceGroup): The compiled group.
+        path (str): Dotted path of `group`.
+        out (dict[str, object]): Receives the strings.
+    """
+    for name, attr in vars(group).items():
+        if name == "_path":
+            continue
+        if isinstance(attr, ResourceGroup):
+            flatten_group(attr, f"{path}.{name}", out)
+        else:
+            out[f"{path}.{name}"] = attr
+
+
+class LanguageRegistry:
+    """
+    Registry of the available language packs.
+    Packs are registered by locale code with the source they are loaded from, and loaded on first use.
+    """
+
+    def __init__(self):
+        self._sources: dict[str, str] = {}
+        self._info: list[dict[str, str]] = []
+        self._compiled: dict[str, ResourceGroup] = {}
+        self._lock = threading.Lock()
+
+    def register(self, code: str, native_name: str, emoji: str, source: str):
+        """
+        Register a language pack.
+        Args:
+            code (str): Discord locale code, see https://discord.com/developers/docs/reference#locales
+            native_name (str): Name of the language in the language itself.
+            emoji (str): Flag shown next to the language.
+            source (str): Either "module:attribute" of a resource dataclass, eg. "src.res.lang.de:ResDE",
+                or the name of a JSON file in `src/res/lang/` with the same nested structure.
+        """
+        self._sources[code] = source
+        self._info.append(
+            {"code": code, "native_name": native_name, "emoji": emoji})
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._sources
+
+    def codes(self) -> list[str]:
+        """
+        Returns:
+            list[str]: The locale codes of all registered packs.
+        """
+        return list(self._sources)
+
+    def info(self) -> list[dict[str, str]]:
+        """
+        Returns:
+            list[dict[str, str]]: Code, native name and emoji of all registered packs.
+        """
+        return self._info
+
+    def loaded(self) -> list[str]:
+        """
+        Returns:
+            list[str]: The locale codes of the packs loaded so far.
+        """
+        return list(self._compiled)
+
+    def get(self, code: str) -> ResourceGroup:
+        """
+        Get the compiled resources of a registered locale, loading the pack on first use.
+        Args:
+            code (str): Locale code.
+        Returns:
+            ResourceGroup: The compiled resources.
+        """
+        compiled = self._compiled.get(code)
+        if compiled is None:
+            compiled = self._load(code)
+        return compiled
+
+    def _load(self, code: str) -> ResourceGroup:
+        """Load and compile a pack. Only one thread loads a pack, the others wait for it."""
+        with self._lock:
+            compiled = self._compiled.get(code)
+            if compiled is not None:
+                return compiled
+
+            start = time.perf_counter()
+            source = self._sources[code]
+            if source.endswith(".json"):
+                with open(os.path.join(LANG_DIR, source), encoding="utf-8") as f:
+                    pack = json.load(f)
+            else:
+                module, attribute = source.split(":")
+                pack = getattr(importlib.import_module(module), attribute)
+            compiled = compile_resources(pack)
+            self._compiled[code] = compiled
+
+        logger().info(
+            f"Loaded language pack '{code}' in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return compiled
@@ -1,38 +1,33 @@
-import asyncio
-import dataclasses
-import threading
-from typing import Annotated, Type
+from contextvars import ContextVar
+from typing import Annotated, Type, TYPE_CHECKING
 from src.constants import C
 from enum import Enum
-from .lang.de import ResDE
-from .lang.en import ResEN
 from .log_helper import logger
+from .command_table import load_command_table
+from .packs import LanguageRegistry, ResourceGroup, group_from_table
 
-task_locales: dict[int, str] = {}
-tglock = threading.Lock()
+if TYPE_CHECKING:
+    from .lang.de import ResDE
+else:
+    # The packs are loaded on first use, see LanguageRegistry
+    ResDE = object
 
 # List of valid discord locales:
 # https://discord.com/developers/docs/reference#locales
-locale_mapping = {
-    "de": ResDE,
-    "en-US": ResEN,
-}
-
-lang_info = [
-    {
-        "code": "de",
-        "native_name": "Deutsch",
-        "emoji": "🇩🇪",
-    },
-    {
-        "code": "en-US",
-        "native_name": "English",
-        "emoji": "🇺🇸",
-    }
-]
+languages = LanguageRegistry()
+languages.register("de", "Deutsch", "🇩🇪", "src.res.lang.de:ResDE")
+languages.register("en-US", "English", "🇺🇸", "src.res.lang.en:ResEN")
+
+lang_info = languages.info()
 
 DEFAULT_LANG = "de"
 
+# Locale of the current task, set by `R.init` and `R.initlocale`
+current_locale: ContextVar[str] = ContextVar("current_locale", default=DEFAULT_LANG)
+
+# Configured locale of every guild that has one, loaded by `R.load_guild_locales`
+guild_locales: dict[int, str] = {}
+
 
 class RMode(Enum):
     NORMAL = 1
@@ -52,47 +47,29 @@ class LocaleDictionary(dict):
             return super().__getattr__(item)
 
 
-UNIQUE = object()
-
+# Command names and descriptions used by the command decorators, see command_table.py
+command_groups: dict[RMode, ResourceGroup] = {}
 
-class LocaleObject(object):
-    def __init__(self, obj: object, path: str):
-        self.obj = obj
-        self.path = path
-
-    def __getattr__(self, item):
-        attr = getattr(self.obj, item, UNIQUE)
-        if attr is UNIQUE:
-            # If the attribute does not exist, return a placeholder
-            logger().warning(
-                f"Resource '{self.path}.{item}' not found, returning LocaleUnknownString")
-            return LocaleUnknownString(f"{self.path}.{item}")
-        if dataclasses.is_dataclass(attr):
-            # If this is a further subgroup
-            return LocaleObject(attr, f"{self.path}.{item}")
-        else:
-            # If we reached the end, log the attribute access
-            logger().debug(f"Accessing resource '{self.path}.{item}'")
-            return attr
 
-
-class LocaleUnknownString(str):
+def get_command_group(mode: RMode) -> ResourceGroup:
     """
-    This class is used to represent a path with no associated resource string.
+    Get `RD.command` or `RL.command`. The command table is loaded on first use and not at import,
+    because loading it may log and `src.utils` imports this module before its logger exists.
+    Args:
+        mode (RMode): RMode.DEFAULT_LANG or RMode.LOCALIZED.
+    Returns:
+        ResourceGroup: The `command` group of the table.
     """
-
-    def __init__(self, path: str):
-        self.path = path
-
-    def __getattr__(self, item):
-        self.path += f".{item}"
-        return self
-
-    def __str__(self):
-        return self.path
-
-    def __repr__(self):
-        return f"LocaleUnknownString({self.path})"
+    group = command_groups.get(mode)
+    if group is None:
+        table = load_command_table(
+            C.res_command_table_file, languages, DEFAULT_LANG)
+        command_groups[RMode.DEFAULT_LANG] = group_from_table(
+            table["default"], "RD").command
+        command_groups[RMode.LOCALIZED] = group_from_table(
+            table["localized"], "RL").command
+        group = command_groups[mode]
+    return group
 
 
 class Resources:
@@ -104,94 +81,79 @@ class Resources:
         """
         self.mode = mode
 
-    async def initlocale(self, locale: str):
-        return await self._set_locale(locale)
+    def initlocale(self, locale: str):
+        """
+        Configure the locale for resources for this task directly, eg. to the locale of a user.
+        Args:
+            locale (str): The locale code.
+        """
+        self._set_locale(locale)
 
-    async def init(self, guild_id: int):
+    def init(self, guild_id: int | None):
         """
         Call this method before the `R` object is used in a task
         to configure the locale for resources for this task.
         The locale will be retrieved based on the guild's settings.
         Can be called multiple times to switch the guild/locale used by the task.
         """
+        self._set_locale(guild_locales.get(guild_id, DEFAULT_LANG))
 
+    def load_guild_locales(self):
+        """
+        Load the configured locale of all guilds from the database.
+        Must be called once after the database is connected, before `init` is used.
+        """
         from src.database import db
 
-        # Get the locale configured for this guild
-        locale = db.constant.get(C.DBKey.locale, guild_id)
-        if locale is None:
-            locale = DEFAULT_LANG
+        locales = db.sync.constant.get_all(C.DBKey.locale)
+        guild_locales.clear()
+        guild_locales.update(locales)
+        logger().info(f"Loaded the locale of {len(locales)} guilds.")
 
-        return await self._set_locale(locale)
+    def set_guild_locale(self, guild_id: int, locale: str):
+        """
+        Update the locale of a guild after it was changed in the database.
+        Args:
+            guild_id (int): Guild ID.
+            locale (str): The new locale code.
+        """
+        guild_locales[guild_id] = locale
 
-    async def _set_locale(self, locale: str):
+    def _set_locale(self, locale: str):
         if self.mode != RMode.NORMAL:
             raise RuntimeError(
                 "Can only set locale in NORMAL mode"
             )
-        if locale not in locale_mapping:
+        if locale not in languages:
             # Unknown or unsupported locale
             locale = DEFAULT_LANG
 
-        # Get id of this asyncio task
-        current_task = asyncio.current_task()
-        _id = id(current_task)
+        logger().debug(f"Initializing resources with locale '{locale}'")
 
-        logger().debug(
-            f"Initializing resources for task {_id} with locale '{locale}'"
-        )
-
-        # Store the locale for this task
-        with tglock:
-            task_locales[_id] = locale
-
-        # When the task finishes, its id might be reused,
-        # so we need to remove it from the task_locales dict
-        current_task.add_done_callback(
-            self._create_on_task_finished(_id)
-        )
-
-    def _create_on_task_finished(self, _id: int):
-        def _on_task_finished(task: asyncio.Task):
-            with tglock:
-                task_locales.pop(_id, None)
-        return _on_task_finished
+        # Store the locale in the current context. It only applies to the current task
+        # and to tasks created by it afterwards, eg. with asyncio.gather
+        current_locale.set(locale)
 
     def __getattr__(self, item):
         if self.mode == RMode.DEFAULT_LANG:
             # If this is the default resources instance,
             # we don't need to check the task id
-            res_class = locale_mapping.get(DEFAULT_LANG, ResDE)
-            return getattr(res_class, item)
+            if item == "command":
+                return get_command_group(self.mode)
+            return getattr(languages.get(DEFAULT_LANG), item)
         elif self.mode == RMode.LOCALIZED:
+            if item == "command":
+                return get_command_group(self.mode)
             # Return all strings in a dictionary format
             # See https://guide.pycord.dev/interactions/application-commands/localizations
             return LocaleDictionary({
-                lang_code: getattr(res_class, item)
-                for lang_code, res_class in locale_mapping.items()
+                lang_code: getattr(languages.get(lang_code), item)
+                for lang_code in languages.codes()
             })
 
-        # Get the current task id
-        try:
-            current_task = asyncio.current_task()
-            _id = id(current_task)
-        except RuntimeError:
-            # No running event loop
-            # Use a default id for the main thread
-            from src.error import Ce
-            logger().error(Ce("Cannot access resources outside of an asyncio task. ", title="a"))
-            _id = 0
-
-        # Get the locale for this task
-        with tglock:
-            locale = task_locales.get(_id, DEFAULT_LANG)
-
-        # Get the resource class for the locale
-        res_class = locale_mapping.get(locale, locale_mapping[DEFAULT_LANG])
-
-        # Return the attribute from the resource class
-        lo = LocaleObject(res_class, "R")
-        return getattr(lo, item)
+        # Return the attribute from the compiled resources of the current locale.
+        # `_set_locale` only stores registered locales
+        return getattr(languages.get(current_locale.get()), item)
 
 
 class TResource(ResDE):
@@ -202,8 +164,10 @@ class TResource(ResDE):
     access would go over the `__getattr__` method.
     """
 
-    async def init(self, guild_id: int) -> None: ...
-    async def initlocale(self, locale: str) -> None: ...
+    def init(self, guild_id: int | None) -> None: ...
+    def initlocale(self, locale: str) -> None: ...
+    def load_guild_locales(self) -> None: ...
+    def set_guild_locale(self, guild_id: int, locale: str) -> None: ...
 
 
 # Following classes are used to provide docstrings for the resource objects
@@ -213,7 +177,7 @@ class Resource(TResource):
     This global resource object is used to access
     the resource strings in the code. If not used in an interaction,
     where the guild_id is set by default, it must be set manually
-    with `await R.init(guild_id)` before accessing any resource strings.
+    with `R.init(guild_id)` before accessing any resource strings.
     """
     pass
 
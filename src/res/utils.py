@@ -14,7 +14,7 @@ def with_callback_factory(item):
         """Adds a callback to the item and returns it the item"""
         async def callback_wrapper(interaction: discord.Interaction):
             """A wrapper so that the callback receives both the item and the interaction."""
-            await R.init(interaction.guild_id)
+            R.init(interaction.guild_id)
             return await callback(item, interaction)
         item.callback = callback_wrapper
         return item
@@ -151,25 +151,36 @@ class InitView(discord.ui.View):
         This is necessary to ensure that the resources are loaded correctly.
         """
         # Actually not necessary:
-        # await R.init(interaction.guild_id)
+        # R.init(interaction.guild_id)
         return cls(*args, **kwargs)
 
 
 class LateView(InitView):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for name in dir(self):
+    """
+    A view whose items are created with the `late` decorator when the view is instantiated.
+    The late-bound methods are looked up once per class, so instantiation only calls their creators.
+    """
+    # Names and item callback creators of the late-bound methods, in `dir` order
+    _late_items: list[tuple[str, LateItemCallbackCreator]] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._late_items = []
+        for name in dir(cls):
             if name.startswith("__"):
                 continue
-            attr = getattr(self, name)
+            attr = getattr(cls, name)
             if callable(attr) and hasattr(attr, "__late_item_callback_creator"):
-                logger().debug(
-                    f"Late binding for {name} in {self.__class__.__name__}")
-                func = attr
-                button_callback_creator = getattr(
-                    func, "__late_item_callback_creator")()
-                button = button_callback_creator(func)
-                self.add_item(button)
+                logger().debug(f"Late binding for {name} in {cls.__name__}")
+                cls._late_items.append(
+                    (name, getattr(attr, "__late_item_callback_creator")))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, creator in self._late_items:
+            button_callback_creator = creator()
+            button = button_callback_creator(getattr(self, name))
+            self.add_item(button)
 
 
 def late(creator: LateItemCallbackCreator):
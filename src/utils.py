@@ -17,7 +17,9 @@ from urllib.parse import urlparse
 dotenv.load_dotenv()
 
 DEV = os.getenv("DEV", "false").lower() == "true"
-logger = Logger("logs/bot-{date}.log", logging.DEBUG if DEV else logging.INFO)
+logger = Logger("logs/bot-{date}.jsonl" if C.log_json else "logs/bot-{date}.log", logging.DEBUG if DEV else logging.INFO,
+                C.log_queue_size, C.log_overflow_policy, C.log_sample_rate, C.log_batch_size,
+                C.log_json, C.log_max_bytes, C.log_retention_days, C.log_compress)
 TOKEN = os.getenv("DISCORD_TOKEN")
 MODE = "all"  # os.getenv("MODE")
 
@@ -33,7 +35,7 @@ def format_date(date: datetime.datetime) -> str:
     return date.strftime("%d.%m.%Y %H:%M:%S")
 
 
-def get_mod_roles(guild: discord.Guild) -> Tuple[Optional[List[discord.Role]], Optional[Error]]:
+async def get_mod_roles(guild: discord.Guild) -> Tuple[Optional[List[discord.Role]], Optional[Error]]:
     """
     Retrieve the list of moderator roles for the guild from the database.
     Args:
@@ -42,7 +44,7 @@ def get_mod_roles(guild: discord.Guild) -> Tuple[Optional[List[discord.Role]], O
         Tuple[Optional[List[discord.Role]], Optional[Error]]: A tuple containing the list of moderator roles (or None) and an error (or None).
     """
     from src.database import db
-    mod_role_ids = db.constant.get(C.DBKey.mod_roles, guild.id)
+    mod_role_ids = await db.constant.get(C.DBKey.mod_roles, guild.id)
     if mod_role_ids is None:
         return None, We(R.setup_no_modroles)
     try:
@@ -57,7 +59,7 @@ def get_mod_roles(guild: discord.Guild) -> Tuple[Optional[List[discord.Role]], O
     return roles, None
 
 
-def is_mod_or_admin(user: discord.Member) -> Tuple[Optional[bool], Optional[Error]]:
+async def is_mod_or_admin(user: discord.Member) -> Tuple[Optional[bool], Optional[Error]]:
     """
     Check if the user has a moderator or administrator role.
     Args:
@@ -65,18 +67,18 @@ def is_mod_or_admin(user: discord.Member) -> Tuple[Optional[bool], Optional[Erro
     Returns:
         Tuple[Optional[bool], Optional[Error]]: True if the user has a moderator or administrator role, False otherwise. Returns (None, error) if an error occurs.
     """
-    mod_roles, err = get_mod_roles(user.guild)
+    mod_roles, err = await get_mod_roles(user.guild)
     if err:
         return None, err
     return any(role.permissions.administrator for role in user.roles) or any(role in mod_roles for role in user.roles), None
 
 
-def get_member(guild: discord.Guild, user_id: str) -> Tuple[Optional[discord.Member], Optional[Error]]:
+def get_member(guild: discord.Guild, user_id: int | str) -> Tuple[Optional[discord.Member], Optional[Error]]:
     """
     Get a member from the guild by user ID.
     Args:
         guild (discord.Guild): The Discord guild.
-        user_id (str): The user ID to search for.
+        user_id (int | str): The user ID to search for.
     Returns:
         Tuple[Optional[discord.Member], Optional[Error]]: A tuple of (member, error). If the member is found, returns (member, None). Otherwise returns (None, error) indicating why it failed.
     """
@@ -99,7 +101,7 @@ async def get_ticket_category(guild: discord.Guild) -> Tuple[Optional[discord.Ca
         Tuple[Optional[discord.CategoryChannel], Optional[Error]]: A tuple of (category, error). If the category is configured and found, returns (category, None). Otherwise returns (None, error) indicating why it failed.
     """
     from src.database import db
-    category_id = db.constant.get(C.DBKey.ticket_category, guild.id)
+    category_id = await db.constant.get(C.DBKey.ticket_category, guild.id)
     if category_id is None:
         return None, We(R.setup_no_ticket_category)
     category = guild.get_channel(int(category_id))
@@ -117,7 +119,7 @@ async def get_transcript_category(guild: discord.Guild) -> Tuple[Optional[discor
         Tuple[Optional[discord.CategoryChannel], Optional[Error]]: The transcript category and an error if not found.
     """
     from src.database import db
-    category_id = db.constant.get(C.DBKey.transcript_category, guild.id)
+    category_id = await db.constant.get(C.DBKey.transcript_category, guild.id)
     if category_id is None:
         return None, We(R.setup_no_transcript_category)
     category = guild.get_channel(int(category_id))
@@ -135,7 +137,7 @@ async def get_log_channel(guild: discord.Guild) -> Tuple[Optional[discord.TextCh
         Tuple[Optional[discord.TextChannel], Optional[Error]]: The log channel and an error if not found.
     """
     from src.database import db
-    channel_id = db.constant.get(C.DBKey.log_channel, guild.id)
+    channel_id = await db.constant.get(C.DBKey.log_channel, guild.id)
     if channel_id is None:
         return None, We(R.setup_no_logchannel)
     channel = guild.get_channel(int(channel_id))
@@ -153,7 +155,7 @@ async def get_timeout_log_channel(guild: discord.Guild) -> Tuple[Optional[discor
         Tuple[Optional[discord.TextChannel], Optional[Error]]: The timeout log channel and an error if not found.
     """
     from src.database import db
-    channel_id = db.constant.get(C.DBKey.timeout_log_channel, guild.id)
+    channel_id = await db.constant.get(C.DBKey.timeout_log_channel, guild.id)
     if channel_id is None:
         return None, We(R.setup_no_timeout_logchannel)
     channel = guild.get_channel(int(channel_id))
@@ -171,7 +173,7 @@ async def get_team_welcome_channel(guild: discord.Guild) -> Tuple[Optional[disco
         Tuple[Optional[discord.TextChannel], Optional[Error]]: The welcome channel and an error if not found.
     """
     from src.database import db
-    channel_id = db.constant.get(C.DBKey.welcome_channel_id, guild.id)
+    channel_id = await db.constant.get(C.DBKey.welcome_channel_id, guild.id)
     if channel_id is None:
         return None, We(R.team_welcome_no_channel)
     channel = guild.get_channel(int(channel_id))
@@ -244,7 +246,7 @@ async def verify_mod_or_admin(interaction: discord.Interaction, no_perms_err: Er
         Any kind of error handling (logging, sending messages) will be done within this function,
         so if the function returns False, there is no need to take further action.
     """
-    has_permission, err = is_mod_or_admin(interaction.user)
+    has_permission, err = await is_mod_or_admin(interaction.user)
     if err:
         await handle_error(interaction, err)
         return False
@@ -320,7 +322,7 @@ def format_duration(seconds: int) -> str:
         return f"{days}d {remaining_hours}h"
 
 
-def get_category_name(category_id: int) -> str:
+async def get_category_name(category_id: int) -> str:
     """
     Get the name of a category by its ID.
 
@@ -331,7 +333,7 @@ def get_category_name(category_id: int) -> str:
         str: The name of the category, or "Unbekannt" if not found.
     """
     from src.database import db
-    category = db.tc.get_category(category_id)
+    category = await db.tc.get_category(category_id)
     return category.name if category else "Unbekannt"
 
 
@@ -0,0 +1,52 @@
+"""
+Benchmark of drawing the winners of a giveaway with 1M entrants.
+Not collected by default, run it with `python -m pytest tests/benchmark_draw.py -s`.
+"""
+import asyncio
+import datetime
+import random
+import time
+import tracemalloc
+import src.features.giveaway.draw as draw_module
+from src.features.giveaway.draw import weighted_sample, draw_winners
+
+MESSAGE = 20
+ENTRANTS = 1_000_000
+WINNERS = 10
+ROUNDS = 3
+
+
+def measure(name: str, run):
+    """Print the best time and the peak memory of `ROUNDS` runs. Tracing memory slows the runs down."""
+    best = float("inf")
+    peak = 0
+    for _ in range(ROUNDS):
+        tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    print(f"{name}: {best:.3f} s, {peak / 2 ** 20:.1f} MB peak")
+    return peak
+
+
+def test_draw_one_million_entrants(database, monkeypatch):
+    monkeypatch.setattr(draw_module, "db", database)
+    entries = [(user_id, 2.0 if user_id % 10 == 0 else 1.0) for user_id in range(ENTRANTS)]
+
+    async def create():
+        async with database.transaction() as tx:
+            tx.giveaway.create(MESSAGE, 10, 1, 30, "prize", WINNERS, None, datetime.datetime(2030, 1, 1))
+            tx.giveaway.add_entries([(MESSAGE, user_id, weight) for user_id, weight in entries])
+
+    asyncio.run(create())
+
+    print()
+    measure("sampling only", lambda: weighted_sample(entries, WINNERS, 1))
+    # What the draw did before the entries were streamed: load all user IDs, then sample them
+    measure("load all + random.sample", lambda: random.sample(asyncio.run(database.giveaway.get_weighted_entries(
+        MESSAGE, lambda rows: [user_id for user_id, _ in rows])), WINNERS))
+    peak = measure("draw_winners", lambda: asyncio.run(draw_winners(MESSAGE, WINNERS)))
+    # Streaming only keeps the winners in memory
+    assert peak < 2 ** 20
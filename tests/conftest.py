@@ -0,0 +1,51 @@
+import os
+import tempfile
+import pytest
+from src.database import Database
+from src.utils import logger
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """Run every test from the repository root, since migrations and resources are read from relative paths."""
+    monkeypatch.chdir(ROOT)
+
+
+def pytest_configure(config):
+    """Write the log of the tests to a temporary directory instead of `logs/`, starting before collection."""
+    config.log_directory = tempfile.TemporaryDirectory()
+    logger.file_manager.filename = os.path.join(
+        config.log_directory.name, os.path.basename(logger.file_manager.filename))
+
+
+def pytest_unconfigure(config):
+    """Write the remaining records before the temporary log directory is deleted."""
+    logger.flush()
+    config.log_directory.cleanup()
+
+
+@pytest.fixture
+def open_database(tmp_path):
+    """
+    Open databases in temporary files, created by the migrations like a new production database.
+    All opened databases are closed after the test.
+    """
+    opened: list[Database] = []
+
+    def open_database(**kwargs) -> Database:
+        database = Database(str(tmp_path / f"test{len(opened)}.db"), **kwargs)
+        database.connect()
+        opened.append(database)
+        return database
+
+    yield open_database
+    for database in opened:
+        database.close()
+
+
+@pytest.fixture
+def database(open_database) -> Database:
+    """A new database in a temporary file."""
+    return open_database()
@@ -0,0 +1,20 @@
+"""
+Tests of the database writer thread.
+"""
+import asyncio
+
+
+def test_cancelled_writes_keep_the_writer_running(open_database):
+    db = open_database(reader_pool_size=0)
+
+    async def main():
+        # Cancel writes while they are queued, running and being committed
+        for _ in range(20):
+            task = asyncio.create_task(db.constant.set("key", "cancelled", 1))
+            await asyncio.sleep(0)
+            task.cancel()
+        await asyncio.sleep(0.1)
+        await asyncio.wait_for(db.constant.set("key", "value", 1), timeout=5)
+        return await db.constant.get("key", 1)
+
+    assert asyncio.run(main()) == "value"
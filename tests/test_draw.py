@@ -0,0 +1,86 @@
+"""
+Tests of the giveaway winner selection.
+"""
+import asyncio
+import collections
+import datetime
+import pytest
+import src.features.giveaway.draw as draw_module
+from src.features.giveaway.draw import weighted_sample, draw_winners, replay_draw
+
+MESSAGE = 20
+SEEDS = 50_000
+TOLERANCE = 0.01
+
+
+def exact_inclusion(weights: dict[int, float]) -> dict[int, float]:
+    """Probability of every user to be among 2 users drawn without replacement, proportional to their weight."""
+    total = sum(weights.values())
+    return {user_id: weight / total + sum(
+        other / total * weight / (total - other) for other_id, other in weights.items() if other_id != user_id)
+        for user_id, weight in weights.items()}
+
+
+def test_same_seed_draws_same_winners():
+    entries = [(user_id, 1.0 + user_id % 3) for user_id in range(1000)]
+    assert weighted_sample(entries, 10, 1234) == weighted_sample(iter(entries), 10, 1234)
+    assert weighted_sample(entries, 10, 1234) != weighted_sample(entries, 10, 4321)
+
+
+def test_skips_excluded_and_weightless_entries():
+    entries = [(1, 1.0), (2, 0.0), (3, 1.0), (4, 1.0)]
+    for seed in range(100):
+        winners = weighted_sample(entries, 3, seed, exclude={3})
+        assert sorted(winners) == [1, 4]
+    assert weighted_sample(entries, 0, 1) == []
+
+
+def test_bonus_weights_change_inclusion_frequencies():
+    # Two winners, so most entries are drawn after the reservoir is full
+    weights = {1: 1.0, 2: 1.0, 3: 1.0, 4: 2.0, 5: 2.0, 6: 5.0}
+    counts = collections.Counter()
+    for seed in range(SEEDS):
+        counts.update(weighted_sample(weights.items(), 2, seed))
+    for user_id, probability in exact_inclusion(weights).items():
+        assert counts[user_id] / SEEDS == pytest.approx(probability, abs=TOLERANCE)
+
+
+@pytest.fixture
+def giveaway(database, monkeypatch):
+    """A giveaway with 100 entries, the draw module pointed at the test database."""
+    monkeypatch.setattr(draw_module, "db", database)
+
+    async def create():
+        async with database.transaction() as tx:
+            tx.giveaway.create(MESSAGE, 10, 1, 30, "prize", 3, None, datetime.datetime(2030, 1, 1))
+            tx.giveaway.add_entries([(MESSAGE, user_id, 1.0 + user_id % 2) for user_id in range(100)])
+
+    asyncio.run(create())
+    return database
+
+
+def test_replay_returns_recorded_winners(giveaway):
+    async def main():
+        draw, winners = await draw_winners(MESSAGE, 3)
+        return draw, winners, await replay_draw(MESSAGE, draw), await giveaway.giveaway.get_draws(MESSAGE)
+
+    draw, winners, replayed, draws = asyncio.run(main())
+    assert draw == 0 and len(winners) == 3
+    assert replayed
+    assert draws[0][3] == winners
+
+
+def test_reroll_excludes_earlier_winners(giveaway):
+    async def main():
+        draws = [await draw_winners(MESSAGE, 3) for _ in range(5)]
+        replays = [await replay_draw(MESSAGE, draw) for draw, _ in draws]
+        with pytest.raises(ValueError):
+            await replay_draw(MESSAGE, len(draws))
+        return draws, replays
+
+    draws, replays = asyncio.run(main())
+    assert [draw for draw, _ in draws] == list(range(5))
+    winners = [user_id for _, drawn in draws for user_id in drawn]
+    assert len(winners) == len(set(winners)) == 15
+    # Re-rolls are replayed with the winners of the draws before them excluded
+    assert all(replays)
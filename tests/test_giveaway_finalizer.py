@@ -0,0 +1,183 @@
+"""
+Concurrency test of the giveaway finalizer.
+500 giveaways end at once and are finalized against a simulated Discord API with latency.
+"""
+import asyncio
+import collections
+import datetime
+import pytest
+from src.constants import C
+import src.features.giveaway.draw as draw_module
+import src.features.giveaway.entries as entries_module
+import src.features.giveaway.giveaway as giveaway_module
+from src.features.giveaway.giveaway import GiveawayFinalizer
+
+GIVEAWAYS = 500
+BIG_GUILD_GIVEAWAYS = 200  # Giveaways of guild 0, the other ones are spread over 30 guilds
+LATENCY = 0.005  # Seconds per simulated request
+ENTRANTS = 50
+
+
+class FakeDiscord:
+    """Counts the giveaways in progress between fetching their message and announcing the winners."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.guild_active = collections.Counter()
+        self.guild_peak = collections.Counter()
+        self.announcements = collections.Counter()
+
+    def get_channel(self, channel_id: int):
+        return FakeChannel(self, channel_id // 1000)
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.bot = False
+        self.roles = []
+
+
+class FakeReaction:
+    emoji = C.giveaway_reaction
+
+    async def users(self):
+        await asyncio.sleep(LATENCY)
+        for user_id in range(ENTRANTS):
+            yield FakeUser(user_id)
+
+
+class FakeMessage:
+    def __init__(self, message_id: int):
+        self.id = message_id
+        self.reactions = [FakeReaction()]
+
+
+class FakeChannel:
+    def __init__(self, discord: FakeDiscord, guild_id: int):
+        self.discord = discord
+        self.guild = type("FakeGuild", (), {"id": guild_id})()
+
+    async def fetch_message(self, message_id: int):
+        discord = self.discord
+        discord.active += 1
+        discord.peak = max(discord.peak, discord.active)
+        discord.guild_active[self.guild.id] += 1
+        discord.guild_peak[self.guild.id] = max(
+            discord.guild_peak[self.guild.id], discord.guild_active[self.guild.id])
+        await asyncio.sleep(LATENCY)
+        self.message_id = message_id
+        return FakeMessage(message_id)
+
+    async def send(self, content=None, embed=None):
+        await asyncio.sleep(LATENCY)
+        self.discord.announcements[self.message_id] += 1
+        self.discord.active -= 1
+        self.discord.guild_active[self.guild.id] -= 1
+
+
+@pytest.fixture
+def giveaway_db(database, monkeypatch):
+    """Point the giveaway feature at the test database."""
+    for module in (giveaway_module, entries_module, draw_module):
+        monkeypatch.setattr(module, "db", database)
+    return database
+
+
+async def create_ended_giveaways(db) -> list[int]:
+    ends_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+    message_ids = []
+    async with db.transaction() as tx:
+        for i in range(GIVEAWAYS):
+            guild_id = 0 if i < BIG_GUILD_GIVEAWAYS else 1 + i % 30
+            message_id = 100_000 + i
+            tx.giveaway.create(message_id=message_id, channel_id=guild_id * 1000 + 1, guild_id=guild_id, host_id=1,
+                               prize="prize", winner_count=1, role_id=None, ends_at=ends_at)
+            message_ids.append(message_id)
+    return message_ids
+
+
+def test_finalizes_every_giveaway_once_within_limits(giveaway_db):
+    db = giveaway_db
+    discord = FakeDiscord()
+    limit = C.giveaway_finalize_concurrency
+    guild_limit = C.giveaway_finalize_guild_concurrency
+
+    async def main():
+        message_ids = await create_ended_giveaways(db)
+        finalizer = GiveawayFinalizer(discord, limit, guild_limit)
+        due = await db.giveaway.get_active(datetime.datetime.now())
+        tasks = [finalizer.submit(giveaway) for giveaway in due]
+        # Submitting a giveaway that is already being finalized is a no-op
+        assert all(finalizer.submit(giveaway) is None for giveaway in due)
+        await asyncio.gather(*tasks)
+        assert finalizer.pending() == 0
+        remaining = await db.giveaway.get_active(datetime.datetime.now())
+        draws = [await db.giveaway.get_draws(message_id) for message_id in message_ids]
+        return message_ids, due, remaining, draws
+
+    message_ids, due, remaining, draws = asyncio.run(main())
+
+    assert len(due) == GIVEAWAYS
+    assert remaining == []
+    assert all(discord.announcements[message_id] == 1 for message_id in message_ids)
+    assert all(len(giveaway_draws) == 1 and len(giveaway_draws[0][3]) == 1 for giveaway_draws in draws)
+    # Giveaways were finalized concurrently, but never above the limits
+    assert 1 < discord.peak <= limit
+    assert max(discord.guild_peak.values()) <= guild_limit
+    assert discord.guild_peak[0] == guild_limit
+
+
+def test_rival_finalizers_finalize_every_giveaway_once(giveaway_db):
+    db = giveaway_db
+    discord = FakeDiscord()
+
+    async def main():
+        message_ids = await create_ended_giveaways(db)
+        due = await db.giveaway.get_active(datetime.datetime.now())
+        # Two finalizers race for the same giveaways, eg. a scheduler run overlapping a slow one
+        finalizers = [GiveawayFinalizer(discord, C.giveaway_finalize_concurrency,
+                                        C.giveaway_finalize_guild_concurrency) for _ in range(2)]
+        await asyncio.gather(*(finalizer.submit(giveaway) for finalizer in finalizers for giveaway in due))
+        draws = [await db.giveaway.get_draws(message_id) for message_id in message_ids]
+        return message_ids, draws
+
+    message_ids, draws = asyncio.run(main())
+
+    assert all(discord.announcements[message_id] == 1 for message_id in message_ids)
+    assert all(len(giveaway_draws) == 1 for giveaway_draws in draws)
+
+
+def test_interrupted_finalizer_leaves_waiting_giveaways_active(giveaway_db):
+    db = giveaway_db
+    discord = FakeDiscord()
+    limit = C.giveaway_finalize_concurrency
+    guild_limit = C.giveaway_finalize_guild_concurrency
+
+    async def main():
+        message_ids = await create_ended_giveaways(db)
+        finalizer = GiveawayFinalizer(discord, limit, guild_limit)
+        tasks = [finalizer.submit(giveaway) for giveaway in await db.giveaway.get_active(datetime.datetime.now())]
+        # Let some giveaways finish, then stop the finalizer like a shutdown does
+        while sum(discord.announcements.values()) < 20:
+            await asyncio.sleep(LATENCY)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Wait for the claims that were already running when their tasks were cancelled
+        db.executor.run_sync(lambda: None)
+        unannounced = {message_id for message_id in message_ids if not discord.announcements[message_id]}
+        remaining = await db.giveaway.get_active(datetime.datetime.now())
+
+        # The next run finalizes the giveaways that were still waiting
+        restarted = GiveawayFinalizer(discord, limit, guild_limit)
+        await asyncio.gather(*(restarted.submit(giveaway) for giveaway in remaining))
+        return unannounced, {giveaway.message_id for giveaway in remaining}
+
+    unannounced, remaining = asyncio.run(main())
+
+    assert remaining <= unannounced
+    # Only the giveaways being finalized when it stopped can't be claimed again
+    assert len(unannounced - remaining) <= C.giveaway_finalize_concurrency
+    assert all(discord.announcements[message_id] == 1 for message_id in remaining)
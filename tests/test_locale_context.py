@@ -0,0 +1,62 @@
+"""
+Stress tests of the per-task resource locale.
+The locale is kept in a ContextVar, so a locale set in one task must never show up in another one.
+"""
+import asyncio
+import random
+from src.res import R, DEFAULT_LANG
+from src.res.res import languages
+
+TASKS = 10_000
+ROUNDS = 5
+
+
+def expected_titles() -> dict[str, str]:
+    """`R.error_title` in every registered locale."""
+    return {code: languages.get(code).error_title for code in languages.codes()}
+
+
+def test_concurrent_tasks_keep_their_locale():
+    expected = expected_titles()
+    codes = list(expected)
+    mismatches = 0
+
+    async def child(locale: str) -> bool:
+        await asyncio.sleep(0)
+        return R.error_title == expected[locale]
+
+    async def worker(rng: random.Random):
+        nonlocal mismatches
+        for _ in range(ROUNDS):
+            locale = rng.choice(codes)
+            R.initlocale(locale)
+            await asyncio.sleep(rng.random() * 0.001)
+            if R.error_title != expected[locale]:
+                mismatches += 1
+            # Child tasks inherit the locale of the task that created them
+            if not all(await asyncio.gather(child(locale), child(locale))):
+                mismatches += 1
+
+    async def main():
+        await asyncio.gather(*(worker(random.Random(i)) for i in range(TASKS)))
+        # The locales of the workers didn't leak into the task that started them
+        return R.error_title
+
+    assert asyncio.run(main()) == expected[DEFAULT_LANG]
+    assert mismatches == 0
+
+
+def test_child_locale_does_not_leak_into_parent():
+    expected = expected_titles()
+    other = next(code for code in expected if code != DEFAULT_LANG)
+
+    async def child():
+        R.initlocale(other)
+        return R.error_title
+
+    async def main():
+        R.initlocale(DEFAULT_LANG)
+        child_title = await asyncio.create_task(child())
+        return child_title, R.error_title
+
+    assert asyncio.run(main()) == (expected[other], expected[DEFAULT_LANG])
@@ -0,0 +1,136 @@
+"""
+Query plan regression tests.
+Every public manager method is run against a fresh database while its SQL is traced,
+and each traced statement must be answered without a full table scan.
+"""
+import asyncio
+import datetime
+import pytest
+from src.database import Database
+
+NOW = datetime.datetime(2030, 1, 1)
+GUILD = 1
+CHANNEL = 10
+MESSAGE = 20
+USER = 30
+ROLE = 40
+
+# Statements that read a whole table on purpose, since all of its rows are wanted
+FULL_READS = (
+    # get_retry_deadlines loads the whole retry queue
+    "SELECT guild_id, user_id, role_id, next_attempt_at FROM role_queue",
+)
+
+
+async def seed(db: Database) -> int:
+    """Create one row of every kind. Returns the ID of the ticket category."""
+    category_id = await db.tc.create_category("name", "emoji", "description", GUILD)
+    await db.ticket.create(CHANNEL, GUILD, category_id, USER, None, close_at=NOW)
+    await db.giveaway.create(MESSAGE, CHANNEL, GUILD, USER, "prize", 1, None, NOW, bonus_roles={ROLE: 2.0})
+    await db.ab.ban_user(USER, GUILD, NOW)
+    await db.banlist.add_ban("name", GUILD, "reason", "banned_by", "length")
+    await db.constant.set("key", "value", GUILD)
+    await db.role_queue.push(GUILD, USER, ROLE, True, None, 1, NOW)
+    return category_id
+
+
+async def run_ticket(db: Database, category_id: int):
+    db.ticket_cache.invalidate()
+    await db.ticket.get(CHANNEL)
+    await db.ticket.update(CHANNEL, assignee_id=USER)
+    await db.ticket.get_overdue(NOW)
+    await db.ticket.get_close_deadlines()
+    await db.ticket.delete(CHANNEL)
+
+
+async def run_giveaway(db: Database, category_id: int):
+    await db.giveaway.get(MESSAGE)
+    await db.giveaway.get_active(NOW)
+    await db.giveaway.get_end_deadlines()
+    await db.giveaway.add_entries([(MESSAGE, USER, 1.0), (MESSAGE, USER + 1, 2.0)])
+    await db.giveaway.remove_entries([(MESSAGE, USER + 1)])
+    await db.giveaway.replace_entries(MESSAGE, [(USER, 1.0)])
+    await db.giveaway.get_weighted_entries(MESSAGE, list)
+    await db.giveaway.get_bonus_roles(MESSAGE)
+    await db.giveaway.add_draw(MESSAGE, 1, 1, [USER])
+    await db.giveaway.get_draws(MESSAGE)
+    await db.giveaway.update(MESSAGE, ended=True)
+    await db.giveaway.claim(MESSAGE)
+
+
+async def run_application_ban(db: Database, category_id: int):
+    await db.ab.is_user_banned(USER, GUILD)
+    await db.ab.get_expired(NOW)
+    await db.ab.get_ban_deadlines()
+    await db.ab.unban_user(USER, GUILD)
+
+
+async def run_banlist(db: Database, category_id: int):
+    await db.banlist.is_banned("name", GUILD)
+    await db.banlist.get_bans(GUILD)
+    await db.banlist.get_ban("name", GUILD)
+    await db.banlist.remove_ban("name", GUILD)
+
+
+async def run_constant(db: Database, category_id: int):
+    db.constant_cache.invalidate()
+    await db.constant.get("key", GUILD)
+    await db.constant.get_all("key")
+
+
+async def run_ticket_category(db: Database, category_id: int):
+    db.category_cache.invalidate()
+    await db.tc.get_category_graph(GUILD)
+    db.category_cache.invalidate()
+    await db.tc.get_category_graph_of(category_id)
+    await db.tc.get_category(category_id)
+    await db.tc.get_categories_for_guild(GUILD)
+    await db.tc.get_categories_for_user(GUILD, [ROLE])
+    await db.tc.user_can_use_category(category_id, [ROLE])
+    await db.tc.add_role_permission(category_id, ROLE)
+    await db.tc.get_role_permissions(category_id)
+    await db.tc.remove_role_permission(category_id, ROLE)
+    await db.tc.set_category_roles(category_id, [ROLE])
+    question_id = await db.tc.add_question(category_id, "question")
+    await db.tc.get_questions(category_id)
+    await db.tc.remove_question(question_id)
+    await db.tc.set_questions(category_id, ["question"])
+    await db.tc.update_category(category_id, name="other")
+    await db.tc.get_ticket_count(category_id)
+    await db.tc.delete_category(category_id)
+
+
+async def run_role_queue(db: Database, category_id: int):
+    await db.role_queue.get_due(NOW)
+    await db.role_queue.get_retry_deadlines()
+    await db.role_queue.remove(GUILD, USER, ROLE)
+
+
+@pytest.mark.parametrize("run", [
+    run_ticket, run_giveaway, run_application_ban, run_banlist, run_constant, run_ticket_category, run_role_queue,
+])
+def test_no_full_scans(open_database, run):
+    # Without readers every statement runs on the writer connection, where it is traced
+    db = open_database(reader_pool_size=0)
+    category_id = asyncio.run(seed(db))
+    statements: list[str] = []
+    db.executor.run_sync(lambda: db.connection.set_trace_callback(statements.append))
+    asyncio.run(run(db, category_id))
+    db.executor.run_sync(lambda: db.connection.set_trace_callback(None))
+
+    queries = [statement for statement in statements
+               if statement.split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE", "WITH")]
+    assert queries, "no queries were traced"
+    # A partial index only holds the rows its queries can match, so scanning it is fine
+    partial_indexes = {name for name, in db.executor.run_sync(lambda: db.connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '%WHERE%'").fetchall())}
+    scans = []
+    for query in queries:
+        plan = db.executor.run_sync(
+            lambda: db.connection.execute("EXPLAIN QUERY PLAN " + query).fetchall())
+        details = [row[3] for row in plan]
+        full_scans = [detail for detail in details
+                      if detail.startswith("SCAN ") and detail.split()[-1] not in partial_indexes]
+        if full_scans and query not in FULL_READS:
+            scans.append(f"{query}\n    {'; '.join(details)}")
+    assert not scans, "Full table scans:\n" + "\n".join(scans)